@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Shared Airtable client for the Companion_Translations maintenance scripts.
+
+- One requests.Session per client, so connections stay open across pages
+- Requests are paced to Airtable's limit of 5 requests per second per base
+  (shared by every client on the same base) instead of fixed sleeps
+- The next page is already being fetched while the caller handles the current one
+- Full-table fetches are saved to .airtable-cache/ together with the time they
+  were taken, and reused as long as no record was modified after that time
+- Updates are queued and sent through the multi-record PATCH endpoint,
+  10 records per request, with a bounded number of requests in flight
+
+Usage:
+    from airtable_client import AirtableClient
+
+    client = AirtableClient.from_env()
+    records = client.fetch_all_records()
+
+    with client.batch_writer() as writer:
+        writer.update(record_id, {'body_text': cleaned})
+"""
+
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Point the scripts at a local stand-in (api_standin.py) instead of Airtable
+API_ROOT = os.getenv('AIRTABLE_API_ROOT', 'https://api.airtable.com/v0').rstrip('/')
+TRANSLATIONS_TABLE_NAME = 'Companion_Translations'
+
+# Airtable allows 5 requests per second per base and blocks the base for
+# 30 seconds when that is exceeded
+REQUESTS_PER_SECOND = 5
+RATE_LIMIT_PENALTY = 30
+MAX_RETRIES = 5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Airtable accepts at most 10 records per create/update request
+BATCH_SIZE = 10
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.airtable-cache')
+# Deletions don't show up in LAST_MODIFIED_TIME(), so snapshots also expire
+SNAPSHOT_MAX_AGE = timedelta(hours=24)
+# Field requested by the freshness probe, to keep its response tiny
+PROBE_FIELD = 'language'
+
+
+class AirtableError(Exception):
+    """Raised when Airtable returns a non-2xx response"""
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.text = response.text
+        super().__init__(f"{response.status_code}: {response.text[:200]}")
+
+
+class RateLimiter:
+    """Hands out request slots no closer together than 1/rate seconds"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            slot = max(time.monotonic(), self.next_slot)
+            self.next_slot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        """Hold back every caller for `seconds`, e.g. after a 429"""
+        with self.lock:
+            self.next_slot = max(self.next_slot, time.monotonic() + seconds)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def rate_limiter_for(base_id, rate=REQUESTS_PER_SECOND):
+    """One limiter per base, shared by all clients in this process (`rate` applies on first use)"""
+    with _limiters_lock:
+        if base_id not in _limiters:
+            _limiters[base_id] = RateLimiter(rate)
+        return _limiters[base_id]
+
+
+def server_time(response):
+    """Airtable's clock from the Date header, falling back to ours"""
+    try:
+        return parsedate_to_datetime(response.headers['Date'])
+    except (KeyError, TypeError, ValueError):
+        return datetime.now(timezone.utc)
+
+
+class AirtableClient:
+    """Connection-pooled, rate-paced client for one Airtable table"""
+
+    def __init__(self, token, base_id, table_name=TRANSLATIONS_TABLE_NAME,
+                 pool_size=10, cache_dir=CACHE_DIR, api_root=API_ROOT):
+        self.base_id = base_id
+        self.table_name = table_name
+        self.api_url = f'{api_root}/{base_id}/{table_name}'
+        self.cache_dir = cache_dir
+        self.limiter = rate_limiter_for(base_id)
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json'
+        })
+
+    @classmethod
+    def from_env(cls, table_name=TRANSLATIONS_TABLE_NAME, **kwargs):
+        token = os.getenv('AIRTABLE_TOKEN_CG')
+        base_id = os.getenv('AIRTABLE_BASE_ID_CG')
+
+        if not token or not base_id:
+            print("❌ Error: AIRTABLE_TOKEN_CG and AIRTABLE_BASE_ID_CG must be set")
+            exit(1)
+
+        return cls(token, base_id, table_name, **kwargs)
+
+    def request(self, method, url=None, **kwargs):
+        """Send one request, pacing it and retrying 429/5xx with backoff"""
+        url = url or self.api_url
+
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.wait()
+            response = self.session.request(method, url, **kwargs)
+            with self._count_lock:
+                self.request_count += 1
+
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+
+            if response.status_code == 429:
+                self.limiter.pause(RATE_LIMIT_PENALTY)
+            else:
+                time.sleep(2 ** attempt)
+
+        return response
+
+    def get_page(self, params):
+        """Fetch one page of records, returning (data, response)"""
+        response = self.request('GET', params=params)
+        if response.status_code != 200:
+            raise AirtableError(response)
+        return response.json(), response
+
+    def list_params(self, filter_formula=None, fields=None, max_records=None, page_size=100):
+        params = {'pageSize': page_size}
+        if filter_formula:
+            params['filterByFormula'] = filter_formula
+        if fields:
+            params['fields[]'] = list(fields)
+        if max_records:
+            params['maxRecords'] = max_records
+        return params
+
+    def iter_pages(self, filter_formula=None, fields=None, max_records=None, on_first_response=None):
+        """
+        Yield lists of records page by page.
+
+        Airtable's offsets have to be followed in order, but as soon as a page
+        arrives the request for the next one is sent, so the network round trip
+        overlaps with whatever the caller does with the current page.
+        """
+        params = self.list_params(filter_formula, fields, max_records)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.get_page, params)
+            first = True
+
+            while future:
+                data, response = future.result()
+                if first and on_first_response:
+                    on_first_response(response)
+                first = False
+
+                offset = data.get('offset')
+                future = executor.submit(self.get_page, {**params, 'offset': offset}) if offset else None
+
+                yield data.get('records', [])
+
+    def iter_records(self, filter_formula=None, fields=None):
+        """Yield matching records one by one, with the next page already on its way"""
+        for page in self.iter_pages(filter_formula, fields):
+            yield from page
+
+    def fetch_all_records(self, filter_formula=None, fields=None, refresh=False):
+        """
+        Fetch every matching record.
+
+        Unfiltered fetches go through the local snapshot: it is returned as-is
+        when Airtable reports no record modified since it was taken.
+        """
+        if filter_formula or fields:
+            return [record for page in self.iter_pages(filter_formula, fields) for record in page]
+
+        if not refresh:
+            snapshot = self.load_snapshot()
+            if snapshot and self.snapshot_is_fresh(snapshot):
+                return snapshot['records']
+
+        started = {}
+
+        def remember_start(response):
+            # Anything modified after the first page was served will be
+            # picked up by the next freshness probe
+            started['at'] = server_time(response) - timedelta(seconds=2)
+
+        records = [record for page in self.iter_pages(on_first_response=remember_start) for record in page]
+        self.save_snapshot(records, started.get('at', datetime.now(timezone.utc)))
+        return records
+
+    def batch_writer(self, **kwargs):
+        return BatchWriter(self, **kwargs)
+
+    # Snapshot cache
+
+    def snapshot_path(self):
+        return os.path.join(self.cache_dir, f'{self.base_id}_{self.table_name}.json')
+
+    def load_snapshot(self):
+        try:
+            with open(self.snapshot_path(), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_snapshot(self, records, synced_at):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.snapshot_path()
+        tmp_path = f'{path}.tmp'
+
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'synced_at': synced_at.isoformat(), 'records': records}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def modified_since_formula(self, since):
+        stamp = since.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        return f"IS_AFTER(LAST_MODIFIED_TIME(), '{stamp}')"
+
+    def snapshot_is_fresh(self, snapshot):
+        try:
+            synced_at = datetime.fromisoformat(snapshot['synced_at'])
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        if datetime.now(timezone.utc) - synced_at > SNAPSHOT_MAX_AGE:
+            return False
+
+        data, _ = self.get_page(self.list_params(
+            self.modified_since_formula(synced_at), fields=[PROBE_FIELD], max_records=1
+        ))
+        return not data.get('records')
+
+
+class BatchWriter:
+    """
+    Write queue for record updates.
+
+    update() only queues the fields; every 10 records a multi-record PATCH is
+    handed to a small thread pool. At most `max_in_flight` requests run at
+    once; update() blocks while that many are outstanding. Retries on 429 and
+    5xx happen inside AirtableClient.request. Call flush() (or leave the
+    `with` block) to send the remainder and wait for everything.
+    """
+
+    def __init__(self, client, batch_size=BATCH_SIZE, max_in_flight=3, typecast=False):
+        self.client = client
+        self.batch_size = min(batch_size, BATCH_SIZE)
+        self.typecast = typecast
+        self.pending = {}
+        self.slots = threading.BoundedSemaphore(max_in_flight)
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self.futures = []
+        self.lock = threading.Lock()
+        self.updated = 0
+        self.failed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def update(self, record_id, fields):
+        """Queue `fields` for `record_id`; repeated updates to one record are merged"""
+        if record_id in self.pending:
+            self.pending[record_id].update(fields)
+        else:
+            self.pending[record_id] = dict(fields)
+
+        if len(self.pending) >= self.batch_size:
+            self._send_pending()
+
+    def _send_pending(self):
+        while self.pending:
+            batch = list(self.pending.items())[:self.batch_size]
+            for record_id, _ in batch:
+                del self.pending[record_id]
+
+            self.slots.acquire()
+            future = self.executor.submit(self._send, batch)
+            future.add_done_callback(lambda _: self.slots.release())
+            self.futures.append(future)
+
+    def _send(self, batch):
+        payload = {'records': [{'id': record_id, 'fields': fields} for record_id, fields in batch]}
+        if self.typecast:
+            payload['typecast'] = True
+
+        try:
+            response = self.client.request('PATCH', json=payload)
+        except requests.RequestException as e:
+            print(f"❌ Batch update failed: {e}")
+            ok = False
+        else:
+            ok = response.status_code == 200
+            if not ok:
+                print(f"❌ Batch update failed: {response.status_code}")
+                print(response.text)
+
+        with self.lock:
+            if ok:
+                self.updated += len(batch)
+            else:
+                self.failed.extend(record_id for record_id, _ in batch)
+
+    def flush(self):
+        """Send everything still queued, wait for it, and return the failed record IDs"""
+        self._send_pending()
+        wait(self.futures)
+        self.futures = []
+        return list(self.failed)
+
+    def close(self):
+        """Flush and stop the worker threads, returning the failed record IDs"""
+        failed = self.flush()
+        self.executor.shutdown()
+        return failed
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Local SQLite mirror of Companion_Translations.
+
+`sync` pulls only the records modified since the previous sync (using
+LAST_MODIFIED_TIME()), plus a cheap id-only listing to drop records that
+were deleted in Airtable. Scripts then read from the mirror with indexed
+lookups by (slug, language) or (companion, language) instead of scanning the
+API, and send their updates through mirror.writer(), which batches them to
+Airtable and applies the confirmed ones to the mirror.
+
+Usage:
+    from airtable_mirror import AirtableMirror
+
+    mirror = AirtableMirror()
+    mirror.sync(client)
+    en = mirror.find('replika', 'en')
+    with mirror.writer(client) as writer:
+        writer.update(record_id, {'body_text': text})
+
+CLI:
+    python3 airtable_mirror.py sync [--full]
+    python3 airtable_mirror.py missing en pt      # EN records without a PT sibling
+    python3 airtable_mirror.py sql "SELECT language, COUNT(*) FROM records GROUP BY language"
+"""
+
+import os
+import sys
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from airtable_client import PROBE_FIELD, server_time
+
+MIRROR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.airtable-mirror.sqlite')
+
+
+def first(value):
+    """Lookup fields come back as one-item lists"""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def record_row(record):
+    fields = record.get('fields', {})
+    return (
+        record['id'],
+        fields.get('language'),
+        first(fields.get('slug (from companion)')) or fields.get('slug'),
+        first(fields.get('companion')),
+        json.dumps(fields, ensure_ascii=False),
+    )
+
+
+class AirtableMirror:
+    """Indexed local copy of one Airtable table"""
+
+    def __init__(self, path=MIRROR_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS records (
+                id TEXT PRIMARY KEY,
+                language TEXT,
+                slug TEXT,
+                companion_id TEXT,
+                fields TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS records_slug_language ON records (slug, language);
+            CREATE INDEX IF NOT EXISTS records_companion_language ON records (companion_id, language);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        ''')
+        self.db.commit()
+
+    # Sync
+
+    def synced_at(self):
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'synced_at'").fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def upsert(self, records):
+        self.db.executemany('INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?)',
+                            [record_row(record) for record in records])
+
+    def sync(self, client, full=False):
+        """
+        Bring the mirror up to date and return (pulled, deleted).
+
+        The first sync (or full=True) pulls every record; later ones only pull
+        records modified since the last sync.
+        """
+        since = None if full else self.synced_at()
+        formula = client.modified_since_formula(since) if since else None
+        started = {}
+
+        def remember_start(response):
+            # Anything modified while we page through is caught next time
+            started['at'] = server_time(response) - timedelta(seconds=2)
+
+        pulled = 0
+        if full:
+            self.db.execute('DELETE FROM records')
+        for page in client.iter_pages(formula, on_first_response=remember_start):
+            self.upsert(page)
+            pulled += len(page)
+
+        deleted = self.prune(client) if since else 0
+
+        stamp = started.get('at', datetime.now(timezone.utc))
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('synced_at', ?)", (stamp.isoformat(),))
+        self.db.commit()
+        return pulled, deleted
+
+    def prune(self, client):
+        """Drop records that no longer exist in Airtable (ids only, tiny pages)"""
+        live = {record['id'] for page in client.iter_pages(fields=[PROBE_FIELD]) for record in page}
+        local = {row[0] for row in self.db.execute('SELECT id FROM records')}
+        gone = local - live
+        self.db.executemany('DELETE FROM records WHERE id = ?', [(record_id,) for record_id in gone])
+        return len(gone)
+
+    # Reads
+
+    def _records(self, sql, params=()):
+        return [{'id': record_id, 'fields': json.loads(fields)}
+                for record_id, fields in self.db.execute(sql, params)]
+
+    def records(self, language=None):
+        """All records (of one language), Airtable-shaped: {'id', 'fields'}"""
+        if language is None:
+            return self._records('SELECT id, fields FROM records ORDER BY id')
+        return self._records('SELECT id, fields FROM records WHERE language = ? ORDER BY id', (language,))
+
+    def get(self, record_id):
+        found = self._records('SELECT id, fields FROM records WHERE id = ?', (record_id,))
+        return found[0] if found else None
+
+    def find(self, slug, language):
+        found = self._records('SELECT id, fields FROM records WHERE slug = ? AND language = ? ORDER BY id LIMIT 1',
+                              (slug, language))
+        return found[0] if found else None
+
+    def by_slug(self, languages=None):
+        """{slug: {language: record}} (first record wins on duplicates)"""
+        return self._group('slug', languages)
+
+    def by_companion(self, languages=None):
+        """{companion record id: {language: record}}"""
+        return self._group('companion_id', languages)
+
+    def _group(self, column, languages):
+        sql = f'SELECT {column}, language, id, fields FROM records WHERE {column} IS NOT NULL'
+        params = ()
+        if languages:
+            sql += f" AND language IN ({', '.join('?' * len(languages))})"
+            params = tuple(languages)
+        grouped = {}
+        for key, language, record_id, fields in self.db.execute(sql + ' ORDER BY id', params):
+            grouped.setdefault(key, {}).setdefault(language, {'id': record_id, 'fields': json.loads(fields)})
+        return grouped
+
+    def missing_siblings(self, source, target):
+        """Records in `source` language whose companion has no `target` record"""
+        return self._records('''
+            SELECT s.id, s.fields FROM records s
+            WHERE s.language = ? AND s.companion_id IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM records t WHERE t.companion_id = s.companion_id AND t.language = ?
+              )
+            ORDER BY s.slug
+        ''', (source, target))
+
+    def query(self, sql, params=()):
+        return self.db.execute(sql, params).fetchall()
+
+    # Writes
+
+    def apply_update(self, record_id, fields):
+        record = self.get(record_id)
+        if record is None:
+            return
+        record['fields'].update(fields)
+        self.upsert([record])
+
+    def writer(self, client, **kwargs):
+        return MirrorWriter(self, client.batch_writer(**kwargs))
+
+    def close(self):
+        self.db.close()
+
+
+class MirrorWriter:
+    """
+    BatchWriter that also keeps the mirror current: updates go to Airtable
+    in batches, and the ones Airtable confirmed are applied locally on close().
+    """
+
+    def __init__(self, mirror, batch_writer):
+        self.mirror = mirror
+        self.batch_writer = batch_writer
+        self.pending = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def update(self, record_id, fields):
+        self.pending.setdefault(record_id, {}).update(fields)
+        self.batch_writer.update(record_id, fields)
+
+    def close(self):
+        """Flush to Airtable, mirror the confirmed updates, return the failed record IDs"""
+        failed = self.batch_writer.close()
+        failed_ids = set(failed)
+        for record_id, fields in self.pending.items():
+            if record_id not in failed_ids:
+                self.mirror.apply_update(record_id, fields)
+        self.mirror.db.commit()
+        self.pending = {}
+        return failed
+
+    @property
+    def updated(self):
+        return self.batch_writer.updated
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('sync', 'missing', 'sql'):
+        print("Usage: python3 airtable_mirror.py sync [--full] | missing <source> <target> | sql <query>")
+        exit(1)
+
+    command = sys.argv[1]
+    mirror = AirtableMirror()
+
+    if command == 'sync':
+        from airtable_client import AirtableClient
+
+        client = AirtableClient.from_env()
+        full = '--full' in sys.argv[2:] or mirror.synced_at() is None
+        print(f"📥 {'Full' if full else 'Delta'} sync of Companion_Translations...")
+        pulled, deleted = mirror.sync(client, full=full)
+        total = mirror.query('SELECT COUNT(*) FROM records')[0][0]
+        print(f"✅ Pulled {pulled} records, removed {deleted} ({client.request_count} requests)")
+        print(f"📊 Mirror holds {total} records")
+
+    elif command == 'missing':
+        if len(sys.argv) != 4:
+            print("Usage: python3 airtable_mirror.py missing <source> <target>")
+            exit(1)
+        source, target = sys.argv[2], sys.argv[3]
+        missing = mirror.missing_siblings(source, target)
+        print(f"📊 {len(missing)} {source.upper()} records without a {target.upper()} sibling")
+        for record in missing:
+            name = first(record['fields'].get('name (from companion)')) or record['fields'].get('name', record['id'])
+            print(f"   ❌ {name}")
+
+    else:
+        for row in mirror.query(' '.join(sys.argv[2:])):
+            print('   ' + ' | '.join('' if value is None else str(value) for value in row))
+
+
+if __name__ == '__main__':
+    main()
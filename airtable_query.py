@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Projected queries and bulk record lookups for Companion_Translations.
+
+A Query states which fields a job reads and which records it wants; it always
+sends a fields[] projection and a server-side filterByFormula, so audits that
+only look at names and pricing never download body_text or my_verdict.
+
+Instead of one filtered GET per companion, lookup_by_slug() packs all wanted
+slugs of a language into OR() formulas, each as long as Airtable's URL limit
+allows, fetches those queries concurrently (still paced by the client's
+per-base rate limiter) and returns {(slug, language): record}.
+
+Usage:
+    from airtable_client import AirtableClient
+    from airtable_query import Query, lookup_by_slug
+
+    client = AirtableClient.from_env()
+    records = lookup_by_slug(client, [('replika', 'en'), ('replika', 'nl')],
+                             fields=['my_verdict'])
+    en = records.get(('replika', 'en'))
+
+    query = Query(select=['name', 'pricing_plans'], languages=['nl', 'pt'])
+    for record in query.fetch(client):
+        print(query.value(record, 'name'), query.value(record, 'pricing_plans'))
+"""
+
+import json
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+# Airtable rejects URLs longer than 16,000 characters; leave room for the
+# offset parameter added on later pages
+MAX_URL_LENGTH = 15000
+MAX_CONCURRENT_QUERIES = 4
+
+SLUG_FIELD = 'slug (from companion)'
+LANGUAGE_FIELD = 'language'
+
+
+def formula_string(value):
+    """Quote a value as an Airtable formula string literal"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def field_ref(name):
+    return '{' + name + '}'
+
+
+def encoded_length(text):
+    return len(quote(text, safe=''))
+
+
+# Field kinds decide how values are decoded and how emptiness is tested
+TEXT = 'text'
+LONG_TEXT = 'long_text'
+JSON_TEXT = 'json_text'
+LOOKUP = 'lookup'
+
+
+class Field:
+    """One Companion_Translations column"""
+
+    def __init__(self, name, kind=TEXT):
+        self.name = name
+        self.kind = kind
+
+    @property
+    def ref(self):
+        return field_ref(self.name)
+
+    def equals(self, value):
+        return f'{self.ref}={formula_string(value)}'
+
+    def is_empty(self):
+        return f"{self.ref}=''" if self.kind != LOOKUP else f"LEN(ARRAYJOIN({self.ref}))=0"
+
+    def is_not_empty(self):
+        return f"NOT({self.is_empty()})"
+
+    def decode(self, value):
+        if self.kind == LOOKUP and isinstance(value, list):
+            return value[0] if value else None
+        if self.kind == JSON_TEXT and isinstance(value, str):
+            try:
+                return json.loads(value)
+            except ValueError:
+                return value
+        return value
+
+
+SCHEMA = {field.name: field for field in [
+    Field('language'),
+    Field('name'),
+    Field('slug'),
+    Field('companion', LOOKUP),
+    Field('name (from companion)', LOOKUP),
+    Field('slug (from companion)', LOOKUP),
+    Field('tagline'),
+    Field('description', LONG_TEXT),
+    Field('best_for', LONG_TEXT),
+    Field('body_text', LONG_TEXT),
+    Field('my_verdict', LONG_TEXT),
+    Field('meta_title'),
+    Field('meta_description', LONG_TEXT),
+    Field('hero_specs', JSON_TEXT),
+    Field('pricing_plans', JSON_TEXT),
+    Field('features', JSON_TEXT),
+]}
+
+
+def schema_field(name):
+    if name not in SCHEMA:
+        raise KeyError(f"unknown Companion_Translations field: {name}")
+    return SCHEMA[name]
+
+
+class Query:
+    """
+    A field-projected, server-filtered read.
+
+    select:    fields the job reads (language is always added)
+    languages: only records in these languages
+    where:     extra formula clauses, ANDed together
+    """
+
+    def __init__(self, select, languages=None, where=()):
+        if not select:
+            raise ValueError("a query has to select at least one field")
+        self.fields = [schema_field(name) for name in dict.fromkeys(list(select) + ['language'])]
+        self.languages = list(languages or [])
+        self.where = list(where)
+
+    def formula(self):
+        clauses = []
+        language = SCHEMA['language']
+        if len(self.languages) == 1:
+            clauses.append(language.equals(self.languages[0]))
+        elif self.languages:
+            clauses.append(f"OR({', '.join(language.equals(lang) for lang in self.languages)})")
+        clauses.extend(self.where)
+
+        if not clauses:
+            # Still filter server-side so the request never falls back to the
+            # full-table snapshot path
+            return 'TRUE()'
+        return clauses[0] if len(clauses) == 1 else f"AND({', '.join(clauses)})"
+
+    def field_names(self):
+        return [field.name for field in self.fields]
+
+    def fetch(self, client):
+        return client.fetch_all_records(filter_formula=self.formula(), fields=self.field_names())
+
+    def value(self, record, name, default=None):
+        """A selected field of `record`, decoded according to its kind"""
+        field = schema_field(name)
+        if field not in self.fields:
+            raise KeyError(f"{name} is not selected by this query")
+        value = field.decode(record.get('fields', {}).get(name))
+        return default if value is None else value
+
+
+def field_value(record, field):
+    """A field as a plain string; lookup fields come back as one-item lists"""
+    value = record.get('fields', {}).get(field)
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return value
+
+
+def in_formulas(field, values, prefix='', budget=MAX_URL_LENGTH):
+    """
+    Split `{field} = value` clauses into as few OR() formulas as fit in
+    `budget` URL-encoded characters each. `prefix` (e.g. "AND({language}="nl", ")
+    is wrapped around every formula.
+    """
+    suffix = ')' if prefix else ''
+    overhead = encoded_length(prefix + 'OR(' + ')' + suffix)
+    formulas = []
+    clauses = []
+    length = overhead
+
+    for value in values:
+        clause = f'{field_ref(field)}={formula_string(value)}'
+        clause_length = encoded_length(clause) + encoded_length(', ')
+        if clauses and length + clause_length > budget:
+            formulas.append(f"{prefix}OR({', '.join(clauses)}){suffix}")
+            clauses = []
+            length = overhead
+        clauses.append(clause)
+        length += clause_length
+
+    if clauses:
+        formulas.append(f"{prefix}OR({', '.join(clauses)}){suffix}")
+    return formulas
+
+
+def url_budget(client, fields=None):
+    """Characters left for filterByFormula once the URL and other params are counted"""
+    params = client.list_params(fields=fields)
+    query = '&'.join(
+        f'{quote(name, safe="")}={quote(str(value), safe="")}'
+        for name, values in params.items()
+        for value in (values if isinstance(values, list) else [values])
+    )
+    return MAX_URL_LENGTH - len(client.api_url) - len(query) - len('?&filterByFormula=')
+
+
+def lookup_by_slug(client, keys, fields=None, slug_field=SLUG_FIELD,
+                   max_workers=MAX_CONCURRENT_QUERIES):
+    """
+    Fetch the record for every (slug, language) in `keys`.
+
+    Returns {(slug, language): record}; keys without a record are missing
+    from the result. If several records share a slug and language the first
+    one Airtable returns wins, as with the old maxRecords=1 lookups.
+    """
+    by_language = defaultdict(set)
+    for slug, language in keys:
+        by_language[language].add(slug)
+
+    if fields:
+        fields = list(dict.fromkeys(list(fields) + [slug_field, LANGUAGE_FIELD]))
+    budget = url_budget(client, fields)
+
+    formulas = []
+    for language, slugs in sorted(by_language.items()):
+        prefix = f'AND({field_ref(LANGUAGE_FIELD)}={formula_string(language)}, '
+        formulas.extend(in_formulas(slug_field, sorted(slugs), prefix, budget))
+
+    def fetch(formula):
+        return [record for page in client.iter_pages(formula, fields) for record in page]
+
+    wanted = set(keys)
+    found = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for records in executor.map(fetch, formulas):
+            for record in records:
+                key = (field_value(record, slug_field), field_value(record, LANGUAGE_FIELD))
+                if key in wanted:
+                    found.setdefault(key, record)
+    return found
@@ -0,0 +1,1008 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Airtable and Anthropic APIs.
+
+Lets the translation and fix-up scripts run, and be timed, without
+api.airtable.com or Anthropic credentials. One HTTP server answers both APIs
+(/v0/... is Airtable, /v1/messages is Anthropic) in one of three modes:
+
+- record:    forward every request to the real APIs and save each exchange to
+             a cassette file (credentials are never written)
+- replay:    answer from a cassette, without touching the network
+- synthetic: serve a generated Companion_Translations table from memory
+             (paging, fields[], filterByFormula, PATCH/POST in batches of 10)
+             and answer Claude requests by echoing the text to translate
+
+Replay and synthetic mode add a configurable per-request latency and enforce
+the real rate limits (5 requests/s per Airtable base, Anthropic requests and
+tokens per minute) with the same 429 responses, so throughput measured
+against the stand-in behaves like the real thing. Counters are served at
+/_standin/stats.
+
+Usage:
+    python3 api_standin.py synthetic [--companions=500] [--languages=en,nl,pt,de,es]
+                                     [--translated=0.8] [--seed=1]
+    python3 api_standin.py record cassettes/verdicts.json
+    python3 api_standin.py replay cassettes/verdicts.json
+
+    Common options: [--port=8765] [--latency=0.05] [--token-latency=0.002]
+                    [--airtable-rps=5] [--rpm=50] [--tpm=80000] [--no-limits]
+
+    Then, in the shell that runs a script:
+        export AIRTABLE_API_ROOT=http://127.0.0.1:8765/v0
+        export ANTHROPIC_BASE_URL=http://127.0.0.1:8765
+        export AIRTABLE_TOKEN_CG=standin AIRTABLE_BASE_ID_CG=appStandIn ANTHROPIC_API_KEY=standin
+
+In-process (benchmarks):
+    from api_standin import StandIn, SyntheticBackend
+
+    with StandIn(SyntheticBackend(companions=200)) as server:
+        client = AirtableClient('standin', 'appStandIn', api_root=server.airtable_root)
+        anthropic = Anthropic(api_key='standin', base_url=server.url)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+import requests
+
+DEFAULT_PORT = 8765
+AIRTABLE_UPSTREAM = 'https://api.airtable.com'
+ANTHROPIC_UPSTREAM = 'https://api.anthropic.com'
+
+CASSETTE_VERSION = 1
+# Response headers worth keeping in a cassette; request headers (and with
+# them the credentials) are never written
+KEPT_HEADERS = {'content-type', 'date', 'retry-after', 'request-id'}
+
+# Same limits as the real services (and as airtable_client / translation_engine assume)
+AIRTABLE_REQUESTS_PER_SECOND = 5
+AIRTABLE_RATE_LIMIT_PENALTY = 30
+ANTHROPIC_REQUESTS_PER_MINUTE = 50
+ANTHROPIC_TOKENS_PER_MINUTE = 80000
+
+MAX_PAGE_SIZE = 100
+MAX_BATCH = 10
+MAX_CURSORS = 1000
+# Anthropic only caches prefixes of at least this many tokens, for 5 minutes
+CACHE_MIN_TOKENS = 1024
+CACHE_TTL = 300
+
+
+def now_utc():
+    return datetime.now(timezone.utc)
+
+
+def iso(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def json_body(status, data, headers=None):
+    return status, dict(headers or {}, **{'Content-Type': 'application/json'}), \
+        json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def airtable_error(status, kind, message):
+    return json_body(status, {'error': {'type': kind, 'message': message}})
+
+
+def anthropic_error(status, kind, message, headers=None):
+    return json_body(status, {'type': 'error', 'error': {'type': kind, 'message': message}}, headers)
+
+
+def api_of(path):
+    if path.startswith('/v0/'):
+        return 'airtable'
+    if path.startswith('/v1/'):
+        return 'anthropic'
+    return None
+
+
+def estimate_tokens(text):
+    """Same ~4 characters per token as translation_engine"""
+    return len(text) // 4 + 1
+
+
+# Airtable formulas
+#
+# Enough of the formula language to evaluate what the scripts send:
+# field references, string/number literals, = != < > <= >= &, and the
+# functions below. Unknown functions get Airtable's INVALID_FILTER_BY_FORMULA.
+
+class FormulaError(Exception):
+    pass
+
+
+FORMULA_TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<field>\{[^}]*\})
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<number>\d+(?:\.\d+)?)
+      | (?P<op>!=|<=|>=|=|<|>|&|\(|\)|,)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )''', re.VERBOSE)
+
+
+def tokenize(formula):
+    tokens = []
+    position = 0
+    formula = formula.rstrip()
+    while position < len(formula):
+        match = FORMULA_TOKEN.match(formula, position)
+        if not match:
+            raise FormulaError(f"unexpected input at {position}: {formula[position:position + 20]!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'string':
+            text = re.sub(r'\\(.)', r'\1', text[1:-1])
+        elif kind == 'field':
+            text = text[1:-1]
+        tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+
+def as_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, list):
+        return ', '.join(as_text(item) for item in value)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def truthy(value):
+    if isinstance(value, list):
+        return bool(value)
+    return bool(value) and value != '0'
+
+
+def as_time(value):
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(as_text(value).replace('Z', '+00:00'))
+    except ValueError:
+        raise FormulaError(f"not a date: {value!r}")
+
+
+def compare(op, left, right):
+    if isinstance(left, (int, float)) or isinstance(right, (int, float)):
+        try:
+            left, right = float(as_text(left) or 0), float(as_text(right) or 0)
+        except ValueError:
+            left, right = as_text(left), as_text(right)
+    elif isinstance(left, datetime) or isinstance(right, datetime):
+        left, right = as_time(left), as_time(right)
+    else:
+        left, right = as_text(left), as_text(right)
+    return {
+        '=': left == right, '!=': left != right,
+        '<': left < right, '>': left > right,
+        '<=': left <= right, '>=': left >= right,
+    }[op]
+
+
+def find(needle, haystack, start=1):
+    return as_text(haystack).find(as_text(needle), int(start) - 1) + 1
+
+
+# AND(), OR() and IF() are built by Formula.parse_call, since they only
+# evaluate the arguments they need
+FUNCTIONS = {
+    'NOT': lambda value: not truthy(value),
+    'TRUE': lambda: True,
+    'FALSE': lambda: False,
+    'BLANK': lambda: '',
+    'LEN': lambda value: len(as_text(value)),
+    'LOWER': lambda value: as_text(value).lower(),
+    'UPPER': lambda value: as_text(value).upper(),
+    'TRIM': lambda value: as_text(value).strip(),
+    'ARRAYJOIN': lambda value, separator=', ': separator.join(
+        as_text(item) for item in (value if isinstance(value, list) else [value] if value else [])),
+    'FIND': find,
+    'SEARCH': lambda needle, haystack, start=1: find(as_text(needle).lower(), as_text(haystack).lower(), start),
+    'IS_AFTER': lambda left, right: as_time(left) > as_time(right),
+    'IS_BEFORE': lambda left, right: as_time(left) < as_time(right),
+}
+# Functions that read the record itself rather than their arguments
+RECORD_FUNCTIONS = {
+    'RECORD_ID': lambda record: record['id'],
+    'LAST_MODIFIED_TIME': lambda record: record['modified'],
+    'CREATED_TIME': lambda record: as_time(record['createdTime']),
+}
+
+
+class Formula:
+    """A parsed filterByFormula, callable on a stand-in record"""
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.position = 0
+        self.evaluate = self.parse_comparison()
+        if self.position != len(self.tokens):
+            raise FormulaError(f"unexpected {self.tokens[self.position][1]!r}")
+
+    def __call__(self, record):
+        return truthy(self.evaluate(record))
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self, text=None):
+        kind, value = self.peek()
+        if kind is None or (text is not None and value != text):
+            raise FormulaError(f"expected {text or 'a value'}")
+        self.position += 1
+        return kind, value
+
+    def parse_comparison(self):
+        left = self.parse_concat()
+        kind, op = self.peek()
+        if kind == 'op' and op in ('=', '!=', '<', '>', '<=', '>='):
+            self.take()
+            right = self.parse_concat()
+            test = lambda record: compare(op, left(record), right(record))
+            if op == '=' and hasattr(left, 'field') and isinstance(getattr(right, 'literal', None), str):
+                # Remembered so OR() over many of these becomes one set lookup
+                test.equals = (left.field, right.literal)
+            return test
+        return left
+
+    def parse_concat(self):
+        parts = [self.parse_value()]
+        while self.peek() == ('op', '&'):
+            self.take()
+            parts.append(self.parse_value())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda record: ''.join(as_text(part(record)) for part in parts)
+
+    def parse_value(self):
+        kind, value = self.take()
+        if kind == 'field':
+            node = lambda record: record['fields'].get(value, '')
+            node.field = value
+            return node
+        if kind == 'string':
+            node = lambda record: value
+            node.literal = value
+            return node
+        if kind == 'number':
+            number = float(value)
+            return lambda record: number
+        if (kind, value) == ('op', '('):
+            inner = self.parse_comparison()
+            self.take(')')
+            return inner
+        if kind == 'name':
+            return self.parse_call(value.upper())
+        raise FormulaError(f"unexpected {value!r}")
+
+    def parse_call(self, name):
+        self.take('(')
+        args = []
+        if self.peek() != ('op', ')'):
+            args.append(self.parse_comparison())
+            while self.peek() == ('op', ','):
+                self.take()
+                args.append(self.parse_comparison())
+        self.take(')')
+
+        if name == 'AND':
+            return lambda record: all(truthy(arg(record)) for arg in args)
+        if name == 'OR':
+            fields = {getattr(arg, 'equals', (None,))[0] for arg in args}
+            if len(fields) == 1 and None not in fields:
+                field = fields.pop()
+                values = {arg.equals[1] for arg in args}
+                return lambda record: as_text(record['fields'].get(field, '')) in values
+            return lambda record: any(truthy(arg(record)) for arg in args)
+        if name == 'IF':
+            if len(args) not in (2, 3):
+                raise FormulaError("IF() takes 2 or 3 arguments")
+            otherwise = args[2] if len(args) == 3 else (lambda record: '')
+            return lambda record: args[1](record) if truthy(args[0](record)) else otherwise(record)
+        if name in RECORD_FUNCTIONS:
+            function = RECORD_FUNCTIONS[name]
+            return lambda record: function(record)
+        if name not in FUNCTIONS:
+            raise FormulaError(f"unknown function {name}()")
+        function = FUNCTIONS[name]
+        return lambda record: function(*(arg(record) for arg in args))
+
+
+# Synthetic Companion_Translations
+
+WORDS = ('companion conversation memory voice chat character roleplay image '
+         'premium support personality realistic experience response custom '
+         'platform feature users mobile privacy message story emotional free '
+         'subscription quality interface fast natural creative unlimited').split()
+NAME_PARTS = ('Nova Luna Aria Echo Muse Kira Sol Vela Lumi Iris Zara Mira '
+              'Candy Replika Dream Soul Crush Flirt Spicy Secret Joi Eva').split()
+PLAN_NAMES = ('Free', 'Basic', 'Plus', 'Premium', 'Pro', 'Ultimate')
+PLAN_FEATURES = (
+    'Unlimited conversations', 'Voice messages', 'Image generation', 'Ad-free experience',
+    'Priority response time', 'Custom personality', 'Long-term memory', 'Multiple companions',
+    'Early access to new features', 'Priority support', '5 messages per day', 'Web access only',
+)
+LANGUAGES = ('en', 'nl', 'pt', 'de', 'es')
+TRANSLATED_FIELDS = ('tagline', 'description', 'best_for', 'body_text', 'my_verdict',
+                     'meta_title', 'meta_description', 'pricing_plans', 'features')
+
+
+def sentence(rng, words=(8, 18)):
+    text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(*words)))
+    return text[0].upper() + text[1:] + '.'
+
+
+def paragraphs(rng, count=(3, 10)):
+    return '\n\n'.join(' '.join(sentence(rng) for _ in range(rng.randint(3, 7)))
+                       for _ in range(rng.randint(*count)))
+
+
+def record_id(prefix, number):
+    return f'{prefix}{number:014d}'
+
+
+def synthetic_catalog(companions=500, languages=LANGUAGES, translated=0.8, seed=1):
+    """
+    Generate Companion_Translations records: one per companion and language.
+    English records are complete; each other translation is complete with
+    probability `translated` and otherwise only has its name and language,
+    so translation jobs have work to do. Same seed, same catalog.
+    """
+    rng = random.Random(seed)
+    created = iso(datetime(2025, 1, 1, tzinfo=timezone.utc))
+    records = []
+
+    for number in range(companions):
+        name = f'{rng.choice(NAME_PARTS)} {rng.choice(NAME_PARTS)} AI'
+        slug = f"{name.lower().replace(' ', '-')}-{number}"
+        plans = [{'name': PLAN_NAMES[0], 'price': 0, 'period': 'free',
+                  'features': rng.sample(PLAN_FEATURES, 3)}]
+        for plan_name in PLAN_NAMES[1:rng.randint(2, 5)]:
+            plans.append({'name': plan_name, 'price': round(rng.uniform(4, 60), 2), 'period': 'monthly',
+                          'features': rng.sample(PLAN_FEATURES, rng.randint(3, 7))})
+        english = {
+            'tagline': sentence(rng, (4, 8)),
+            'description': paragraphs(rng, (1, 2)),
+            'best_for': sentence(rng),
+            'body_text': paragraphs(rng),
+            'my_verdict': paragraphs(rng),
+            'meta_title': f'{name} Review {2025}: Features & Pricing',
+            'meta_description': sentence(rng, (18, 28)),
+            'hero_specs': json.dumps({'pricing': f"Free + from ${plans[-1]['price']}/month",
+                                      'platforms': 'Web, iOS, Android'}),
+            'pricing_plans': json.dumps(plans),
+            'features': json.dumps([{'title': feature, 'description': sentence(rng)}
+                                    for feature in rng.sample(PLAN_FEATURES, 4)]),
+        }
+
+        for language in languages:
+            fields = {
+                'language': language,
+                'name': name,
+                'companion': [record_id('recCMP', number)],
+                'name (from companion)': [name],
+                'slug (from companion)': [slug],
+            }
+            if language == 'en' or rng.random() < translated:
+                fields.update(english)
+            else:
+                fields['hero_specs'] = english['hero_specs']
+            records.append({
+                'id': record_id('recTRN', len(records)),
+                'createdTime': created,
+                'fields': fields,
+            })
+
+    return records
+
+
+def source_text(prompt):
+    """The text a translation prompt asks to translate (everything after its last 'translate ...:' line)"""
+    marker = None
+    for match in re.finditer(r'^[^\n]*(?:translat|vertal|tradu|übersetz)[^\n]*:[ \t]*$',
+                             prompt, re.IGNORECASE | re.MULTILINE):
+        if prompt[match.end():].strip():
+            marker = match
+    text = prompt[marker.end():] if marker else prompt
+    # Drop a trailing answer cue such as "Nederlandse vertaling:"
+    text = re.sub(r'\n\n[^\n]*:\s*$', '', text.rstrip())
+    return text.strip()
+
+
+# Backends: handle(method, path, query, headers, body) -> (status, headers, body)
+
+class SyntheticBackend:
+    """Generated, mutable Companion_Translations table plus an echoing Claude"""
+
+    def __init__(self, companions=500, languages=LANGUAGES, translated=0.8, seed=1, records=None):
+        self.lock = threading.Lock()
+        self.records = {}
+        started = now_utc() - timedelta(days=1)
+        for record in records if records is not None else synthetic_catalog(companions, languages, translated, seed):
+            self.records[record['id']] = dict(record, modified=started)
+        self.next_id = len(self.records)
+        self.cursors = {}
+        self.cursor_count = 0
+        self.messages = 0
+        self.updated = 0
+        self.prompt_cache = {}
+
+    def handle(self, method, path, query, headers, body):
+        if api_of(path) == 'anthropic':
+            if method == 'POST' and path == '/v1/messages':
+                return self.message(body)
+            return anthropic_error(404, 'not_found_error', f"{method} {path} is not supported by the stand-in")
+
+        parts = path.strip('/').split('/')
+        if len(parts) not in (3, 4):
+            return airtable_error(404, 'NOT_FOUND', 'Could not find what you are looking for')
+        record_path = parts[3] if len(parts) == 4 else None
+
+        with self.lock:
+            if method == 'GET' and record_path:
+                record = self.records.get(record_path)
+                if record is None:
+                    return airtable_error(404, 'NOT_FOUND', 'Record not found')
+                return json_body(200, self.public(record))
+            if method == 'GET':
+                return self.list_records(query)
+            if method in ('PATCH', 'PUT'):
+                if record_path:
+                    body = {'records': [dict(body or {}, id=record_path)]}
+                    status, response_headers, data = self.update_records(body, replace=method == 'PUT')
+                    if status == 200:
+                        data = json.dumps(json.loads(data)['records'][0]).encode('utf-8')
+                    return status, response_headers, data
+                return self.update_records(body, replace=method == 'PUT')
+            if method == 'POST' and not record_path:
+                return self.create_records(body)
+        return airtable_error(404, 'NOT_FOUND', f"{method} is not supported here")
+
+    def public(self, record, fields=None):
+        values = record['fields']
+        if fields:
+            values = {name: values[name] for name in fields if name in values}
+        # Airtable leaves empty fields out of responses
+        values = {name: value for name, value in values.items() if value not in ('', None, [])}
+        return {'id': record['id'], 'createdTime': record['createdTime'], 'fields': values}
+
+    def list_records(self, query):
+        params = {}
+        for name, value in query:
+            params.setdefault(name, []).append(value)
+
+        offset = params.get('offset', [None])[0]
+        if offset:
+            if offset not in self.cursors:
+                return airtable_error(422, 'LIST_RECORDS_ITERATOR_NOT_AVAILABLE', 'Iterator is no longer available')
+            ids, fields, position = self.cursors.pop(offset)
+        else:
+            formula = params.get('filterByFormula', [''])[0]
+            try:
+                test = Formula(formula) if formula else None
+            except FormulaError as e:
+                return airtable_error(422, 'INVALID_FILTER_BY_FORMULA', f"The formula for filtering records is invalid: {e}")
+            try:
+                ids = [record_id for record_id, record in sorted(self.records.items())
+                       if test is None or test(record)]
+            except FormulaError as e:
+                return airtable_error(422, 'INVALID_FILTER_BY_FORMULA', f"The formula for filtering records is invalid: {e}")
+            max_records = params.get('maxRecords', [None])[0]
+            if max_records:
+                ids = ids[:int(max_records)]
+            fields = params.get('fields[]') or params.get('fields') or None
+            position = 0
+
+        page_size = min(int(params.get('pageSize', [MAX_PAGE_SIZE])[0]), MAX_PAGE_SIZE)
+        page = [self.public(self.records[record_id], fields)
+                for record_id in ids[position:position + page_size] if record_id in self.records]
+        data = {'records': page}
+        position += page_size
+        if position < len(ids):
+            self.cursor_count += 1
+            token = f'itr{self.cursor_count:012d}/{ids[position]}'
+            self.cursors[token] = (ids, fields, position)
+            # Like Airtable, abandoned iterators eventually expire
+            while len(self.cursors) > MAX_CURSORS:
+                del self.cursors[next(iter(self.cursors))]
+            data['offset'] = token
+        return json_body(200, data)
+
+    def update_records(self, body, replace=False):
+        records = (body or {}).get('records')
+        if not isinstance(records, list) or not 0 < len(records) <= MAX_BATCH:
+            return airtable_error(422, 'INVALID_RECORDS', f"Send between 1 and {MAX_BATCH} records")
+        missing = [item.get('id') for item in records if item.get('id') not in self.records]
+        if missing:
+            return airtable_error(404, 'NOT_FOUND', f"Record not found: {missing[0]}")
+
+        changed = now_utc()
+        for item in records:
+            record = self.records[item['id']]
+            fields = dict(item.get('fields', {}))
+            if replace:
+                record['fields'] = fields
+            else:
+                record['fields'].update(fields)
+            record['modified'] = changed
+        self.updated += len(records)
+        return json_body(200, {'records': [self.public(self.records[item['id']]) for item in records]})
+
+    def create_records(self, body):
+        records = (body or {}).get('records')
+        if not isinstance(records, list) or not 0 < len(records) <= MAX_BATCH:
+            return airtable_error(422, 'INVALID_RECORDS', f"Send between 1 and {MAX_BATCH} records")
+        created = []
+        for item in records:
+            record = {'id': record_id('recNEW', self.next_id), 'createdTime': iso(now_utc()),
+                      'fields': dict(item.get('fields', {})), 'modified': now_utc()}
+            self.next_id += 1
+            self.records[record['id']] = record
+            created.append(self.public(record))
+        return json_body(200, {'records': created})
+
+    def message(self, body):
+        body = body or {}
+        if body.get('stream'):
+            return anthropic_error(400, 'invalid_request_error', 'streaming is not supported by the stand-in')
+        messages = body.get('messages') or []
+        if not messages or not body.get('max_tokens'):
+            return anthropic_error(400, 'invalid_request_error', 'messages and max_tokens are required')
+
+        def text_of(content):
+            if isinstance(content, str):
+                return content
+            return '\n'.join(block.get('text', '') for block in content if isinstance(block, dict))
+
+        system = text_of(body.get('system') or '')
+        prompt = text_of(messages[-1].get('content', ''))
+        text = source_text(prompt)
+
+        output_tokens = estimate_tokens(text)
+        stop_reason = 'end_turn'
+        if output_tokens > body['max_tokens']:
+            text = text[:body['max_tokens'] * 4]
+            output_tokens = body['max_tokens']
+            stop_reason = 'max_tokens'
+
+        input_tokens = estimate_tokens(system) + sum(estimate_tokens(text_of(message.get('content', '')))
+                                                     for message in messages)
+        cache_write, cache_read = self.cache_usage(body)
+        input_tokens -= cache_write + cache_read
+
+        with self.lock:
+            self.messages += 1
+            number = self.messages
+        return json_body(200, {
+            'id': f'msg_standin_{number:08d}',
+            'type': 'message',
+            'role': 'assistant',
+            'model': body.get('model'),
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': stop_reason,
+            'stop_sequence': None,
+            'usage': {
+                'input_tokens': input_tokens,
+                'cache_creation_input_tokens': cache_write,
+                'cache_read_input_tokens': cache_read,
+                'output_tokens': output_tokens,
+            },
+        })
+
+    def cache_usage(self, body):
+        """
+        (cache write, cache read) tokens for a request's system blocks: a
+        cache_control prefix long enough to cache is written on first use and
+        read while it stays warm, as with Anthropic's prompt caching
+        """
+        blocks = body.get('system')
+        if not isinstance(blocks, list) or not any(isinstance(block, dict) and block.get('cache_control')
+                                                   for block in blocks):
+            return 0, 0
+        prefix = json.dumps([body.get('model'), blocks], sort_keys=True)
+        tokens = estimate_tokens(''.join(block.get('text', '') for block in blocks if isinstance(block, dict)))
+        if tokens < CACHE_MIN_TOKENS:
+            return 0, 0
+
+        now = time.monotonic()
+        with self.lock:
+            warm = self.prompt_cache.get(prefix, 0) > now
+            self.prompt_cache[prefix] = now + CACHE_TTL
+        return (0, tokens) if warm else (tokens, 0)
+
+    def stats(self):
+        return {'records': len(self.records), 'records_updated': self.updated, 'messages': self.messages}
+
+
+def request_key(method, path, query, body):
+    """What a cassette matches on; the Airtable base id is left out so recordings work for any base"""
+    path = re.sub(r'^/v0/[^/]+/', '/v0/{base}/', path)
+    return json.dumps([method, path, sorted(map(list, query)), body], sort_keys=True, ensure_ascii=False)
+
+
+class Cassette:
+    """Recorded request/response pairs, stored as JSON"""
+
+    def __init__(self, path):
+        self.path = path
+        self.interactions = []
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        cassette = cls(path)
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CASSETTE_VERSION:
+            raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+        cassette.interactions = data['interactions']
+        return cassette
+
+    def add(self, request, response):
+        with self.lock:
+            self.interactions.append({'request': request, 'response': response})
+
+    def save(self):
+        with self.lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CASSETTE_VERSION, 'interactions': self.interactions},
+                          f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+
+
+class ReplayBackend:
+    """
+    Answers from a cassette. Repeated requests get the recorded responses in
+    order, and the last one again once those run out.
+    """
+
+    def __init__(self, cassette):
+        self.responses = {}
+        self.lock = threading.Lock()
+        self.misses = 0
+        for interaction in cassette.interactions:
+            request = interaction['request']
+            key = request_key(request['method'], request['path'], request['query'], request.get('body'))
+            self.responses.setdefault(key, deque()).append(interaction['response'])
+
+    def handle(self, method, path, query, headers, body):
+        key = request_key(method, path, query, body)
+        with self.lock:
+            queue = self.responses.get(key)
+            if not queue:
+                self.misses += 1
+                miss = True
+            else:
+                response = queue.popleft() if len(queue) > 1 else queue[0]
+                miss = False
+        if miss:
+            message = f"no recorded response for {method} {path}"
+            if api_of(path) == 'anthropic':
+                return anthropic_error(404, 'not_found_error', message)
+            return airtable_error(404, 'CASSETTE_MISS', message)
+        return response['status'], dict(response['headers']), response['body'].encode('utf-8')
+
+    def stats(self):
+        return {'recorded': sum(len(queue) for queue in self.responses.values()), 'misses': self.misses}
+
+
+class RecordingBackend:
+    """Forwards to the real APIs and files every exchange in a cassette"""
+
+    def __init__(self, cassette, airtable=AIRTABLE_UPSTREAM, anthropic=ANTHROPIC_UPSTREAM):
+        self.cassette = cassette
+        self.upstreams = {'airtable': airtable, 'anthropic': anthropic}
+        self.session = requests.Session()
+        self.offsets = {}
+        self.lock = threading.Lock()
+
+    def handle(self, method, path, query, headers, body):
+        api = api_of(path)
+        if api is None:
+            return airtable_error(404, 'NOT_FOUND', f"{path} is neither an Airtable nor an Anthropic path")
+
+        forward = {name: value for name, value in headers.items()
+                   if name.lower() not in ('host', 'content-length', 'accept-encoding', 'connection')}
+        response = self.session.request(method, self.upstreams[api] + path, params=query,
+                                        headers=forward, json=body if body is not None else None)
+        kept = {name: value for name, value in response.headers.items() if name.lower() in KEPT_HEADERS}
+        self.cassette.add(
+            {'method': method, 'path': path, 'query': self.stable_query(query), 'body': body},
+            {'status': response.status_code, 'headers': kept, 'body': self.stable_body(api, response)},
+        )
+        return response.status_code, kept, response.content
+
+    def stable_body(self, api, response):
+        """
+        Airtable's offset tokens differ on every run, so the cassette stores
+        numbered ones instead (offset-1, offset-2, ...) in both the response
+        that hands a token out and the request that sends it back.
+        """
+        if api != 'airtable' or response.status_code != 200:
+            return response.text
+        try:
+            data = response.json()
+        except ValueError:
+            return response.text
+        if not data.get('offset'):
+            return response.text
+        with self.lock:
+            data['offset'] = self.offsets.setdefault(data['offset'], f'offset-{len(self.offsets) + 1}')
+        return json.dumps(data, ensure_ascii=False)
+
+    def stable_query(self, query):
+        with self.lock:
+            return [(name, self.offsets.get(value, value) if name == 'offset' else value) for name, value in query]
+
+    def stats(self):
+        return {'recorded': len(self.cassette.interactions)}
+
+
+# Latency and rate limits
+
+class Limits:
+    """Per-request latency plus the real services' rate limits, answered with their 429s"""
+
+    def __init__(self, latency=0.0, token_latency=0.0,
+                 airtable_rps=AIRTABLE_REQUESTS_PER_SECOND, airtable_penalty=AIRTABLE_RATE_LIMIT_PENALTY,
+                 anthropic_rpm=ANTHROPIC_REQUESTS_PER_MINUTE, anthropic_tpm=ANTHROPIC_TOKENS_PER_MINUTE):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.airtable_rps = airtable_rps
+        self.airtable_penalty = airtable_penalty
+        self.anthropic_rpm = anthropic_rpm
+        self.anthropic_tpm = anthropic_tpm
+        self.lock = threading.Lock()
+        self.airtable_buckets = {}
+        self.blocked_until = {}
+        self.anthropic_calls = deque()
+        self.anthropic_tokens = deque()
+
+    def check(self, path, body):
+        """None if the request may go ahead, else the 429 response to send"""
+        now = time.monotonic()
+        api = api_of(path)
+        with self.lock:
+            if api == 'airtable' and self.airtable_rps:
+                base = path.split('/')[2] if path.count('/') >= 2 else ''
+                if self.blocked_until.get(base, 0) > now:
+                    return airtable_error(429, 'RATE_LIMIT_REACHED', 'Rate limit exceeded. Please try again later')
+                # Token bucket: a client pacing itself at the limit never trips
+                # it, however much its requests jitter on the way here
+                tokens, last = self.airtable_buckets.get(base, (self.airtable_rps, now))
+                tokens = min(self.airtable_rps, tokens + (now - last) * self.airtable_rps)
+                if tokens < 1:
+                    self.blocked_until[base] = now + self.airtable_penalty
+                    return airtable_error(429, 'RATE_LIMIT_REACHED', 'Rate limit exceeded. Please try again later')
+                self.airtable_buckets[base] = (tokens - 1, now)
+
+            elif api == 'anthropic' and (self.anthropic_rpm or self.anthropic_tpm):
+                while self.anthropic_calls and now - self.anthropic_calls[0] >= 60:
+                    self.anthropic_calls.popleft()
+                while self.anthropic_tokens and now - self.anthropic_tokens[0][0] >= 60:
+                    self.anthropic_tokens.popleft()
+                # Input is counted now, output once the response is known
+                tokens = estimate_tokens(json.dumps([(body or {}).get('system'), (body or {}).get('messages')]))
+                used = sum(amount for _, amount in self.anthropic_tokens)
+                if (self.anthropic_rpm and len(self.anthropic_calls) >= self.anthropic_rpm) or \
+                        (self.anthropic_tpm and used + tokens > self.anthropic_tpm and self.anthropic_tokens):
+                    oldest = min([self.anthropic_calls[0]] if self.anthropic_calls else [now])
+                    if self.anthropic_tokens:
+                        oldest = min(oldest, self.anthropic_tokens[0][0])
+                    retry_after = max(1, int(60 - (now - oldest)) + 1)
+                    return anthropic_error(429, 'rate_limit_error', 'Number of requests or tokens has exceeded your rate limit',
+                                           {'retry-after': str(retry_after)})
+                self.anthropic_calls.append(now)
+                self.anthropic_tokens.append((now, tokens))
+        return None
+
+    def finish(self, path, response_body):
+        """Count a response's output tokens; returns how long to sit on it before sending"""
+        if api_of(path) != 'anthropic':
+            return self.latency
+        try:
+            output_tokens = json.loads(response_body)['usage']['output_tokens']
+        except (ValueError, KeyError, TypeError):
+            return self.latency
+        with self.lock:
+            self.anthropic_tokens.append((time.monotonic(), output_tokens))
+        return self.latency + self.token_latency * output_tokens
+
+
+# Server
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.standin.verbose:
+            super().log_message(format, *args)
+
+    def handle_any(self):
+        standin = self.server.standin
+        url = urlsplit(self.path)
+        query = parse_qsl(url.query, keep_blank_values=True)
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            if api_of(url.path) == 'airtable':
+                self.respond(*airtable_error(422, 'INVALID_REQUEST_BODY', 'Could not parse request body'))
+            else:
+                self.respond(*anthropic_error(400, 'invalid_request_error', 'body is not JSON'))
+            return
+
+        if url.path == '/_standin/stats':
+            self.respond(*json_body(200, standin.stats()))
+            return
+
+        self.respond(*standin.handle(self.command, url.path, query, dict(self.headers), body))
+
+    def respond(self, status, headers, body):
+        self.send_response(status)
+        for name, value in headers.items():
+            if name.lower() not in ('content-length', 'date', 'transfer-encoding', 'content-encoding', 'connection'):
+                self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = handle_any
+
+
+class StandIn:
+    """HTTP server for one backend, run on a background thread"""
+
+    def __init__(self, backend, host='127.0.0.1', port=0, limits=None, verbose=False):
+        self.backend = backend
+        self.limits = limits
+        self.verbose = verbose
+        self.server = ThreadingHTTPServer((host, port), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.standin = self
+        self.thread = None
+        self.lock = threading.Lock()
+        self.requests = {'airtable': 0, 'anthropic': 0}
+        self.rate_limited = {'airtable': 0, 'anthropic': 0}
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def airtable_root(self):
+        return f'{self.url}/v0'
+
+    def handle(self, method, path, query, headers, body):
+        api = api_of(path)
+        if api:
+            with self.lock:
+                self.requests[api] += 1
+
+        if self.limits:
+            limited = self.limits.check(path, body)
+            if limited:
+                with self.lock:
+                    self.rate_limited[api] += 1
+                return limited
+
+        started = time.monotonic()
+        status, response_headers, response_body = self.backend.handle(method, path, query, headers, body)
+        if self.limits:
+            remaining = self.limits.finish(path, response_body) - (time.monotonic() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+        return status, response_headers, response_body
+
+    def stats(self):
+        with self.lock:
+            stats = {'requests': dict(self.requests), 'rate_limited': dict(self.rate_limited)}
+        stats.update(self.backend.stats())
+        return stats
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def option(args, name, default, kind=str):
+    for arg in args:
+        if arg.startswith(f'--{name}='):
+            return kind(arg.split('=', 1)[1])
+    return default
+
+
+def main():
+    args = sys.argv[1:]
+    mode = args[0] if args else None
+    positional = [arg for arg in args[1:] if not arg.startswith('--')]
+    if mode not in ('synthetic', 'record', 'replay') or (mode != 'synthetic' and len(positional) != 1):
+        print("Usage: python3 api_standin.py synthetic [options] | record <cassette> | replay <cassette> [options]")
+        exit(1)
+
+    limits = None
+    if mode != 'record' and '--no-limits' not in args:
+        limits = Limits(
+            latency=option(args, 'latency', 0.0, float),
+            token_latency=option(args, 'token-latency', 0.0, float),
+            airtable_rps=option(args, 'airtable-rps', AIRTABLE_REQUESTS_PER_SECOND, int),
+            airtable_penalty=option(args, 'airtable-penalty', AIRTABLE_RATE_LIMIT_PENALTY, float),
+            anthropic_rpm=option(args, 'rpm', ANTHROPIC_REQUESTS_PER_MINUTE, int),
+            anthropic_tpm=option(args, 'tpm', ANTHROPIC_TOKENS_PER_MINUTE, int),
+        )
+
+    cassette = None
+    if mode == 'synthetic':
+        backend = SyntheticBackend(
+            companions=option(args, 'companions', 500, int),
+            languages=tuple(option(args, 'languages', ','.join(LANGUAGES)).split(',')),
+            translated=option(args, 'translated', 0.8, float),
+            seed=option(args, 'seed', 1, int),
+        )
+        print(f"🧪 Synthetic Companion_Translations: {len(backend.records)} records")
+    elif mode == 'replay':
+        try:
+            cassette = Cassette.load(positional[0])
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot load cassette: {e}")
+            exit(1)
+        backend = ReplayBackend(cassette)
+        print(f"📼 Replaying {len(cassette.interactions)} recorded requests from {positional[0]}")
+    else:
+        cassette = Cassette(positional[0])
+        backend = RecordingBackend(cassette)
+        print(f"🔴 Recording to {positional[0]}")
+
+    standin = StandIn(backend, port=option(args, 'port', DEFAULT_PORT, int), limits=limits,
+                      verbose='--verbose' in args)
+    print(f"🚀 Listening on {standin.url}")
+    print(f"   export AIRTABLE_API_ROOT={standin.airtable_root}")
+    print(f"   export ANTHROPIC_BASE_URL={standin.url}")
+    print("   Ctrl-C to stop")
+
+    try:
+        standin.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.server.server_close()
+        if mode == 'record':
+            cassette.save()
+            print(f"\n💾 Saved {len(cassette.interactions)} requests to {positional[0]}")
+        print(f"📊 {json.dumps(standin.stats())}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Scale benchmarks for the Airtable, translation and static-site pipelines.
+
+For every requested size the suite generates a synthetic catalog (N companions
+x EN/NL/PT/DE/ES, served by api_standin.py) and a matching HTML tree, runs each
+major stage against them and records wall time, peak memory and request counts.
+Everything lands in one JSON report. With several sizes, every stage also gets
+a scaling exponent (1.0 = linear), and stages that grow clearly faster than
+the catalog are flagged as superlinear. With --baseline, stages that got
+slower or hungrier than in an earlier report are flagged as regressions.
+
+Stage groups:
+    airtable   fetch_all_records (cold and snapshot probe), a projected Query,
+               lookup_by_slug, a streamed update job, mirror sync (full, delta)
+    text       chunk_markdown and the pricing glossary of translate-pricing-plans
+    translate  TranslationEngine against the stand-in Claude (needs anthropic)
+    site       hreflang index (cold, warm), verify-hreflang, the hreflang
+               fixers, site-sweep and generate-sitemap (cold, warm); each runs
+               as its own process on a copy of the scripts next to the tree
+
+Peak memory is the Python heap (tracemalloc) for in-process stages and the
+process RSS for the site scripts.
+
+Usage:
+    python3 benchmark.py
+    python3 benchmark.py --sizes=100,1000,10000 --only=airtable,site
+    python3 benchmark.py --baseline=benchmark-results-old.json
+
+Options:
+    --sizes=1000               companions per run (x5 languages)
+    --only=GROUP,...           airtable, text, translate, site
+    --latency=0.05             stand-in seconds per request
+    --token-latency=0.001      stand-in seconds per generated token
+    --airtable-rps=5           Airtable requests/s (0 = unlimited)
+    --rpm=50 --tpm=80000       Claude requests and tokens per minute
+    --translate-records=20     verdicts sent through the translation engine
+    --page-kb=8                approximate size of each synthetic HTML page
+    --output=benchmark-results.json
+    --baseline=FILE            earlier report to compare against
+"""
+
+import os
+import ast
+import sys
+import json
+import math
+import time
+import shutil
+import random
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from datetime import datetime, timezone
+
+from airtable_client import AirtableClient, rate_limiter_for
+from airtable_mirror import AirtableMirror
+from airtable_query import Query, SCHEMA, lookup_by_slug
+from api_standin import StandIn, SyntheticBackend, Limits, LANGUAGES, paragraphs
+from glossary import Glossary
+from record_pipeline import run_update_job
+from text_chunker import chunk_markdown
+from translation_engine import TranslationEngine
+from translation_prompts import NL_COMPANION
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_PATH = os.path.join(ROOT, 'benchmark-results.json')
+GROUPS = ('airtable', 'text', 'translate', 'site')
+
+# A stage is superlinear when doubling the catalog more than ~2.5x its time
+SUPERLINEAR_EXPONENT = 1.3
+# Timings shorter than this are mostly noise and don't get an exponent
+MIN_SCALING_SECONDS = 0.05
+REGRESSION_RATIO = 1.2
+REGRESSION_MIN_SECONDS = 0.05
+
+SITE_URL = 'https://companionguide.ai'
+
+# Runs one site stage and records its peak RSS, including worker processes.
+# VmHWM is used where available because ru_maxrss would also count the
+# benchmark process the stage was forked from.
+STAGE_RUNNER = '''
+import sys, resource
+peak_path, code = sys.argv[1:3]
+try:
+    exec(compile(code, 'stage', 'exec'), {'__name__': '__stage__'})
+finally:
+    scale = 1 if sys.platform == 'darwin' else 1024
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    try:
+        with open('/proc/self/status') as f:
+            own = next(int(line.split()[1]) * 1024 for line in f if line.startswith('VmHWM:'))
+    except (OSError, StopIteration):
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    with open(peak_path, 'w') as f:
+        f.write(str(max(peak, own)))
+'''
+CATEGORIES_PER_COMPANION = 1 / 25
+
+
+def option(args, name, default, kind=str):
+    for arg in args:
+        if arg.startswith(f'--{name}='):
+            return kind(arg.split('=', 1)[1])
+    return default
+
+
+def script_constant(script, name):
+    """A literal module-level constant from one of the scripts"""
+    with open(os.path.join(ROOT, script), encoding='utf-8') as f:
+        tree = ast.parse(f.read(), script)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, 'id', None) == name for target in node.targets):
+            return ast.literal_eval(node.value)
+    raise KeyError(f"{script} has no constant {name}")
+
+
+class Run:
+    """Stage results for one catalog size"""
+
+    def __init__(self, companions, standin=None, client=None):
+        self.companions = companions
+        self.standin = standin
+        self.client = client
+        self.stages = []
+
+    def traffic(self):
+        stats = self.standin.stats() if self.standin else {}
+        return {
+            'airtable': stats.get('requests', {}).get('airtable', 0),
+            'anthropic': stats.get('requests', {}).get('anthropic', 0),
+            'rate_limited': sum(stats.get('rate_limited', {}).values()),
+        }
+
+    def measure(self, group, name, func):
+        """Time func() in-process; func returns the number of items it handled"""
+        before = self.traffic()
+        tracemalloc.start()
+        started = time.perf_counter()
+        error = None
+        try:
+            items = func()
+        except Exception as e:
+            items = None
+            error = f"{type(e).__name__}: {e}"
+        wall = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        after = self.traffic()
+
+        self.add({
+            'group': group,
+            'stage': name,
+            'wall_s': round(wall, 4),
+            'peak_mb': round(peak / 2**20, 2),
+            'memory': 'python-heap',
+            'items': items,
+            'requests': {key: after[key] - before[key] for key in after},
+            'error': error,
+        })
+
+    def run_script(self, group, name, site, code):
+        """Run `code` in its own process inside the synthetic tree"""
+        log_path = os.path.join(site, f'.{name}.log')
+        peak_path = os.path.join(site, f'.{name}.peak')
+        started = time.perf_counter()
+        with open(log_path, 'wb') as log:
+            exit_code = subprocess.call([sys.executable, '-c', STAGE_RUNNER, peak_path, code],
+                                        cwd=site, stdout=log, stderr=subprocess.STDOUT)
+        wall = time.perf_counter() - started
+
+        try:
+            with open(peak_path, encoding='utf-8') as f:
+                peak = int(f.read())
+        except (OSError, ValueError):
+            peak = 0
+        error = None
+        # verify-hreflang exits 1 when it finds issues, which is expected here
+        if exit_code not in (0, 1):
+            with open(log_path, encoding='utf-8', errors='replace') as f:
+                error = f"exit {exit_code}: {f.read()[-500:]}"
+        self.add({
+            'group': group,
+            'stage': name,
+            'wall_s': round(wall, 4),
+            'peak_mb': round(peak / 2**20, 2),
+            'memory': 'process-rss',
+            'items': None,
+            'exit_code': exit_code,
+            'error': error,
+        })
+
+    def skip(self, group, name, reason):
+        self.add({'group': group, 'stage': name, 'skipped': reason})
+
+    def add(self, stage):
+        self.stages.append(stage)
+        if stage.get('skipped'):
+            print(f"   ⏭️  {stage['stage']:<28} skipped: {stage['skipped']}")
+            return
+        requests = stage.get('requests') or {}
+        traffic = ', '.join(f"{count} {kind}" for kind, count in requests.items() if count)
+        print(f"   {'❌' if stage['error'] else '⏱️ '} {stage['stage']:<28} {stage['wall_s']:>9.3f}s "
+              f"{stage['peak_mb']:>9.1f} MB   {traffic}")
+        if stage['error']:
+            print(f"      {stage['error']}")
+
+    def report(self):
+        return {'companions': self.companions, 'records': self.companions * len(LANGUAGES),
+                'stages': self.stages}
+
+
+# Stage groups
+
+def airtable_stages(run, workdir):
+    client = run.client
+
+    run.measure('airtable', 'fetch-all-cold', lambda: len(client.fetch_all_records(refresh=True)))
+    run.measure('airtable', 'fetch-all-snapshot', lambda: len(client.fetch_all_records()))
+
+    pricing = Query(select=['name (from companion)', 'pricing_plans'], languages=['nl'],
+                    where=[SCHEMA['pricing_plans'].is_not_empty()])
+    run.measure('airtable', 'query-projection', lambda: len(pricing.fetch(client)))
+
+    def lookup():
+        slugs = {record['fields']['slug (from companion)'][0] for record in run.standin.backend.records.values()}
+        keys = [(slug, language) for slug in sorted(slugs) for language in ('en', 'nl')]
+        return len(lookup_by_slug(client, keys, fields=['my_verdict']))
+    run.measure('airtable', 'lookup-by-slug', lookup)
+
+    def update_job():
+        # Touch every fourth record, like a typical fix-up script
+        titles = Query(select=['meta_title'], languages=['nl'])
+        result = run_update_job(client, titles,
+                                lambda record, position: {'meta_title': f'Review {position}'} if position % 4 == 0 else None)
+        return result.updated
+    run.measure('airtable', 'update-job', update_job)
+
+    mirror = AirtableMirror(os.path.join(workdir, 'mirror.sqlite'))
+    run.measure('airtable', 'mirror-sync-full', lambda: mirror.sync(client, full=True)[0])
+    run.measure('airtable', 'mirror-sync-delta', lambda: mirror.sync(client)[0])
+    mirror.close()
+
+
+def english_records(backend):
+    return [record for record in backend.records.values() if record['fields'].get('language') == 'en']
+
+
+def text_stages(run, backend):
+    texts = [record['fields'][field] for record in english_records(backend)
+             for field in ('my_verdict', 'body_text') if record['fields'].get(field)]
+    run.measure('text', 'chunk-markdown', lambda: sum(len(chunk_markdown(text, 'nl')) for text in texts))
+
+    # translate-pricing-plans.py fills its string tables with this glossary's translate()
+    script = 'translate-pricing-plans.py'
+    glossary = Glossary(script_constant(script, 'NL_TRANSLATIONS'), preserve=script_constant(script, 'PRESERVE_TERMS'))
+    features = [feature for record in english_records(backend)
+                for plan in json.loads(record['fields'].get('pricing_plans') or '[]')
+                for feature in plan.get('features', [])]
+    run.measure('text', 'translate-text-glossary', lambda: len([glossary.translate(feature) for feature in features]))
+
+
+def translate_stages(run, backend, settings):
+    try:
+        from anthropic import Anthropic
+    except ImportError:
+        run.skip('translate', 'translate-many', 'anthropic is not installed')
+        return
+
+    anthropic = Anthropic(api_key='standin', base_url=run.standin.url)
+    engine = TranslationEngine(anthropic, requests_per_minute=settings['rpm'] or 10**6,
+                               tokens_per_minute=settings['tpm'] or 10**9)
+
+    records = english_records(backend)[:settings['translate_records']]
+    jobs = [(record['id'], chunk_markdown(record['fields']['my_verdict'], 'nl'), NL_COMPANION) for record in records]
+
+    def translate():
+        results = engine.translate_many(jobs)
+        return sum(len(chunks) for chunks in results.values() if chunks)
+    run.measure('translate', 'translate-many', translate)
+
+
+def write_site(site, backend, page_kb):
+    """HTML tree for the synthetic catalog, with a share of the defects the fixers repair"""
+    filler = paragraphs(random.Random(1), (40, 40))
+    filler = '\n'.join(f'<p>{para}</p>' for para in filler.split('\n\n'))
+    filler = (filler * (page_kb * 1024 // max(len(filler), 1) + 1))[:page_kb * 1024]
+
+    slugs = sorted({record['fields']['slug (from companion)'][0] for record in backend.records.values()})
+    categories = [f'category-{number}' for number in range(max(1, int(len(slugs) * CATEGORIES_PER_COMPANION)))]
+    pages = [('companions', slug, number) for number, slug in enumerate(slugs)]
+    pages += [('categories', slug, number) for number, slug in enumerate(categories)]
+    pages += [('', name, number) for number, name in enumerate(('index', 'companions', 'categories'))]
+
+    written = 0
+    for section, slug, number in pages:
+        for lang in LANGUAGES:
+            key = '/'.join(part for part in (section, '' if slug == 'index' else slug) if part)
+            url = '/'.join(part for part in (SITE_URL, '' if lang == 'en' else lang, key) if part)
+
+            alternates = []
+            # Every 10th English page lost its hreflang block (fix-*-hreflang add it back)
+            if not (lang == 'en' and number % 10 == 3):
+                for other in LANGUAGES + ('x-default',):
+                    prefix = '' if other in ('en', 'x-default') else other
+                    href = '/'.join(part for part in (SITE_URL, prefix, key) if part)
+                    # Every 7th page links its alternates with .html (fix-hreflang-canonical)
+                    if number % 7 == 5 and key:
+                        href += '.html'
+                    alternates.append(f'    <link rel="alternate" hreflang="{other}" href="{href}">')
+
+            robots = 'noindex, follow' if lang != 'en' and number % 13 == 7 else 'index, follow'
+            content = '\n'.join([
+                '<!DOCTYPE html>',
+                f'<html lang="{lang}">',
+                '<head>',
+                '    <meta charset="UTF-8">',
+                f'    <title>{slug} | CompanionGuide.ai</title>',
+                f'    <meta name="robots" content="{robots}">',
+                f'    <link rel="canonical" href="{url}">',
+                *alternates,
+                '</head>',
+                '<body>',
+                f'<main><h1>{slug}</h1>',
+                filler,
+                '</main>',
+                '</body>',
+                '</html>',
+                '',
+            ])
+
+            directory = os.path.join(site, '' if lang == 'en' else lang, section)
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f'{slug}.html'), 'w', encoding='utf-8') as f:
+                f.write(content)
+            written += 1
+    return written
+
+
+def site_stages(run, backend, workdir, page_kb):
+    site = os.path.join(workdir, 'site')
+    os.makedirs(site)
+    # The scripts resolve their state files next to themselves, so they run
+    # from a copy placed beside the synthetic tree
+    for name in os.listdir(ROOT):
+        if name.endswith('.py'):
+            shutil.copy2(os.path.join(ROOT, name), site)
+
+    started = time.perf_counter()
+    pages = write_site(site, backend, page_kb)
+    print(f"   📄 {pages} HTML pages written in {time.perf_counter() - started:.1f}s")
+
+    def script(name):
+        return f"import runpy, sys; sys.argv = [{name!r}]; runpy.run_path({name!r}, run_name='__main__')"
+
+    index = 'from hreflang_index import HreflangIndex; HreflangIndex.load().save()'
+    run.run_script('site', 'hreflang-index-cold', site, index)
+    run.run_script('site', 'hreflang-index-warm', site, index)
+    run.run_script('site', 'verify-hreflang', site, script('verify-hreflang.py'))
+    run.run_script('site', 'fix-hreflang-canonical', site, script('fix-hreflang-canonical.py'))
+    run.run_script('site', 'fix-hreflang-reciprocal', site, script('fix-hreflang-reciprocal.py'))
+    run.run_script('site', 'fix-category-hreflang', site, script('fix-category-hreflang.py'))
+    run.run_script('site', 'site-sweep', site, script('site-sweep.py'))
+    run.run_script('site', 'generate-sitemap-cold', site, script('generate-sitemap.py'))
+    run.run_script('site', 'generate-sitemap-warm', site, script('generate-sitemap.py'))
+    return pages
+
+
+def run_size(companions, settings):
+    print(f"\n📦 {companions} companions x {len(LANGUAGES)} languages")
+    workdir = tempfile.mkdtemp(prefix=f'benchmark-{companions}-')
+    backend = SyntheticBackend(companions=companions)
+    limits = Limits(latency=settings['latency'], token_latency=settings['token_latency'],
+                    airtable_rps=settings['airtable_rps'], anthropic_rpm=settings['rpm'],
+                    anthropic_tpm=settings['tpm'])
+
+    try:
+        with StandIn(backend, limits=limits) as standin:
+            base_id = f'appBenchmark{companions}'
+            rate_limiter_for(base_id, settings['airtable_rps'] or 10**6)
+            client = AirtableClient('standin', base_id, api_root=standin.airtable_root,
+                                    cache_dir=os.path.join(workdir, 'cache'))
+            run = Run(companions, standin, client)
+
+            if 'airtable' in settings['only']:
+                airtable_stages(run, workdir)
+            if 'text' in settings['only']:
+                text_stages(run, backend)
+            if 'translate' in settings['only']:
+                translate_stages(run, backend, settings)
+            report = run.report()
+            if 'site' in settings['only']:
+                report['pages'] = site_stages(run, backend, workdir, settings['page_kb'])
+            return report
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# Analysis
+
+def scaling(runs):
+    """Growth exponent of every stage between consecutive sizes"""
+    rows = []
+    for smaller, larger in zip(runs, runs[1:]):
+        before = {stage['stage']: stage for stage in smaller['stages'] if 'wall_s' in stage}
+        for stage in larger['stages']:
+            base = before.get(stage['stage'])
+            if not base or 'wall_s' not in stage or base['wall_s'] < MIN_SCALING_SECONDS:
+                continue
+            exponent = math.log(stage['wall_s'] / base['wall_s']) / math.log(larger['companions'] / smaller['companions'])
+            rows.append({
+                'stage': stage['stage'],
+                'from': smaller['companions'],
+                'to': larger['companions'],
+                'exponent': round(exponent, 2),
+                'superlinear': exponent >= SUPERLINEAR_EXPONENT,
+            })
+    return rows
+
+
+def regressions(runs, baseline):
+    """Stages slower or hungrier than the same stage at the same size in `baseline`"""
+    earlier = {(run['companions'], stage['stage']): stage
+               for run in baseline.get('runs', []) for stage in run['stages'] if 'wall_s' in stage}
+    rows = []
+    for run in runs:
+        for stage in run['stages']:
+            base = earlier.get((run['companions'], stage['stage']))
+            if not base or 'wall_s' not in stage:
+                continue
+            for metric in ('wall_s', 'peak_mb'):
+                if stage[metric] > base[metric] * REGRESSION_RATIO and \
+                        stage[metric] - base[metric] > (REGRESSION_MIN_SECONDS if metric == 'wall_s' else 1):
+                    rows.append({'companions': run['companions'], 'stage': stage['stage'], 'metric': metric,
+                                 'baseline': base[metric], 'now': stage[metric]})
+    return rows
+
+
+def main():
+    args = sys.argv[1:]
+    try:
+        settings = {
+            'sizes': sorted(int(size) for size in option(args, 'sizes', '1000').split(',')),
+            'only': option(args, 'only', ','.join(GROUPS)).split(','),
+            'latency': option(args, 'latency', 0.05, float),
+            'token_latency': option(args, 'token-latency', 0.001, float),
+            'airtable_rps': option(args, 'airtable-rps', 5, int),
+            'rpm': option(args, 'rpm', 50, int),
+            'tpm': option(args, 'tpm', 80000, int),
+            'translate_records': option(args, 'translate-records', 20, int),
+            'page_kb': option(args, 'page-kb', 8, int),
+        }
+    except ValueError as e:
+        print(f"❌ Invalid option: {e}")
+        exit(1)
+    unknown = set(settings['only']) - set(GROUPS)
+    if unknown:
+        print(f"❌ Unknown stage group: {', '.join(sorted(unknown))} (choose from {', '.join(GROUPS)})")
+        exit(1)
+    output = option(args, 'output', OUTPUT_PATH)
+
+    baseline = None
+    baseline_path = option(args, 'baseline', None)
+    if baseline_path:
+        try:
+            with open(baseline_path, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot read baseline: {e}")
+            exit(1)
+
+    print(f"🏁 Benchmarking {', '.join(settings['only'])} at {', '.join(map(str, settings['sizes']))} companions")
+    runs = [run_size(companions, settings) for companions in settings['sizes']]
+
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': settings,
+        'runs': runs,
+        'scaling': scaling(runs),
+    }
+    if baseline is not None:
+        report['regressions'] = regressions(runs, baseline)
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+        f.write('\n')
+
+    print(f"\n{'='*60}")
+    superlinear = [row for row in report['scaling'] if row['superlinear']]
+    for row in superlinear:
+        print(f"⚠️  {row['stage']}: time grows as n^{row['exponent']} from {row['from']} to {row['to']} companions")
+    for row in report.get('regressions', []):
+        print(f"❌ {row['stage']} ({row['companions']} companions): {row['metric']} "
+              f"{row['baseline']} -> {row['now']}")
+    failed = [stage['stage'] for run in runs for stage in run['stages'] if stage.get('error')]
+    if failed:
+        print(f"❌ Failed stages: {', '.join(sorted(set(failed)))}")
+    if not (superlinear or report.get('regressions') or failed):
+        print("✅ No superlinear stages or regressions")
+    print(f"💾 Report written to {output}")
+    print(f"{'='*60}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Catalog-wide dedupe of the short strings inside pricing_plans blobs.
+
+The same plan features ("Unlimited messages", "Priority support", "No ads")
+appear in dozens of records and every language. A StringTable gathers the
+distinct strings of the whole catalog first, translates each one once per
+language (through a glossary, or through the model in a few batched
+requests), and every plan is then rebuilt from the table. Translation work
+grows with the vocabulary instead of with the number of records.
+
+Status markers in front of a feature ("✅ ", "❌ ", "• ") are split off
+before deduping, so "✅ Voice chat" and "❌ Voice chat" share one entry.
+
+Usage:
+    from catalog_strings import StringTable, parse_json_field, plan_strings, map_plan_strings
+
+    table = StringTable(glossary.translate)
+    for record in records:
+        table.add_all(plan_strings(parse_json_field(record['fields'].get('pricing_plans'))))
+    table.translate_pending()
+    translated = map_plan_strings(plans, table.get)
+"""
+
+import re
+import json
+from collections import Counter
+
+# Plan keys that are never translated; of the lists only 'features' is
+PLAN_KEEP = {'name', 'price'}
+
+MARKER = re.compile(r'^\s*(?:[✅❌✓✔✗✘•]\s*)+')
+
+
+def split_marker(text):
+    """Split a feature into its leading status marker and the text after it"""
+    match = MARKER.match(text)
+    marker = match.group() if match else ''
+    return marker, text[len(marker):].strip()
+
+
+def parse_json_field(value):
+    """A pricing_plans/features value as a list (JSON string or already parsed), or None"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return None
+    return value if isinstance(value, list) else None
+
+
+def plan_strings(plans):
+    """Every translatable string in a parsed pricing_plans list"""
+    for plan in plans or []:
+        if not isinstance(plan, dict):
+            continue
+        for key, value in plan.items():
+            if key in PLAN_KEEP:
+                continue
+            if isinstance(value, str):
+                yield value
+            elif key == 'features' and isinstance(value, list):
+                yield from (item for item in value if isinstance(item, str))
+
+
+def map_plan_strings(plans, translate):
+    """Rebuild a parsed pricing_plans list with translate() applied to each translatable string"""
+    mapped = []
+    for plan in plans:
+        if not isinstance(plan, dict):
+            mapped.append(plan)
+            continue
+
+        translated_plan = {}
+        for key, value in plan.items():
+            if key in PLAN_KEEP:
+                translated_plan[key] = value
+            elif isinstance(value, str):
+                translated_plan[key] = translate(value)
+            elif key == 'features' and isinstance(value, list):
+                translated_plan[key] = [translate(item) if isinstance(item, str) else item for item in value]
+            else:
+                translated_plan[key] = value
+        mapped.append(translated_plan)
+    return mapped
+
+
+class StringTable:
+    """
+    Distinct strings of one language and their translations.
+
+    `translate_one(text)` translates a single string; it is used by
+    translate_pending() and for strings get() meets that were never added.
+    """
+
+    def __init__(self, translate_one=None):
+        self.translate_one = translate_one
+        self.counts = Counter()
+        self.translations = {}
+
+    def add(self, text):
+        _, core = split_marker(text)
+        if core:
+            self.counts[core] += 1
+
+    def add_all(self, texts):
+        for text in texts:
+            self.add(text)
+
+    def pending(self):
+        return [text for text in self.counts if text not in self.translations]
+
+    def translate_pending(self):
+        """Translate every distinct string not translated yet, one call each"""
+        for text in self.pending():
+            self.translations[text] = self.translate_one(text)
+
+    def translate_batched(self, batcher):
+        """Translate the pending strings through a FieldBatcher; failures stay pending"""
+        results = batcher.translate([(text, text) for text in self.pending()])
+        for text, translated in results.items():
+            if translated is not None:
+                self.translations[text] = translated
+
+    def covers(self, texts):
+        """True when every one of `texts` has a translation"""
+        return all(not core or core in self.translations for _, core in map(split_marker, texts))
+
+    def get(self, text):
+        """Translation of `text` with its marker kept; unknown strings fall back to translate_one"""
+        marker, core = split_marker(text)
+        if not core:
+            return text
+
+        if core not in self.translations:
+            if self.translate_one is None:
+                return text
+            self.translations[core] = self.translate_one(core)
+        return marker + self.translations[core]
+
+    def report(self, language):
+        occurrences = sum(self.counts.values())
+        print(f"🔤 {language.upper()}: {len(self.counts)} distinct strings for {occurrences} occurrences "
+              f"({len(self.translations)} translated)")
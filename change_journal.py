@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Change journal for incremental translation runs.
+
+For every EN record and target language the journal remembers a fingerprint
+(SHA-256) of each translatable field as it was when that language was last
+synced successfully. A translation script asks for the records whose current
+EN content differs from that, translates only those fields, and marks them
+synced once the write has gone through. A crashed run simply leaves the
+remaining records pending for the next one.
+
+Usage:
+    from change_journal import ChangeJournal
+
+    journal = ChangeJournal()
+    for record, fields in journal.pending(en_records, 'nl', ['my_verdict']):
+        ...
+    journal.mark_synced(record, 'nl', fields)
+
+CLI:
+    python3 change_journal.py status nl [field ...]
+    python3 change_journal.py baseline nl [field ...]   # mark current EN content as synced
+"""
+
+import os
+import sys
+import json
+import hashlib
+import sqlite3
+from datetime import datetime, timezone
+
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.change-journal.sqlite')
+
+TRANSLATABLE_FIELDS = (
+    'body_text', 'my_verdict', 'tagline', 'description', 'best_for', 'pricing_plans', 'features'
+)
+
+
+# An existing translation is only trusted with at least this many characters
+# and this share of the EN length (the check translate-body-text-nl.py uses)
+MIN_TRANSLATED_CHARS = 100
+MIN_TRANSLATED_RATIO = 0.8
+
+
+def looks_translated(source, translated):
+    """
+    `translated` is a finished translation of `source`, safe to adopt as
+    synced: not a placeholder, not cut off, and not a copy of the EN text
+    """
+    source = (source or '').strip()
+    translated = (translated or '').strip()
+    return (len(translated) >= MIN_TRANSLATED_CHARS
+            and len(translated) >= len(source) * MIN_TRANSLATED_RATIO
+            and translated != source)
+
+
+def fingerprint(value):
+    """Stable hash of a field value; JSON fields are hashed in canonical form"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return hashlib.sha256(value.strip().encode('utf-8')).hexdigest()
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ChangeJournal:
+    """SQLite record of which EN field versions each language has been synced to"""
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS synced (
+                record_id TEXT NOT NULL,
+                language TEXT NOT NULL,
+                field TEXT NOT NULL,
+                fingerprint TEXT,
+                synced_at TEXT NOT NULL,
+                PRIMARY KEY (record_id, language, field)
+            )
+        ''')
+        self.db.commit()
+
+    def synced_fingerprints(self, language):
+        rows = self.db.execute(
+            'SELECT record_id, field, fingerprint FROM synced WHERE language = ?', (language,)
+        )
+        return {(record_id, field): fp for record_id, field, fp in rows}
+
+    def changed_fields(self, record, language, fields=TRANSLATABLE_FIELDS, synced=None):
+        """Fields of an EN record whose content changed since `language` was last synced"""
+        if synced is None:
+            synced = self.synced_fingerprints(language)
+
+        changed = []
+        for field in fields:
+            current = fingerprint(record.get('fields', {}).get(field))
+            if current is None:
+                continue
+            if synced.get((record['id'], field)) != current:
+                changed.append(field)
+        return changed
+
+    def pending(self, en_records, language, fields=TRANSLATABLE_FIELDS):
+        """[(record, changed_fields)] for every EN record with work left for `language`"""
+        synced = self.synced_fingerprints(language)
+        work = []
+        for record in en_records:
+            changed = self.changed_fields(record, language, fields, synced)
+            if changed:
+                work.append((record, changed))
+        return work
+
+    def mark_synced(self, record, language, fields):
+        """Record the current EN content of `fields` as translated into `language`"""
+        now = datetime.now(timezone.utc).isoformat()
+        values = record.get('fields', {})
+        self.db.executemany(
+            'INSERT OR REPLACE INTO synced VALUES (?, ?, ?, ?, ?)',
+            [(record['id'], language, field, fingerprint(values.get(field)), now) for field in fields]
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ('status', 'baseline'):
+        print("Usage: python3 change_journal.py status|baseline <language> [field ...]")
+        exit(1)
+
+    from airtable_client import AirtableClient
+
+    command, language = sys.argv[1], sys.argv[2]
+    fields = sys.argv[3:] or list(TRANSLATABLE_FIELDS)
+
+    client = AirtableClient.from_env()
+    journal = ChangeJournal()
+
+    print("📥 Fetching EN records...")
+    en_records = client.fetch_all_records(filter_formula="{language} = 'en'")
+    work = journal.pending(en_records, language, fields)
+
+    if command == 'baseline':
+        for record, changed in work:
+            journal.mark_synced(record, language, changed)
+        print(f"✅ Marked {len(work)} EN records as synced to {language.upper()}")
+        return
+
+    print(f"📊 {len(work)} of {len(en_records)} EN records changed since the last {language.upper()} sync")
+    for record, changed in work:
+        name = record['fields'].get('name', record['id'])
+        print(f"   🔄 {name}: {', '.join(changed)}")
+
+
+if __name__ == '__main__':
+    main()
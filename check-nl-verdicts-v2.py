@@ -1,77 +1,77 @@
 #!/usr/bin/env python3
 """
 Check NL my_verdict translation status
-"""
-
-import os
-import requests
-import time
-
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Companion_Translations'
-headers = {'Authorization': f'Bearer {AIRTABLE_TOKEN}'}
-
-print("📥 Fetching all Companion_Translations records...")
 
-# Fetch all records
-all_records = []
-offset = None
+A verdict needs work when translation_audit.py flags it against the EN
+verdict: missing, untranslated, or an outlier in length, structure, numbers
+or glossary terms compared with the rest of the catalog.
 
-while True:
-    params = {}
-    if offset:
-        params['offset'] = offset
+An NL record with no EN record, or with an empty EN verdict, can't be
+audited. It is listed separately and falls back to the old check: under
+100 characters needs translation.
+"""
 
-    response = requests.get(API_URL, headers=headers, params=params)
+from airtable_client import AirtableClient, AirtableError
+from airtable_query import Query
+from translation_audit import TranslationAudit, record_pairs
 
-    if response.status_code != 200:
-        print(f"❌ Error: {response.status_code}")
-        print(response.text)
-        break
+client = AirtableClient.from_env()
 
-    data = response.json()
-    all_records.extend(data.get('records', []))
+QUERY = Query(select=['name (from companion)', 'slug (from companion)', 'my_verdict'], languages=['en', 'nl'])
 
-    offset = data.get('offset')
-    if not offset:
-        break
+print("📥 Fetching EN and NL my_verdict records...")
 
-    time.sleep(0.2)
+try:
+    records = QUERY.fetch(client)
+except AirtableError as e:
+    print(f"❌ Error: {e.status_code}")
+    print(e.text)
+    records = []
 
-print(f"✅ Fetched {len(all_records)} total records\n")
+# Name and slug are lookup fields; the query unwraps them
+by_slug = {}
+names = {}
+ids = {}
+for record in records:
+    slug = QUERY.value(record, 'slug (from companion)', 'unknown')
+    language = QUERY.value(record, 'language')
+    by_slug.setdefault(slug, {}).setdefault(language, record)
+    names[slug] = QUERY.value(record, 'name (from companion)', 'Unknown')
+    if language == 'nl':
+        ids[slug] = record['id']
 
-# Filter for NL records
-nl_records = []
-for record in all_records:
-    fields = record['fields']
-    lang = fields.get('language', '')
+nl_slugs = [slug for slug, by_language in by_slug.items() if 'nl' in by_language]
+print(f"Found {len(nl_slugs)} NL records\n")
 
-    if lang == 'nl':
-        nl_records.append(record)
+audit = TranslationAudit(record_pairs(by_slug, ['nl'], ['my_verdict']))
+flagged = {row['key']: row['reasons'] for row in audit.flagged()}
 
-print(f"Found {len(nl_records)} NL records\n")
+# Verdicts the audit can't compare are judged by length, as before
+MIN_CHARS = 100
 
 # Check status
 needs_translation = []
 completed = []
-
-for record in nl_records:
-    fields = record['fields']
-
-    # Get name and slug from lookup fields
-    name_field = fields.get('name (from companion)', [])
-    slug_field = fields.get('slug (from companion)', [])
-
-    name = name_field[0] if isinstance(name_field, list) and name_field else 'Unknown'
-    slug = slug_field[0] if isinstance(slug_field, list) and slug_field else 'unknown'
-
-    verdict = fields.get('my_verdict', '')
-
-    if not verdict or len(verdict.strip()) < 100:
-        needs_translation.append((name, slug, len(verdict), record['id']))
+unaudited = []
+
+for slug in nl_slugs:
+    verdict = QUERY.value(by_slug[slug]['nl'], 'my_verdict', '') or ''
+    en_record = by_slug[slug].get('en')
+    en_verdict = (QUERY.value(en_record, 'my_verdict', '') or '') if en_record else ''
+
+    if slug in flagged:
+        needs_translation.append((names[slug], slug, len(verdict), ids[slug], flagged[slug]))
+    elif not en_verdict.strip():
+        reason = 'no EN record' if en_record is None else 'EN verdict is empty'
+        unaudited.append((names[slug], slug, len(verdict), reason))
+        if len(verdict.strip()) < MIN_CHARS:
+            needs_translation.append((names[slug], slug, len(verdict), ids[slug], [reason, f'under {MIN_CHARS} chars']))
+        else:
+            completed.append((names[slug], slug, len(verdict)))
+    elif verdict.strip():
+        completed.append((names[slug], slug, len(verdict)))
     else:
-        completed.append((name, slug, len(verdict)))
+        needs_translation.append((names[slug], slug, len(verdict), ids[slug], ['missing']))
 
 print("=" * 80)
 print(f"✅ COMPLETED: {len(completed)} records")
@@ -84,12 +84,21 @@ if needs_translation:
     print("=" * 80)
     print(f"⏳ NEED TRANSLATION: {len(needs_translation)} records")
     print("=" * 80)
-    for name, slug, length, rec_id in sorted(needs_translation):
-        print(f"  ⚠️  {name:30} ({slug:30}) - {length:6} chars")
+    for name, slug, length, rec_id, reasons in sorted(needs_translation):
+        print(f"  ⚠️  {name:30} ({slug:30}) - {length:6} chars: {', '.join(reasons)}")
 
     print("\nRecord IDs to translate:")
-    for name, slug, length, rec_id in needs_translation:
+    for name, slug, length, rec_id, reasons in needs_translation:
         print(f"  {slug}: {rec_id}")
 
+if unaudited:
+    print()
+    print("=" * 80)
+    print(f"❓ NOT AUDITED: {len(unaudited)} records (no EN verdict to compare with)")
+    print("=" * 80)
+    for name, slug, length, reason in sorted(unaudited):
+        print(f"  ?  {name:30} ({slug:30}) - {length:6} chars: {reason}")
+
+total = len(completed) + len(needs_translation)
 print()
-print(f"Progress: {len(completed)}/{len(nl_records)} ({100*len(completed)//len(nl_records) if nl_records else 0}%)")
+print(f"Progress: {len(completed)}/{total} ({100*len(completed)//total if total else 0}%)")
@@ -3,57 +3,29 @@
 Check how many NL/PT records have pricing_plans and which ones were skipped
 """
 
-import os
-import json
-import requests
+from airtable_client import AirtableClient, AirtableError
+from airtable_query import Query
 
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-TRANSLATIONS_TABLE_NAME = 'Companion_Translations'
+client = AirtableClient.from_env()
 
-if not AIRTABLE_TOKEN or not AIRTABLE_BASE_ID:
-    print("❌ Error: AIRTABLE_TOKEN_CG and AIRTABLE_BASE_ID_CG must be set")
-    exit(1)
-
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{TRANSLATIONS_TABLE_NAME}'
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+QUERY = Query(select=['name', 'pricing_plans'], languages=['nl', 'pt'])
 
 def fetch_all_records():
-    """Fetch all records"""
-    records = []
-    offset = None
-
-    while True:
-        params = {}
-        if offset:
-            params['offset'] = offset
-
-        response = requests.get(API_URL, headers=headers, params=params)
-
-        if response.status_code != 200:
-            print(f"❌ Error: {response.status_code}")
-            return None
-
-        data = response.json()
-        records.extend(data.get('records', []))
-
-        offset = data.get('offset')
-        if not offset:
-            break
-
-    return records
-
-print("📥 Fetching all records...")
+    """Fetch the NL/PT names and pricing plans"""
+    try:
+        return QUERY.fetch(client)
+    except AirtableError as e:
+        print(f"❌ Error: {e.status_code}")
+        return None
+
+print("📥 Fetching NL/PT pricing records...")
 records = fetch_all_records()
 
 if not records:
     print("❌ Failed to fetch records")
     exit(1)
 
-print(f"✅ Fetched {len(records)} total records\n")
+print(f"✅ Fetched {len(records)} NL/PT records\n")
 
 # Count by language
 nl_count = 0
@@ -3,23 +3,19 @@
 Check which NL/PT pricing_plans still contain English terms that should be translated
 """
 
-import os
 import json
-import requests
 
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-TRANSLATIONS_TABLE_NAME = 'Companion_Translations'
+from airtable_client import AirtableClient, AirtableError
+from airtable_query import Query, SCHEMA
 
-if not AIRTABLE_TOKEN or not AIRTABLE_BASE_ID:
-    print("❌ Error: AIRTABLE_TOKEN_CG and AIRTABLE_BASE_ID_CG must be set")
-    exit(1)
+client = AirtableClient.from_env()
 
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{TRANSLATIONS_TABLE_NAME}'
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+# Only NL/PT records that have pricing plans at all
+QUERY = Query(
+    select=['name', 'pricing_plans'],
+    languages=['nl', 'pt'],
+    where=[SCHEMA['pricing_plans'].is_not_empty()]
+)
 
 # English terms that SHOULD be translated (not technical terms)
 SHOULD_TRANSLATE = [
@@ -32,29 +28,12 @@ SHOULD_TRANSLATE = [
 ]
 
 def fetch_all_records():
-    """Fetch all records"""
-    records = []
-    offset = None
-
-    while True:
-        params = {}
-        if offset:
-            params['offset'] = offset
-
-        response = requests.get(API_URL, headers=headers, params=params)
-
-        if response.status_code != 200:
-            print(f"❌ Error: {response.status_code}")
-            return None
-
-        data = response.json()
-        records.extend(data.get('records', []))
-
-        offset = data.get('offset')
-        if not offset:
-            break
-
-    return records
+    """Fetch the NL/PT names and pricing plans"""
+    try:
+        return QUERY.fetch(client)
+    except AirtableError as e:
+        print(f"❌ Error: {e.status_code}")
+        return None
 
 def check_needs_translation(pricing_json, lang):
     """Check if pricing still contains English terms that should be translated"""
@@ -78,14 +57,14 @@ def check_needs_translation(pricing_json, lang):
 
     return len(found_terms) > 0, found_terms
 
-print("📥 Fetching all records...")
+print("📥 Fetching NL/PT pricing records...")
 records = fetch_all_records()
 
 if not records:
     print("❌ Failed to fetch records")
     exit(1)
 
-print(f"✅ Fetched {len(records)} total records\n")
+print(f"✅ Fetched {len(records)} NL/PT records with pricing\n")
 
 nl_needs_update = []
 pt_needs_update = []
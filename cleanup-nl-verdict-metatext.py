@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 """
 Remove Claude meta-text from all NL my_verdict fields
+
+New translations are scrubbed inline by TranslationEngine (meta_scrubber.py);
+this is a one-off sweep for verdicts written before that.
 """
 
 import os
 import requests
 import time
-import re
+
+from meta_scrubber import scrub
 
 AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
@@ -16,39 +20,6 @@ headers = {
     'Content-Type': 'application/json'
 }
 
-def clean_meta_text(text):
-    """Remove Claude's meta-text from translation"""
-
-    # Patterns to remove from START of text
-    start_patterns = [
-        r"^Here's the Dutch translation.*?:\s*\n+",
-        r"^Here is the Dutch translation.*?:\s*\n+",
-        r"^Hier is de Nederlandse vertaling.*?:\s*\n+",
-    ]
-
-    # Patterns to remove from END of text
-    end_patterns = [
-        r"\n*\[Note:.*?\]\s*$",
-        r"\n*\[Continue.*?\]\s*$",
-        r"\n*\[Would you like.*?\]\s*$",
-        r"\n*\[Bericht me.*?\]\s*$",
-    ]
-
-    cleaned = text
-
-    # Remove from start
-    for pattern in start_patterns:
-        cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE | re.DOTALL)
-
-    # Remove from end
-    for pattern in end_patterns:
-        cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE | re.DOTALL)
-
-    # Remove multiple consecutive newlines
-    cleaned = re.sub(r'\n{3,}', '\n\n', cleaned)
-
-    return cleaned.strip()
-
 print("🧹 Scanning all NL my_verdict fields for meta-text...")
 print("=" * 70)
 
@@ -91,7 +62,7 @@ for record in nl_records:
         continue
 
     # Clean the verdict
-    cleaned = clean_meta_text(verdict)
+    cleaned = scrub(verdict)
 
     if cleaned != verdict:
         print(f"🧹 {name:30} - Cleaning meta-text")
@@ -9,6 +9,7 @@ import json
 import requests
 from datetime import datetime
 import time
+from functools import lru_cache
 
 # Airtable configuration
 AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
@@ -180,6 +181,8 @@ def fetch_all_records():
     print(f"✅ Fetched {len(records)} records")
     return records
 
+# The same title/description pairs repeat across the catalog: expand each distinct one once
+@lru_cache(maxsize=None)
 def expand_description(title, current_desc, lang='en'):
     """
     Expand a feature description based on title
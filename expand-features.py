@@ -10,53 +10,24 @@ This script will:
 5. Update the records back to Airtable
 """
 
-import os
 import json
-import requests
 from datetime import datetime
 
-# Airtable configuration
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-TRANSLATIONS_TABLE_NAME = 'Companion_Translations'
-
-if not AIRTABLE_TOKEN or not AIRTABLE_BASE_ID:
-    print("❌ Error: AIRTABLE_TOKEN_CG and AIRTABLE_BASE_ID_CG must be set")
-    exit(1)
-
-# Airtable API base URL
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{TRANSLATIONS_TABLE_NAME}'
+from airtable_client import AirtableClient, AirtableError
 
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+# Airtable configuration
+client = AirtableClient.from_env()
 
 def fetch_all_records():
     """Fetch all records from Companion_Translations table"""
     print("📥 Fetching records from Companion_Translations...")
     
-    records = []
-    offset = None
-    
-    while True:
-        params = {}
-        if offset:
-            params['offset'] = offset
-        
-        response = requests.get(API_URL, headers=headers, params=params)
-        
-        if response.status_code != 200:
-            print(f"❌ Error fetching records: {response.status_code}")
-            print(response.text)
-            return None
-        
-        data = response.json()
-        records.extend(data.get('records', []))
-        
-        offset = data.get('offset')
-        if not offset:
-            break
+    try:
+        records = client.fetch_all_records()
+    except AirtableError as e:
+        print(f"❌ Error fetching records: {e.status_code}")
+        print(e.text)
+        return None
     
     print(f"✅ Fetched {len(records)} records")
     return records
@@ -109,13 +80,13 @@ def expand_features(features, lang='en'):
 
 def update_record(record_id, fields):
     """Update a single record in Airtable"""
-    url = f'{API_URL}/{record_id}'
+    url = f'{client.api_url}/{record_id}'
     
     data = {
         'fields': fields
     }
     
-    response = requests.patch(url, headers=headers, json=data)
+    response = client.request('PATCH', url, json=data)
     
     if response.status_code != 200:
         print(f"❌ Error updating record {record_id}: {response.status_code}")
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Batched translation of short fields.
+
+Sent one by one, every tagline, description or short verdict pays a full
+request: latency, a request-budget slot and the instructions around it.
+FieldBatcher packs many short fields, from one record or across records,
+into a single request. The fields go out as a JSON object of numbered items
+and the model answers with the same object, translated. Each value is
+validated on its own (a non-empty string with the source's paragraph count
+and a plausible length); only the items that fail are packed again, into
+smaller batches since a cut-off reply is the usual cause, and whatever still
+fails after that is sent one by one. Fields too long for a batch go straight
+to the engine's normal per-chunk path.
+
+Requests go through the TranslationEngine, so they share its budgets, its
+cached rules block, its translation memory and its model routing: fields
+are packed per model tier, so a batch of taglines never waits on the
+strong model. Fields are filed in the
+memory under the prompt's ruleset, so batched and single translations reuse
+each other.
+
+Usage:
+    from field_batcher import FieldBatcher
+
+    batcher = FieldBatcher(engine, PT_COMPANION)
+    results = batcher.translate(
+        [((companion_id, field), text) for ...], label=lambda key: key[1]
+    )
+    # {(companion_id, field): translated text, or None if it failed}
+    batcher.report()
+"""
+
+import re
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from meta_scrubber import scrub
+from text_chunker import max_tokens_for
+from translation_engine import split_paragraphs
+
+MAX_FIELDS = 25
+# Batched rounds before the remaining fields are sent one by one
+MAX_ATTEMPTS = 2
+# Translations outside this length ratio were cut off or merged with a neighbour
+MIN_LENGTH_RATIO = 0.3
+MAX_LENGTH_RATIO = 3.0
+
+CODE_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+
+def parse_object(text):
+    """The JSON object in a response, tolerating a ```json fence or stray text around it"""
+    if not text:
+        return None
+
+    text = CODE_FENCE.sub('', text.strip())
+    try:
+        data = json.loads(text)
+    except ValueError:
+        start, end = text.find('{'), text.rfind('}')
+        if start < 0 or end <= start:
+            return None
+        try:
+            data = json.loads(text[start:end + 1])
+        except ValueError:
+            return None
+
+    return data if isinstance(data, dict) else None
+
+
+def valid_translation(source, value):
+    """Check one returned value against its source field"""
+    if not isinstance(value, str) or not value.strip():
+        return False
+
+    if len(split_paragraphs(value)) != len(split_paragraphs(source)):
+        return False
+
+    # Very short fields (names, one-word labels) can legitimately change length a lot
+    if len(source) >= 40:
+        ratio = len(value.strip()) / len(source.strip())
+        if not MIN_LENGTH_RATIO <= ratio <= MAX_LENGTH_RATIO:
+            return False
+
+    return True
+
+
+class FieldBatcher:
+    """Packs short fields into JSON batch requests on top of a TranslationEngine"""
+
+    def __init__(self, engine, prompt, max_chars=None, max_fields=MAX_FIELDS):
+        self.engine = engine
+        self.prompt = prompt
+        self.batch_prompt = prompt.json_batch()
+        # Leave room in max_tokens for the reply: translations run longer
+        # than the source, plus the JSON keys and quoting
+        self.max_chars = max_chars or engine.max_tokens * 2
+        self.max_fields = max_fields
+        self.ruleset = engine.ruleset or prompt.ruleset
+        self.fields = 0
+        self.batches = 0
+        self.retried = 0
+        self.single = 0
+
+    def pack(self, items, max_chars):
+        """Split (key, text) items into batches of at most max_chars source characters"""
+        batches = []
+        batch = []
+        size = 0
+
+        for key, text in items:
+            if batch and (size + len(text) > max_chars or len(batch) >= self.max_fields):
+                batches.append(batch)
+                batch = []
+                size = 0
+            batch.append((key, text))
+            size += len(text)
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def send_batch(self, batch, label=None, tier=None):
+        """Translate one batch, returning {key: translation} for the items that passed validation"""
+        engine = self.engine
+        tier = tier or engine.default_tier
+        items = {}
+        for number, (key, text) in enumerate(batch, 1):
+            item_id = f'{number}.{label(key)}' if label else str(number)
+            items[item_id] = (key, text)
+            if engine.router:
+                engine.router.log_decision(label(key) if label else engine.field, tier)
+
+        payload = json.dumps({item_id: text for item_id, (_, text) in items.items()}, ensure_ascii=False, indent=1)
+        data = parse_object(engine.complete(
+            self.batch_prompt.message(payload), system=self.batch_prompt.system_blocks(),
+            max_tokens=max_tokens_for(payload, engine.language, min(tier.max_tokens, engine.max_tokens)),
+            tier=tier
+        )) or {}
+
+        done = {}
+        for item_id, (key, text) in items.items():
+            value = data.get(item_id)
+            if not valid_translation(text, value):
+                continue
+            done[key] = self.engine.clean(value)
+        return done
+
+    def translate(self, items, label=None):
+        """
+        Translate (key, text) items with unique keys. `label(key)` can add a
+        hint such as the field name to each item's JSON key; it is also the
+        field type used for model routing. Returns {key: translated text, or
+        None if it failed}, in input order.
+        """
+        engine = self.engine
+        engine.reset_stats()
+        results = {}
+        todo = {}
+        single = []
+
+        for key, text in items:
+            results[key] = None
+            self.fields += 1
+            # Long fields also get translate_cached's paragraph-level reuse
+            if len(text) > self.max_chars:
+                single.append((key, text))
+                continue
+
+            tier = engine.route(text, label(key) if label else None)
+            cached = None
+            if engine.memory:
+                cached = engine.memory.get(text, engine.language, self.ruleset, tier.model)
+            if cached is not None:
+                results[key] = scrub(cached)
+            else:
+                todo.setdefault(tier, []).append((key, text))
+
+        with ThreadPoolExecutor(max_workers=engine.max_workers) as executor:
+            for attempt in range(MAX_ATTEMPTS):
+                if not todo:
+                    break
+
+                futures = {}
+                for tier, tier_items in todo.items():
+                    # Reply room shrinks with the tier's max_tokens, and halves every retry
+                    max_chars = max(min(self.max_chars, tier.max_tokens * 2) >> attempt, 1)
+                    for batch in self.pack(tier_items, max_chars):
+                        futures[executor.submit(self.send_batch, batch, label, tier)] = (tier, batch)
+                self.batches += len(futures)
+                failed = {}
+
+                for future in as_completed(futures):
+                    done = future.result()
+                    tier, batch = futures[future]
+                    for key, text in batch:
+                        if key not in done:
+                            failed.setdefault(tier, []).append((key, text))
+                            continue
+                        results[key] = done[key]
+                        if engine.memory:
+                            engine.remember(text, done[key], self.ruleset, tier.model)
+
+                self.retried += sum(len(tier_items) for tier_items in failed.values())
+                todo = failed
+
+            for tier_items in todo.values():
+                single += tier_items
+            self.single += len(single)
+            futures = {executor.submit(engine.translate_cached, text, self.prompt, self.ruleset,
+                                       label(key) if label else None): key
+                       for key, text in single}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        engine.elapsed = time.monotonic() - engine.started
+        return results
+
+    def report(self):
+        print(f"📦 {self.fields} fields: {self.batches} batched requests, "
+              f"{self.retried} fields retried, {self.single} sent on their own")
+        self.engine.report()
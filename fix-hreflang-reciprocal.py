@@ -10,18 +10,19 @@ import os
 import re
 from pathlib import Path
 
+from hreflang_index import HreflangIndex
+
 def get_companion_slug(filepath):
     """Extract companion slug from filepath"""
     return Path(filepath).stem
 
-def check_translations_exist(slug, base_dir="."):
+def check_translations_exist(index, filepath):
     """Check if NL and PT translations exist for a companion"""
-    nl_path = os.path.join(base_dir, "nl", "companions", f"{slug}.html")
-    pt_path = os.path.join(base_dir, "pt", "companions", f"{slug}.html")
+    translations = index.translations(filepath)
 
     return {
-        'nl': os.path.exists(nl_path),
-        'pt': os.path.exists(pt_path)
+        'nl': 'nl' in translations,
+        'pt': 'pt' in translations
     }
 
 def generate_hreflang_tags(slug, translations):
@@ -44,27 +45,26 @@ def generate_hreflang_tags(slug, translations):
 
     return '\n'.join(tags)
 
-def add_hreflang_to_file(filepath):
+def add_hreflang_to_file(index, filepath):
     """Add hreflang tags to an English companion page"""
     slug = get_companion_slug(filepath)
-    translations = check_translations_exist(slug)
+    translations = check_translations_exist(index, filepath)
 
     # Skip if no translations exist
     if not translations['nl'] and not translations['pt']:
         print(f"⏭️  {slug}: No translations found, skipping")
         return False
 
-    # Read file
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
+    page = index.page(filepath)
     # Check if hreflang already exists
-    if 'hreflang' in content:
+    if page and page.alternates:
         print(f"✓  {slug}: Already has hreflang tags")
         return False
 
     # Find canonical tag and add hreflang after it
     canonical_pattern = r'(<link rel="canonical"[^>]+>)'
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
     match = re.search(canonical_pattern, content)
 
     if not match:
@@ -83,6 +83,7 @@ def add_hreflang_to_file(filepath):
     # Write back
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(new_content)
+    index.update(filepath)
 
     trans_list = []
     if translations['nl']:
@@ -105,15 +106,19 @@ def main():
     # Get all HTML files in companions directory
     html_files = sorted(Path(companions_dir).glob("*.html"))
 
+    index = HreflangIndex.load()
+
     updated = 0
     skipped = 0
 
     for filepath in html_files:
-        if add_hreflang_to_file(str(filepath)):
+        if add_hreflang_to_file(index, str(filepath)):
             updated += 1
         else:
             skipped += 1
 
+    index.save()
+
     print(f"\n{'='*50}")
     print(f"✅ Updated: {updated} pages")
     print(f"⏭️  Skipped: {skipped} pages")
@@ -4,19 +4,15 @@ Script to fix overly literal Dutch translations in meta_title and meta_descripti
 Keep English AI industry terms like "AI Companion", not "AI metgezelschap".
 """
 
-import os
-import requests
-import time
 import re
 
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Companion_Translations'
+from airtable_client import AirtableClient
+from airtable_query import Query
+from record_pipeline import run_update_job
 
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+client = AirtableClient.from_env()
+
+QUERY = Query(select=['name (from companion)', 'meta_title', 'meta_description'], languages=['nl'])
 
 # Bad literal translations to fix
 BAD_TRANSLATIONS = {
@@ -36,32 +32,6 @@ BAD_TRANSLATIONS = {
     'AI companionschap': 'AI Companion',
 }
 
-def fetch_nl_records():
-    """Fetch all NL records"""
-    print("📥 Fetching NL records from Companion_Translations...")
-    
-    records = []
-    offset = None
-    
-    while True:
-        params = {
-            'filterByFormula': "{language} = 'nl'"
-        }
-        if offset:
-            params['offset'] = offset
-        
-        response = requests.get(API_URL, headers=headers, params=params)
-        data = response.json()
-        records.extend(data.get('records', []))
-        
-        offset = data.get('offset')
-        if not offset:
-            break
-        time.sleep(0.2)
-    
-    print(f"✅ Fetched {len(records)} NL records")
-    return records
-
 def fix_literal_translations(text):
     """Replace bad literal Dutch translations with correct English terms"""
     if not text:
@@ -75,102 +45,66 @@ def fix_literal_translations(text):
     
     return fixed
 
-def update_record(record_id, fields_to_update):
-    """Update record with fixed fields"""
-    url = f'{API_URL}/{record_id}'
-    
-    data = {
-        'fields': fields_to_update
-    }
-    
-    response = requests.patch(url, headers=headers, json=data)
-    
-    if response.status_code != 200:
-        print(f"   ❌ Update failed: {response.status_code}")
-        print(response.text)
-        return False
-    
-    return True
+def fix_record(record, position):
+    """Transform stage: return the fixed meta fields, or None if nothing changed"""
+    fields = record.get('fields', {})
+
+    companion_name = QUERY.value(record, 'name (from companion)', 'Unknown')
+
+    print(f"\n[{position}] 📝 {companion_name}")
+
+    # Check meta_title and meta_description
+    meta_title = fields.get('meta_title', '')
+    meta_desc = fields.get('meta_description', '')
+
+    if not meta_title and not meta_desc:
+        print(f"   ⏭️  No meta fields")
+        return None
+
+    # Fix both fields
+    fixed_title = fix_literal_translations(meta_title)
+    fixed_desc = fix_literal_translations(meta_desc)
+
+    # Check if anything changed
+    title_changed = fixed_title != meta_title
+    desc_changed = fixed_desc != meta_desc
+
+    if not title_changed and not desc_changed:
+        print(f"   ✓ No bad translations found")
+        return None
+
+    # Show what changed
+    if title_changed:
+        print(f"   📝 meta_title:")
+        print(f"      Before: {meta_title[:80]}...")
+        print(f"      After:  {fixed_title[:80]}...")
+
+    if desc_changed:
+        print(f"   📝 meta_description:")
+        print(f"      Before: {meta_desc[:80]}...")
+        print(f"      After:  {fixed_desc[:80]}...")
+
+    # Prepare update
+    fields_to_update = {}
+    if title_changed:
+        fields_to_update['meta_title'] = fixed_title
+    if desc_changed:
+        fields_to_update['meta_description'] = fixed_desc
+
+    print(f"   💾 Queued update")
+    return fields_to_update
 
 def main():
     print("🚀 Starting meta_title/meta_description Dutch translation fix...")
     print("=" * 60)
-    
-    records = fetch_nl_records()
-    
-    print()
-    print("🔄 Processing records...")
-    print("=" * 60)
-    
-    updated = 0
-    skipped = 0
-    errors = 0
-    
-    for i, record in enumerate(records, 1):
-        record_id = record['id']
-        fields = record.get('fields', {})
-        
-        companion_name = fields.get('name (from companion)', ['Unknown'])[0]
-        
-        print(f"\n[{i}/{len(records)}] 📝 {companion_name}")
-        
-        # Check meta_title and meta_description
-        meta_title = fields.get('meta_title', '')
-        meta_desc = fields.get('meta_description', '')
-        
-        if not meta_title and not meta_desc:
-            print(f"   ⏭️  No meta fields")
-            skipped += 1
-            continue
-        
-        # Fix both fields
-        fixed_title = fix_literal_translations(meta_title)
-        fixed_desc = fix_literal_translations(meta_desc)
-        
-        # Check if anything changed
-        title_changed = fixed_title != meta_title
-        desc_changed = fixed_desc != meta_desc
-        
-        if not title_changed and not desc_changed:
-            print(f"   ✓ No bad translations found")
-            skipped += 1
-            continue
-        
-        # Show what changed
-        if title_changed:
-            print(f"   📝 meta_title:")
-            print(f"      Before: {meta_title[:80]}...")
-            print(f"      After:  {fixed_title[:80]}...")
-        
-        if desc_changed:
-            print(f"   📝 meta_description:")
-            print(f"      Before: {meta_desc[:80]}...")
-            print(f"      After:  {fixed_desc[:80]}...")
-        
-        # Prepare update
-        fields_to_update = {}
-        if title_changed:
-            fields_to_update['meta_title'] = fixed_title
-        if desc_changed:
-            fields_to_update['meta_description'] = fixed_desc
-        
-        # Update
-        if update_record(record_id, fields_to_update):
-            print(f"   💾 Updated in Airtable")
-            updated += 1
-        else:
-            errors += 1
-        
-        time.sleep(0.3)
-    
+    print("📥 Streaming NL records from Companion_Translations...")
+
+    # Records are fixed while the next page downloads, and updates are
+    # written in batches of 10 as they come
+    result = run_update_job(client, QUERY, fix_record)
+
     print()
-    print("=" * 60)
-    print("✅ Fix completed!")
-    print(f"   Updated:  {updated} records")
-    print(f"   Skipped:  {skipped} records")
-    print(f"   Errors:   {errors} records")
-    print(f"   Total:    {len(records)} records")
-    print("=" * 60)
+    result.report()
 
 if __name__ == '__main__':
     main()
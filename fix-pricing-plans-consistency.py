@@ -4,19 +4,21 @@ Script to fix inconsistent Dutch translations in pricing_plans.
 Makes them consistent: keep English AI/tech terms, translate only connecting words.
 """
 
-import os
 import json
-import requests
-import time
 
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Companion_Translations'
+from airtable_client import AirtableClient
+from airtable_query import Query, SCHEMA
+from glossary import Glossary
+from record_pipeline import run_update_job
 
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+client = AirtableClient.from_env()
+
+# NL records with pricing_plans
+QUERY = Query(
+    select=['name (from companion)', 'pricing_plans'],
+    languages=['nl'],
+    where=[SCHEMA['pricing_plans'].is_not_empty()]
+)
 
 # Translation map for consistency
 TRANSLATION_MAP = {
@@ -45,31 +47,8 @@ TRANSLATION_MAP = {
     'Community functies': 'Community features',
 }
 
-def fetch_nl_records_with_pricing():
-    """Fetch NL records with pricing_plans"""
-    print("📥 Fetching NL records with pricing_plans...")
-    
-    records = []
-    offset = None
-    
-    while True:
-        params = {
-            'filterByFormula': "AND({language} = 'nl', {pricing_plans} != '')"
-        }
-        if offset:
-            params['offset'] = offset
-        
-        response = requests.get(API_URL, headers=headers, params=params)
-        data = response.json()
-        records.extend(data.get('records', []))
-        
-        offset = data.get('offset')
-        if not offset:
-            break
-        time.sleep(0.2)
-    
-    print(f"✅ Fetched {len(records)} NL records")
-    return records
+# Single-pass, longest-first replacement of the map above
+CONSISTENCY_GLOSSARY = Glossary(TRANSLATION_MAP, ignore_case=False, word_boundary=False)
 
 def fix_pricing_plan(pricing_json_str):
     """Fix inconsistent translations in pricing plan"""
@@ -100,12 +79,8 @@ def fix_pricing_plan(pricing_json_str):
             if 'features' in plan:
                 new_features = []
                 for feature in plan['features']:
-                    new_feature = feature
-                    
                     # Apply translation map
-                    for nl_term, en_term in TRANSLATION_MAP.items():
-                        if nl_term in new_feature:
-                            new_feature = new_feature.replace(nl_term, en_term)
+                    new_feature = CONSISTENCY_GLOSSARY.translate(feature)
                     
                     new_features.append(new_feature)
                     
@@ -123,92 +98,53 @@ def fix_pricing_plan(pricing_json_str):
         print(f"   ❌ Error parsing JSON: {e}")
         return pricing_json_str, False
 
-def update_record(record_id, pricing_plans):
-    """Update record with fixed pricing_plans"""
-    url = f'{API_URL}/{record_id}'
-    
-    data = {
-        'fields': {
-            'pricing_plans': pricing_plans
-        }
-    }
-    
-    response = requests.patch(url, headers=headers, json=data)
-    
-    if response.status_code != 200:
-        print(f"   ❌ Update failed: {response.status_code}")
-        return False
-    
-    return True
+def fix_record(record, position):
+    """Transform stage: return the fixed pricing_plans, or None if nothing changed"""
+    companion_name = QUERY.value(record, 'name (from companion)', 'Unknown')
+    pricing_raw = record.get('fields', {}).get('pricing_plans', '')
+
+    print(f"\n[{position}] 📝 {companion_name}")
+
+    if not pricing_raw:
+        print(f"   ⏭️  No pricing_plans")
+        return None
+
+    # Fix inconsistencies
+    fixed_pricing, changed = fix_pricing_plan(pricing_raw)
+
+    if not changed:
+        print(f"   ✓ Already consistent")
+        return None
+
+    print(f"   🔧 Fixed inconsistencies")
+
+    # Show preview of changes
+    try:
+        plans = json.loads(fixed_pricing)
+        if plans and len(plans) > 0:
+            first_plan = plans[0]
+            print(f"   Preview: {first_plan.get('name', 'Unknown')}")
+            if 'features' in first_plan:
+                print(f"            ✓ 'features' field (was 'functies')")
+                if len(first_plan['features']) > 0:
+                    print(f"            {first_plan['features'][0][:60]}...")
+    except:
+        pass
+
+    print(f"   💾 Queued update")
+    return {'pricing_plans': fixed_pricing}
 
 def main():
     print("🚀 Starting pricing_plans consistency fix...")
     print("=" * 60)
-    
-    records = fetch_nl_records_with_pricing()
-    
-    print()
-    print("🔄 Processing records...")
-    print("=" * 60)
-    
-    updated = 0
-    skipped = 0
-    errors = 0
-    
-    for i, record in enumerate(records, 1):
-        record_id = record['id']
-        fields = record.get('fields', {})
-        
-        companion_name = fields.get('name (from companion)', ['Unknown'])[0]
-        pricing_raw = fields.get('pricing_plans', '')
-        
-        print(f"\n[{i}/{len(records)}] 📝 {companion_name}")
-        
-        if not pricing_raw:
-            print(f"   ⏭️  No pricing_plans")
-            skipped += 1
-            continue
-        
-        # Fix inconsistencies
-        fixed_pricing, changed = fix_pricing_plan(pricing_raw)
-        
-        if not changed:
-            print(f"   ✓ Already consistent")
-            skipped += 1
-            continue
-        
-        print(f"   🔧 Fixed inconsistencies")
-        
-        # Show preview of changes
-        try:
-            plans = json.loads(fixed_pricing)
-            if plans and len(plans) > 0:
-                first_plan = plans[0]
-                print(f"   Preview: {first_plan.get('name', 'Unknown')}")
-                if 'features' in first_plan:
-                    print(f"            ✓ 'features' field (was 'functies')")
-                    if len(first_plan['features']) > 0:
-                        print(f"            {first_plan['features'][0][:60]}...")
-        except:
-            pass
-        
-        # Update
-        if update_record(record_id, fixed_pricing):
-            print(f"   💾 Updated in Airtable")
-            updated += 1
-        else:
-            errors += 1
-        
-        time.sleep(0.3)
-    
+    print("📥 Streaming NL records with pricing_plans...")
+
+    # Records are fixed while the next page downloads, and updates are
+    # written in batches of 10 as they come
+    result = run_update_job(client, QUERY, fix_record)
+
     print()
-    print("=" * 60)
-    print("✅ Fix completed!")
-    print(f"   Updated:  {updated} records")
-    print(f"   Skipped:  {skipped} records")
-    print(f"   Errors:   {errors} records")
-    print(f"   Total:    {len(records)} records")
-    print("=" * 60)
+    result.report()
 
 if __name__ == '__main__':
     main()
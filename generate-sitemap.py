@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Generate the sitemaps from the HTML tree.
+
+The URL set comes from the hreflang index (hreflang_index.py): every page
+that is its own canonical on companionguide.ai (a page without a canonical
+tag counts as its own) and isn't marked noindex or a test page, with its
+hreflang alternates as xhtml:link entries. Pages whose canonical points at a
+vendor's site are skipped and listed, so the broken tag can be fixed.
+
+sitemap-state.json keeps each page's content hash and lastmod, so a page
+only gets today's date when its content actually changed. It is committed
+with the sitemaps: without it, a fresh checkout can't tell which pages
+changed since the sitemap was last generated.
+
+Output is a sitemap index (sitemap.xml, the file robots.txt points at) plus
+one child sitemap per language (sitemap-en.xml, sitemap-nl.xml, ...). Files
+are only rewritten when their content changes.
+
+Usage:
+    python3 generate-sitemap.py
+"""
+
+import os
+import re
+import json
+from datetime import date
+from xml.sax.saxutils import escape, quoteattr
+
+from hreflang_index import HreflangIndex, SITE_URL, on_site
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = os.path.join(ROOT, 'sitemap-state.json')
+INDEX_SITEMAP = 'sitemap.xml'
+
+LANGUAGE_ORDER = ('en', 'nl', 'pt', 'de', 'es')
+
+SECTION_HUBS = {'companions', 'categories', 'news'}
+
+# Tooling pages at the site root (test-create.html, test-email.html, ...)
+TEST_PAGE = re.compile(r'test-[^/]*\.html')
+
+
+def changefreq_and_priority(page):
+    """Same weighting as the hand-maintained sitemap"""
+    if page.key == '':
+        return 'daily', '1.0'
+    if page.key in SECTION_HUBS:
+        return 'weekly', '0.9'
+
+    section = page.key.split('/', 1)[0] if '/' in page.key else None
+    if section in ('companions', 'news'):
+        return 'weekly', '0.8'
+    if section == 'categories':
+        return 'weekly', '0.7'
+    return 'weekly', '0.6'
+
+
+def load_state():
+    try:
+        with open(STATE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    tmp_path = f'{STATE_PATH}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, STATE_PATH)
+
+
+def previous_lastmods():
+    """loc -> lastmod from the sitemaps on disk, to seed pages the state doesn't know yet"""
+    lastmods = {}
+    for name in os.listdir(ROOT):
+        if not (name.startswith('sitemap') and name.endswith('.xml')):
+            continue
+        with open(os.path.join(ROOT, name), encoding='utf-8') as f:
+            content = f.read()
+        for loc, lastmod in re.findall(r'<url>\s*<loc>([^<]+)</loc>\s*<lastmod>([^<]+)</lastmod>', content):
+            lastmods[loc] = lastmod
+    return lastmods
+
+
+def update_lastmods(pages, state, today):
+    """Give every page a lastmod, moving it to today only when its hash changed"""
+    seeds = None
+    changed = 0
+    for page in pages:
+        entry = state.get(page.path)
+        if entry and entry['sha256'] == page.sha256:
+            continue
+
+        if entry is None:
+            if seeds is None:
+                seeds = previous_lastmods()
+            lastmod = seeds.get(page.canonical_url, today)
+        else:
+            lastmod = today
+            changed += 1
+        state[page.path] = {'sha256': page.sha256, 'lastmod': lastmod}
+
+    live = {page.path for page in pages}
+    for path in set(state) - live:
+        del state[path]
+    return changed
+
+
+def url_entry(page, index, lastmod):
+    changefreq, priority = changefreq_and_priority(page)
+    lines = [
+        '  <url>',
+        f'    <loc>{escape(page.canonical_url)}</loc>',
+        f'    <lastmod>{lastmod}</lastmod>',
+        f'    <changefreq>{changefreq}</changefreq>',
+        f'    <priority>{priority}</priority>',
+    ]
+    for lang, url in page.alternates:
+        target = index.resolve(url)
+        if target is None or not index.is_indexable(target):
+            continue
+        lines.append(f'    <xhtml:link rel="alternate" hreflang={quoteattr(lang)} href={quoteattr(target.canonical_url)} />')
+    lines.append('  </url>')
+    return '\n'.join(lines)
+
+
+def urlset(entries):
+    return '\n'.join([
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"',
+        '        xmlns:xhtml="http://www.w3.org/1999/xhtml">',
+        '',
+        '\n\n'.join(entries),
+        '',
+        '</urlset>',
+        '',
+    ])
+
+
+def sitemap_index(children):
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for name, lastmod in children:
+        lines += [
+            '  <sitemap>',
+            f'    <loc>{SITE_URL}/{name}</loc>',
+            f'    <lastmod>{lastmod}</lastmod>',
+            '  </sitemap>',
+        ]
+    lines += ['</sitemapindex>', '']
+    return '\n'.join(lines)
+
+
+def write_if_changed(name, content):
+    path = os.path.join(ROOT, name)
+    try:
+        with open(path, encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+
+def main():
+    print("🗺️  Generating sitemaps\n")
+
+    index = HreflangIndex.load(ROOT)
+    index.save()
+
+    pages = sorted((page for page in index.pages.values()
+                    if index.is_indexable(page) and not TEST_PAGE.fullmatch(page.path)),
+                   key=lambda page: page.url)
+    state = load_state()
+    changed = update_lastmods(pages, state, date.today().isoformat())
+    save_state(state)
+
+    languages = sorted({page.lang for page in pages},
+                       key=lambda lang: (LANGUAGE_ORDER + (lang,)).index(lang))
+
+    children = []
+    written = []
+    for lang in languages:
+        lang_pages = [page for page in pages if page.lang == lang]
+        name = f'sitemap-{lang}.xml'
+        entries = [url_entry(page, index, state[page.path]['lastmod']) for page in lang_pages]
+        if write_if_changed(name, urlset(entries)):
+            written.append(name)
+        children.append((name, max(state[page.path]['lastmod'] for page in lang_pages)))
+        print(f"   {lang.upper()}: {len(lang_pages)} URLs")
+
+    if write_if_changed(INDEX_SITEMAP, sitemap_index(children)):
+        written.append(INDEX_SITEMAP)
+
+    # Languages that no longer have any pages
+    current = {name for name, _ in children}
+    for name in os.listdir(ROOT):
+        if re.fullmatch(r'sitemap-[a-z-]+\.xml', name) and name not in current:
+            os.remove(os.path.join(ROOT, name))
+            written.append(f"{name} (removed)")
+
+    offsite = sorted((page for page in index.pages.values()
+                      if not page.noindex and not on_site(page.canonical_url)),
+                     key=lambda page: page.path)
+    if offsite:
+        print(f"\n⚠️  Skipped {len(offsite)} pages whose canonical points off the site:")
+        for page in offsite:
+            print(f"   {page.path} → {page.canonical}")
+
+    print(f"\n{'='*50}")
+    print(f"✅ {len(pages)} URLs in {len(children)} sitemaps ({changed} pages changed since last run)")
+    print(f"📝 Rewritten: {', '.join(written) if written else 'nothing'}")
+    print(f"⏭️  Skipped {len(index.pages) - len(pages)} pages (noindex, test pages or canonical elsewhere)")
+    print(f"{'='*50}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Compiled glossary replacement for the pricing/feature translation scripts.
+
+All preserve terms and all translation terms are compiled once into a single
+alternation regex, longest term first, so a text is translated in one scan:
+at every position the longest known term wins, preserved terms are copied
+through untouched, and everything else is looked up in a dict. Replacements
+are never re-scanned, so a translated word can't be translated twice.
+
+Usage:
+    from glossary import Glossary
+
+    nl = Glossary(NL_TRANSLATIONS, preserve=PRESERVE_TERMS)
+    nl.translate("Unlimited AI Chat messages")   # -> "Onbeperkt AI Chat berichten"
+"""
+
+import re
+
+
+def match_case(original, translated):
+    """Give `translated` the casing style of the matched `original`"""
+    if len(original) > 1 and original.isupper():
+        return translated.upper()
+    if original[:1].isupper():
+        return translated[:1].upper() + translated[1:]
+    return translated.lower()
+
+
+class Glossary:
+    """
+    One compiled term list.
+
+    translations:  dict or list of (source, target) pairs
+    preserve:      terms copied through unchanged (they win over translations)
+    ignore_case:   match terms case-insensitively and carry the matched casing
+                   over to the replacement, unless an exact-case entry exists
+    word_boundary: only match whole words
+    """
+
+    def __init__(self, translations, preserve=(), ignore_case=True, word_boundary=True):
+        pairs = translations.items() if isinstance(translations, dict) else translations
+        self.ignore_case = ignore_case
+
+        self.exact = {}
+        for source, target in pairs:
+            self.exact.setdefault(source, target)
+
+        fold = str.lower if ignore_case else (lambda term: term)
+        self.folded = {}
+        for source, target in self.exact.items():
+            self.folded.setdefault(fold(source), target)
+        self.preserved = {fold(term) for term in preserve}
+        self.fold = fold
+
+        terms = sorted(set(self.exact) | set(preserve), key=len, reverse=True)
+        self.pattern = re.compile(
+            '|'.join(self._term_pattern(term, word_boundary) for term in terms) or r'(?!)',
+            re.IGNORECASE if ignore_case else 0
+        )
+
+    @staticmethod
+    def _term_pattern(term, word_boundary):
+        escaped = re.escape(term)
+        if not word_boundary:
+            return escaped
+        start = r'\b' if re.match(r'\w', term) else ''
+        end = r'\b' if re.search(r'\w$', term) else ''
+        return start + escaped + end
+
+    def _replace(self, match):
+        original = match.group()
+        key = self.fold(original)
+
+        if key in self.preserved:
+            return original
+        if original in self.exact:
+            return self.exact[original]
+        if key in self.folded:
+            translated = self.folded[key]
+            return match_case(original, translated) if self.ignore_case else translated
+        return original
+
+    def translate(self, text):
+        """Translate a string in a single pass; non-strings are returned as-is"""
+        if not text or not isinstance(text, str):
+            return text
+        return self.pattern.sub(self._replace, text)
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Persistent hreflang link graph for the static site.
+
+Every page's canonical, hreflang alternates, robots noindex flag and content
+hash are parsed once and stored in .hreflang-index.json together with the
+file's mtime and size. Loading the index only re-parses pages that changed
+since the last run, and scripts that rewrite a page call update(path) to
+refresh just that entry.
+
+Pages are keyed by the URL they are served at (companions/replika.html ->
+https://companionguide.ai/companions/replika), so every question about the
+graph is a dict lookup instead of an os.path.exists() or a re-read:
+
+- self-reference: a page's alternates must list itself under its own language
+- reciprocity:    if A lists B, B must list A
+- missing variant: every translation on disk must be listed as an alternate
+- canonical:      alternates must point at the target's canonical URL
+
+Usage:
+    from hreflang_index import HreflangIndex
+
+    index = HreflangIndex.load()
+    for issue in index.issues():
+        print(issue)
+    index.save()
+"""
+
+import os
+import re
+import json
+import hashlib
+
+from html_pipeline import site_html_files, relative_path, SITE_LANGUAGES
+
+SITE_URL = 'https://companionguide.ai'
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.hreflang-index.json')
+# Bump when parse_page() changes, so stale entries are re-parsed
+INDEX_VERSION = 2
+
+CANONICAL = re.compile(r'<link rel="canonical" href="([^"]+)">')
+HREFLANG = re.compile(r'<link rel="alternate" hreflang="([^"]+)" href="([^"]+)">')
+NOINDEX = re.compile(r'<meta name="robots" content="[^"]*noindex', re.IGNORECASE)
+
+
+def normalize_url(url):
+    """Comparable form of a URL: no trailing slash, no .html, lowercase host"""
+    url = url.strip()
+    if url.endswith('.html'):
+        url = url[:-len('.html')]
+    scheme, sep, rest = url.partition('://')
+    host, slash, path = rest.partition('/')
+    return f'{scheme.lower()}{sep}{host.lower()}{slash}{path}'.rstrip('/')
+
+
+def on_site(url):
+    """The URL is on companionguide.ai (not a vendor's site)"""
+    url = normalize_url(url)
+    return url == SITE_URL or url.startswith(f'{SITE_URL}/')
+
+
+def page_language(rel_path):
+    first = rel_path.split('/', 1)[0]
+    return first if first in SITE_LANGUAGES else 'en'
+
+
+def variant_key(rel_path):
+    """Path shared by all translations of a page: nl/companions/x.html -> companions/x"""
+    lang = page_language(rel_path)
+    if lang != 'en':
+        rel_path = rel_path[len(lang) + 1:]
+    stem = rel_path[:-len('.html')] if rel_path.endswith('.html') else rel_path
+    if stem == 'index' or stem.endswith('/index'):
+        stem = stem[:-len('index')].rstrip('/')
+    return stem
+
+
+def page_url(rel_path):
+    """URL a page is served at"""
+    lang = page_language(rel_path)
+    key = variant_key(rel_path)
+    parts = [part for part in (lang if lang != 'en' else '', key) if part]
+    return normalize_url(f"{SITE_URL}/{'/'.join(parts)}")
+
+
+def parse_page(raw):
+    content = raw.decode('utf-8')
+    canonical = CANONICAL.search(content)
+    return {
+        'canonical': canonical.group(1) if canonical else None,
+        'alternates': HREFLANG.findall(content),
+        'noindex': bool(NOINDEX.search(content)),
+        'sha256': hashlib.sha256(raw).hexdigest(),
+    }
+
+
+class Page:
+    """One HTML file's node in the graph"""
+
+    def __init__(self, path, entry):
+        self.path = path
+        self.lang = page_language(path)
+        self.key = variant_key(path)
+        self.url = page_url(path)
+        self.canonical = entry['canonical']
+        # A page without a canonical tag is its own canonical
+        self.canonical_url = self.canonical or self.url
+        self.alternates = [tuple(pair) for pair in entry['alternates']]
+        self.noindex = entry['noindex']
+        self.sha256 = entry['sha256']
+        # Later duplicates of a language win, as they would for a crawler
+        self.by_lang = {lang: normalize_url(url) for lang, url in self.alternates}
+
+
+class Issue:
+    def __init__(self, kind, path, detail):
+        self.kind = kind
+        self.path = path
+        self.detail = detail
+
+    def __str__(self):
+        return f"{self.kind}: {self.path}: {self.detail}"
+
+
+class HreflangIndex:
+    """Canonical/alternate graph of every page, kept up to date incrementally"""
+
+    def __init__(self, root='.', path=INDEX_PATH):
+        self.root = root
+        self.path = path
+        self.entries = {}
+        self.pages = {}
+        self.by_url = {}
+        self.variants = {}
+        # Every path behind a URL / a (key, language) slot; the first in path order wins
+        self.url_paths = {}
+        self.variant_paths = {}
+        self.parsed = 0
+
+    @classmethod
+    def load(cls, root='.', path=INDEX_PATH, refresh=True):
+        index = cls(root, path)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                index.entries = data.get('pages', {})
+        except (OSError, ValueError):
+            index.entries = {}
+        if refresh:
+            index.refresh()
+        else:
+            index._rebuild_graph()
+        return index
+
+    def save(self):
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'pages': self.entries}, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def _stat(self, rel_path):
+        stat = os.stat(os.path.join(self.root, rel_path))
+        return stat.st_mtime_ns, stat.st_size
+
+    def _parse(self, rel_path, signature):
+        with open(os.path.join(self.root, rel_path), 'rb') as f:
+            entry = parse_page(f.read())
+        entry['mtime_ns'], entry['size'] = signature
+        self.entries[rel_path] = entry
+        self.parsed += 1
+
+    def refresh(self):
+        """Re-parse pages whose mtime or size changed; drop pages that are gone"""
+        seen = set()
+        for file_path in site_html_files(self.root):
+            rel_path = relative_path(os.path.relpath(file_path, self.root))
+            seen.add(rel_path)
+            try:
+                signature = self._stat(rel_path)
+            except OSError:
+                continue
+            entry = self.entries.get(rel_path)
+            if entry and (entry.get('mtime_ns'), entry.get('size')) == signature:
+                continue
+            try:
+                self._parse(rel_path, signature)
+            except (OSError, UnicodeDecodeError):
+                self.entries.pop(rel_path, None)
+
+        for rel_path in set(self.entries) - seen:
+            del self.entries[rel_path]
+        self._rebuild_graph()
+
+    def update(self, file_path):
+        """Refresh a single page after it was rewritten (or removed); only its own entries change"""
+        rel_path = relative_path(os.path.relpath(file_path, self.root))
+        self._remove_page(rel_path)
+        try:
+            self._parse(rel_path, self._stat(rel_path))
+        except (OSError, UnicodeDecodeError):
+            self.entries.pop(rel_path, None)
+            return
+        self._add_page(Page(rel_path, self.entries[rel_path]))
+
+    def _rebuild_graph(self):
+        self.pages = {}
+        self.by_url = {}
+        self.variants = {}
+        self.url_paths = {}
+        self.variant_paths = {}
+        for rel_path, entry in self.entries.items():
+            self._add_page(Page(rel_path, entry))
+
+    def _add_page(self, page):
+        self.pages[page.path] = page
+        self.url_paths.setdefault(page.url, set()).add(page.path)
+        self.variant_paths.setdefault((page.key, page.lang), set()).add(page.path)
+        self._relink(page)
+
+    def _remove_page(self, rel_path):
+        page = self.pages.pop(rel_path, None)
+        if page is None:
+            return
+        self.url_paths[page.url].discard(rel_path)
+        self.variant_paths[(page.key, page.lang)].discard(rel_path)
+        self._relink(page)
+
+    def _relink(self, page):
+        """Point by_url and variants for `page`'s URL and slot at the first path still there"""
+        paths = self.url_paths.get(page.url)
+        if paths:
+            self.by_url[page.url] = self.pages[min(paths)]
+        else:
+            self.url_paths.pop(page.url, None)
+            self.by_url.pop(page.url, None)
+
+        slot = (page.key, page.lang)
+        paths = self.variant_paths.get(slot)
+        if paths:
+            self.variants.setdefault(page.key, {})[page.lang] = self.pages[min(paths)]
+        else:
+            self.variant_paths.pop(slot, None)
+            langs = self.variants.get(page.key, {})
+            langs.pop(page.lang, None)
+            if not langs:
+                self.variants.pop(page.key, None)
+
+    # Lookups
+
+    def page(self, file_path):
+        return self.pages.get(relative_path(os.path.relpath(file_path, self.root)))
+
+    def resolve(self, url):
+        """The page served at `url`, or None"""
+        return self.by_url.get(normalize_url(url))
+
+    def is_indexable(self, page):
+        """Page belongs in the sitemap: indexable and its own canonical (or without one)"""
+        return not page.noindex and normalize_url(page.canonical_url) == page.url
+
+    def translations(self, file_path):
+        """{language: Page} for every variant of a page that exists on disk"""
+        page = self.page(file_path)
+        return dict(self.variants.get(page.key, {})) if page else {}
+
+    # Checks
+
+    def page_issues(self, page):
+        issues = []
+        if not page.alternates:
+            # Pages without hreflang only matter if translations exist
+            others = sorted(lang for lang in self.variants.get(page.key, {}) if lang != page.lang)
+            if others:
+                issues.append(Issue('missing-variant', page.path,
+                                    f"no hreflang tags, but {', '.join(others)} versions exist"))
+            return issues
+
+        if not page.canonical:
+            issues.append(Issue('no-canonical', page.path, "has hreflang tags but no canonical"))
+
+        own = page.by_lang.get(page.lang)
+        if own is None:
+            issues.append(Issue('self-reference', page.path, f"no hreflang=\"{page.lang}\" for itself"))
+        elif own != page.url:
+            issues.append(Issue('self-reference', page.path,
+                                f"hreflang=\"{page.lang}\" points to {own}, not {page.url}"))
+
+        for lang, url in page.alternates:
+            if lang == 'x-default':
+                continue
+
+            target = self.resolve(url)
+            if target is None:
+                issues.append(Issue('broken-alternate', page.path, f"{lang}: {url} is not a page on the site"))
+                continue
+            if target is page:
+                continue
+
+            if target.lang != lang:
+                issues.append(Issue('wrong-language', page.path, f"{lang}: {url} is a {target.lang} page"))
+            if target.canonical and normalize_url(target.canonical) != normalize_url(url):
+                issues.append(Issue('non-canonical', page.path,
+                                    f"{lang}: {url} has canonical {target.canonical}"))
+            if target.alternates and page.url not in target.by_lang.values():
+                issues.append(Issue('non-reciprocal', page.path,
+                                    f"{lang}: {target.path} doesn't link back"))
+
+        for lang, variant in sorted(self.variants.get(page.key, {}).items()):
+            if lang not in page.by_lang:
+                issues.append(Issue('missing-variant', page.path, f"{lang}: {variant.path} not listed"))
+
+        return issues
+
+    def issues(self):
+        """Every hreflang problem on the site, in path order"""
+        return [issue for rel_path in sorted(self.pages) for issue in self.page_issues(self.pages[rel_path])]
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Single-pass rewrite pipeline for the static HTML tree.
+
+Each fixer is registered as a transform: a function that takes the page text
+and its path and returns the new text, appending a short note to `notes` for
+every change it makes. The pipeline reads each file once, runs every
+registered transform that applies to it in registration order, and writes
+the file back only when the resulting bytes differ from what was on disk.
+
+With workers > 1 the files are spread over a process pool. Results still come
+back in input order, so a sweep prints the same report however many cores
+it runs on. State the transforms share (such as the hreflang index) is
+loaded once by the parent and handed to every worker through `setup`.
+
+Usage:
+    from html_pipeline import RewritePipeline, site_html_files
+
+    pipeline = RewritePipeline()
+    pipeline.register(fix_links)
+    pipeline.register(standardize_logo, applies=in_dirs('', 'companions'))
+    for result in pipeline.run(site_html_files(), workers=DEFAULT_WORKERS):
+        print(result.path, result.notes)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Same exclusions the tree-wide fixers always used (substring match on the path)
+SKIP_PARTS = ('node_modules', '.git', 'debug', 'backup')
+
+SITE_LANGUAGES = ('nl', 'pt', 'de', 'es')
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+# Files handed to a worker at a time; pages are small, so batching them
+# keeps the pickling overhead below the actual regex work
+CHUNK_SIZE = 16
+
+
+def site_html_files(root='.', skip=SKIP_PARTS):
+    """Every HTML page under `root`, sorted, minus backups and tooling dirs"""
+    paths = []
+    for path in Path(root).rglob('*.html'):
+        if any(part in str(path) for part in skip):
+            continue
+        paths.append(path)
+    return sorted(paths)
+
+
+def relative_path(path):
+    return Path(os.path.relpath(path)).as_posix()
+
+
+# Predicates are classes rather than lambdas so pipelines can be pickled
+# into worker processes
+
+class in_dirs:
+    """Predicate: the page sits directly in one of `dirs` ('' is the site root)"""
+
+    def __init__(self, *dirs):
+        self.dirs = set(dirs)
+
+    def __call__(self, path):
+        return os.path.dirname(relative_path(path)) in self.dirs
+
+
+class only_files:
+    """Predicate: the page is one of `files` (paths relative to the site root)"""
+
+    def __init__(self, *files):
+        self.files = set(files)
+
+    def __call__(self, path):
+        return relative_path(path) in self.files
+
+
+def everywhere(path):
+    return True
+
+
+class Transform:
+    """One registered fixer"""
+
+    def __init__(self, func, name=None, applies=None):
+        self.func = func
+        self.name = name or func.__name__
+        self.applies = applies or everywhere
+
+    def __call__(self, content, path, notes):
+        return self.func(content, path, notes)
+
+
+class FileResult:
+    """What the pipeline did to one file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.changed = False
+        self.notes = {}
+        self.error = None
+
+    def summary(self):
+        return ', '.join(
+            f"{name} ({'; '.join(notes)})" if notes else name
+            for name, notes in self.notes.items()
+        )
+
+
+class RewritePipeline:
+    """Ordered set of transforms applied to each file in one read/write"""
+
+    def __init__(self, transforms=(), dry_run=False, setup=None):
+        self.transforms = []
+        self.dry_run = dry_run
+        # Picklable callable run once in every process before it rewrites files
+        self.setup = setup
+        for transform in transforms:
+            self.add(transform)
+
+    def add(self, transform):
+        if any(existing.name == transform.name for existing in self.transforms):
+            raise ValueError(f"transform '{transform.name}' is already registered")
+        self.transforms.append(transform)
+        return transform
+
+    def register(self, func, name=None, applies=None):
+        return self.add(Transform(func, name, applies))
+
+    def rewrite_file(self, path):
+        """Run every applicable transform over one file and write it if it changed"""
+        result = FileResult(path)
+        transforms = [transform for transform in self.transforms if transform.applies(path)]
+        if not transforms:
+            return result
+
+        try:
+            with open(path, 'rb') as f:
+                original = f.read()
+            content = original.decode('utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            result.error = str(e)
+            return result
+
+        for transform in transforms:
+            notes = []
+            try:
+                new_content = transform(content, path, notes)
+            except Exception as e:
+                result.error = f"{transform.name}: {e}"
+                continue
+            if new_content != content:
+                result.notes[transform.name] = notes
+                content = new_content
+
+        output = content.encode('utf-8')
+        if output == original:
+            result.notes = {}
+            return result
+
+        if not self.dry_run:
+            tmp_path = f'{path}.tmp'
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(output)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                result.error = str(e)
+                return result
+        result.changed = True
+        return result
+
+    def run(self, paths, workers=1):
+        """
+        Rewrite every path, yielding a FileResult per file in input order.
+
+        With workers > 1 the files are processed in a process pool; each
+        worker gets its own copy of the pipeline once, not per file.
+        """
+        paths = list(paths)
+        workers = min(workers, len(paths))
+        if workers <= 1:
+            if self.setup:
+                self.setup()
+            for path in paths:
+                yield self.rewrite_file(path)
+            return
+
+        chunksize = max(1, min(CHUNK_SIZE, len(paths) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                                 initargs=(self,)) as executor:
+            yield from executor.map(_rewrite_in_worker, paths, chunksize=chunksize)
+
+
+_worker_pipeline = None
+
+
+def _start_worker(pipeline):
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+    if pipeline.setup:
+        pipeline.setup()
+
+
+def _rewrite_in_worker(path):
+    return _worker_pipeline.rewrite_file(path)
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+The site-wide HTML fixers, as transforms for html_pipeline.RewritePipeline.
+
+Every transform has the signature transform(content, path, notes) -> content
+and appends a short note to `notes` for each change it makes. TRANSFORMS
+lists them in the order a full maintenance sweep applies them; the old
+single-purpose scripts (standardize-logo.py, fix-404-links.py, ...) now run a
+pipeline with just their own transform.
+"""
+
+import re
+
+from html_pipeline import Transform, in_dirs, only_files, everywhere
+from hreflang_index import HreflangIndex, CANONICAL, HREFLANG, SITE_URL
+
+
+# Logo / branding
+
+LOGO_DIRS = in_dirs(
+    '', 'companions', 'pt/companions', 'nl/companions',
+    'categories', 'pt/categories', 'nl/categories',
+    'news', 'pt/news', 'nl/news',
+)
+
+DESKTOP_LOGO = re.compile(
+    r'(<h1><a href="/"><img src="/images/logo\.svg" alt=")[^"]*(" width="32" height="32">)[^<]*(</a></h1>)'
+)
+MOBILE_LOGO_IMG = re.compile(
+    r'(<div class="mobile-menu-logo">\s*<img src="/images/logo\.svg" alt=")[^"]*(" width="48" height="48">)',
+    re.DOTALL
+)
+MOBILE_LOGO_TEXT = re.compile(r'(<div class="mobile-menu-logo">.*?<span>)[^<]*(</span>)', re.DOTALL)
+DESKTOP_LOGO_ALT = re.compile(
+    r'(<h1><a href="/"><img src="/images/logo\.svg" alt=")[^"]*( - AI companion reviews[^"]*" width="32" height="32">)[^<]*(</a></h1>)'
+)
+
+
+def standardize_logo(content, path, notes):
+    """Desktop and mobile logo text/alt -> "CompanionGuide.ai" """
+    new_content = DESKTOP_LOGO.sub(r'\1CompanionGuide.ai\2CompanionGuide.ai\3', content)
+    if new_content != content:
+        notes.append("desktop logo")
+        content = new_content
+
+    new_content = MOBILE_LOGO_IMG.sub(r'\1CompanionGuide.ai\2', content)
+    if new_content != content:
+        notes.append("mobile logo image alt")
+        content = new_content
+
+    new_content = MOBILE_LOGO_TEXT.sub(r'\1CompanionGuide.ai\2', content)
+    if new_content != content:
+        notes.append("mobile logo text")
+        content = new_content
+
+    new_content = DESKTOP_LOGO_ALT.sub(
+        r'\1CompanionGuide.ai - AI companion reviews and guides logo\2CompanionGuide.ai\3', content
+    )
+    if new_content != content and "desktop logo" not in notes:
+        notes.append("desktop logo (alt format)")
+        content = new_content
+
+    return content
+
+
+# Broken internal links
+
+URL_FIXES = {
+    '/companions/replika-ai': '/companions/replika',
+    '/nl/companions/replika-ai': '/nl/companions/replika',
+    '/pt/companions/replika-ai': '/pt/companions/replika',
+    '/companions/fantasygf': '/companions/fantasygf-ai',
+    '/companions/girlfriendgpt': '/companions/girlfriend-gpt',
+    '/categories/ai-boyfriend': '/categories/ai-boyfriend-companions',
+    '/categories/wellness-mental-health-companions': '/categories/wellness-companions',
+}
+
+
+def fix_404_links(content, path, notes):
+    """Point known-broken internal hrefs at the pages that exist"""
+    for broken, correct in URL_FIXES.items():
+        for prefix in ('', SITE_URL):
+            old = f'href="{prefix}{broken}"'
+            if old in content:
+                content = content.replace(old, f'href="{prefix}{correct}"')
+                notes.append(f"{prefix}{broken}")
+    return content
+
+
+# Hreflang -> canonical
+
+_site_index = None
+
+
+def site_index():
+    """The hreflang index: the one handed over by with_site_index, else loaded once per process"""
+    global _site_index
+    if _site_index is None:
+        _site_index = HreflangIndex.load()
+    return _site_index
+
+
+class with_site_index:
+    """
+    Pipeline setup: use `index`, loaded once by the parent, in every worker
+    instead of having each process load and refresh the whole index itself
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+    def __call__(self):
+        global _site_index
+        _site_index = self.index
+
+
+def fix_hreflang_canonical(content, path, notes):
+    """Make every hreflang alternate point at the target page's own canonical"""
+    if not CANONICAL.search(content):
+        return content
+
+    index = site_index()
+    for lang, url in HREFLANG.findall(content):
+        if lang == 'x-default':
+            continue
+
+        target = index.resolve(url)
+        if target is None:
+            continue
+
+        # Some pages carry the vendor's URL as canonical; never copy that across
+        target_canonical = target.canonical
+        if target_canonical and target_canonical.startswith(SITE_URL) and url != target_canonical:
+            old_tag = f'<link rel="alternate" hreflang="{lang}" href="{url}">'
+            if old_tag in content:
+                content = content.replace(
+                    old_tag, f'<link rel="alternate" hreflang="{lang}" href="{target_canonical}">'
+                )
+                notes.append(f"{lang}: {url} → {target_canonical}")
+
+    return content
+
+
+def not_test_page(path):
+    return 'test' not in str(path)
+
+
+# NL/PT news article links (the articles aren't translated yet)
+
+NEWS_LINK_PAGES = only_files('nl/index.html', 'pt/index.html', 'nl/news.html', 'pt/news.html')
+
+NEWS_BLOCKS = [
+    re.compile(r'<article[^>]*>.*?href="/(?:nl|pt)/news/[^"]*".*?</article>', re.DOTALL),
+    re.compile(r'<li[^>]*>.*?href="/(?:nl|pt)/news/[^"]*".*?</li>', re.DOTALL),
+    re.compile(r'<div class="news-card[^"]*"[^>]*>.*?href="/(?:nl|pt)/news/[^"]*".*?</div>', re.DOTALL),
+]
+# Only article links: the /nl/news and /pt/news overview pages don't match
+NEWS_LINK = re.compile(r'<a\s+href="/(?:nl|pt)/news/[^"]*"[^>]*>.*?</a>', re.DOTALL)
+
+
+def remove_nl_pt_news_links(content, path, notes):
+    """Drop cards, list items and links pointing at NL/PT news articles"""
+    for pattern in NEWS_BLOCKS + [NEWS_LINK]:
+        content, count = pattern.subn('', content)
+        if count:
+            notes.append(f"{count} removed")
+    return content
+
+
+# Hardcoded features duplicated after the dynamic-features container
+
+COMPANION_DIRS = in_dirs('companions', 'pt/companions', 'nl/companions')
+
+DUPLICATE_FEATURES = re.compile(
+    r'(<div class="intro-highlights" id="dynamic-features">.*?</div>)\s*((?:<div class="highlight-item">.*?</div>\s*)+)</div>',
+    re.DOTALL
+)
+
+
+def fix_duplicate_features(content, path, notes):
+    """Remove hardcoded highlight items that follow the dynamic-features container"""
+    if 'id="dynamic-features"' not in content or 'class="highlight-item"' not in content:
+        return content
+    return DUPLICATE_FEATURES.sub(r'\1\n        </section>', content)
+
+
+# Soulkyn "spiritual" positioning -> NSFW/adult positioning
+
+SOULKYN_PAGES = only_files(
+    'news/soulkyn-ai-alternatives-complete-guide-2025.html',
+    'news/best-ai-girlfriend-companions-2025.html',
+    'companions/soulkyn-ai.html',
+    'news/replika-ai-alternatives-complete-guide-2025.html',
+)
+
+SPIRITUAL_REPLACEMENTS = [
+    # Hero image alt text
+    (r'alt="Soulkyn AI alternatives showing various spiritual AI companion platforms"',
+     r'alt="Soulkyn AI alternatives showing various NSFW AI companion platforms"'),
+
+    # General spiritual references
+    (r'spiritual AI companion(ship)?s?', r'NSFW AI companions'),
+    (r'spiritual companion(ship)?s?', r'adult AI companions'),
+    (r'spiritual guide(s)?', r'AI girlfriend(s)'),
+    (r'spiritual and philosophical', r'adult and intimate'),
+    (r'spiritual topics?', r'adult content'),
+    (r'spiritual practice(s)?', r'intimate interactions'),
+    (r'spiritual growth', r'adult experiences'),
+    (r'spiritual development', r'intimate relationships'),
+    (r'spiritual wisdom', r'conversational depth'),
+    (r'spiritual depth', r'conversational quality'),
+    (r'spiritual journey', r'AI girlfriend experience'),
+    (r'spiritual path', r'platform preferences'),
+    (r'spiritual needs', r'content preferences'),
+    (r'spiritual seekers', r'adult content users'),
+    (r'spiritual conversations?', r'uncensored conversations'),
+    (r'spiritual connection(s)?', r'intimate connection(s)'),
+    (r'spiritual bond', r'emotional bond'),
+    (r'spiritual relationship', r'AI relationship'),
+    (r'spiritual intimacy', r'intimate content'),
+    (r'spiritual awakening', r'immersive experiences'),
+    (r'spiritual insights?', r'conversation insights'),
+    (r'spiritual exploration', r'content exploration'),
+    (r'spiritual archetypes', r'character types'),
+    (r'shadow work, tantra', r'adult roleplay'),
+    (r'tantric practices', r'intimate scenarios'),
+    (r'tantric topics', r'adult content'),
+    (r'tantric wisdom', r'intimate features'),
+    (r'Sacred Partnership', r'Romantic Connection'),
+    (r'sacred partnership', r'romantic partnership'),
+    (r'sacred romantic partnership', r'romantic relationship'),
+    (r'Holistic Approach', r'Advanced Features'),
+    (r'holistic approach', r'comprehensive features'),
+    (r'mind-body-spirit wellness', r'emotional and intimate wellness'),
+    (r'emotional intelligence with spiritual growth', r'emotional intelligence with intimate features'),
+    (r'edgier spiritual topics', r'unrestricted adult content'),
+    (r'mystical practices', r'fantasy roleplay'),
+    (r'meditation practitioners', r'NSFW users'),
+    (r'philosophers', r'adult content enthusiasts'),
+    (r'philosophical depth', r'conversational depth'),
+    (r'philosophical discussions', r'uncensored discussions'),
+    (r'Philosophically complex', r'Complex'),
+    (r'guided meditations and spiritual practices', r'voice messages and audio features'),
+    (r'spiritual tradition', r'character personality'),
+    (r'spiritual practices or traditions', r'favorite features or scenarios'),
+    (r'spiritual history', r'conversation history'),
+    (r'spiritual characters', r'AI characters'),
+    (r'spiritual AI guidance', r'uncensored AI chat'),
+    (r"wisdom focus and teaching style", r"personality and conversation style"),
+    (r'wisdom, guidance style, and areas of focus', r'personality, conversation style, and content preferences'),
+    (r'spiritual and philosophical themes', r'adult and romantic themes'),
+    (r'unlimited spiritual conversations', r'unlimited uncensored conversations'),
+    (r'spiritual AI companionship', r'NSFW AI companionship'),
+    (r'spiritual practitioners', r'platform users'),
+]
+
+# Applied one after another, case-insensitively, like the original script
+SPIRITUAL_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), replacement) for pattern, replacement in SPIRITUAL_REPLACEMENTS
+]
+
+
+def remove_spiritual_references(content, path, notes):
+    """Replace Soulkyn's spiritual positioning with its NSFW/adult focus"""
+    for pattern, replacement in SPIRITUAL_PATTERNS:
+        content, count = pattern.subn(replacement, content)
+        if count:
+            notes.append(f"{pattern.pattern} ×{count}")
+    return content
+
+
+# Full maintenance sweep, in the order the fixes are applied
+
+TRANSFORMS = [
+    Transform(standardize_logo, 'standardize-logo', LOGO_DIRS),
+    Transform(fix_404_links, 'fix-404-links', everywhere),
+    Transform(fix_hreflang_canonical, 'fix-hreflang-canonical', not_test_page),
+    Transform(remove_nl_pt_news_links, 'remove-nl-pt-news-links', NEWS_LINK_PAGES),
+    Transform(fix_duplicate_features, 'fix-duplicate-features', COMPANION_DIRS),
+    Transform(remove_spiritual_references, 'remove-spiritual-soulkyn', SOULKYN_PAGES),
+]
+
+TRANSFORMS_BY_NAME = {transform.name: transform for transform in TRANSFORMS}
+
+
+def transforms_named(names):
+    """Look up transforms by name, keeping the sweep order"""
+    unknown = [name for name in names if name not in TRANSFORMS_BY_NAME]
+    if unknown:
+        raise KeyError(', '.join(unknown))
+    return [transform for transform in TRANSFORMS if transform.name in names]
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Durable, resumable queue for translation runs.
+
+Every (record, field, language) to translate is a job, and every chunk of
+its source text is a unit of work with its own status, stored in a local
+SQLite file (WAL mode). A run enqueues its work, drains the queue and writes
+the jobs whose chunks are all translated:
+
+- stopping a run at any point loses at most the chunks in flight; the next
+  run resumes from the checkpoint and never resends a finished chunk
+- workers claim chunks inside an IMMEDIATE transaction, so any number of
+  threads or processes can drain the same queue without duplicating work;
+  claims expire after a lease, so a crashed worker's chunks are picked up again
+- re-enqueueing a job whose source (or ruleset) is unchanged keeps its
+  progress; a changed source starts the job over
+- a chunk that keeps failing is parked as failed after MAX_ATTEMPTS instead of
+  blocking the run; `retry` puts failed jobs back
+
+Each script uses its own named queue, so chunks are only ever translated
+with the prompt they were queued for.
+
+Usage:
+    from job_queue import JobQueue
+
+    queue = JobQueue('verdicts-nl')
+    queue.enqueue(nl_record_id, 'my_verdict', 'nl', en_verdict, chunk_markdown(en_verdict, 'nl'))
+    queue.drain(engine, make_prompt)
+    for job in queue.take_ready():
+        ...write job['translation'], then queue.mark_written(job['job_id'])
+
+CLI:
+    python3 job_queue.py status [queue]
+    python3 job_queue.py retry <queue>     # put failed jobs back in the queue
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.translation-jobs.sqlite')
+
+# Seconds before a claimed chunk (or a job being written) is considered abandoned
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+
+
+def source_fingerprint(source, ruleset):
+    return hashlib.sha256(f'{ruleset}\0{source.strip()}'.encode('utf-8')).hexdigest()
+
+
+def queue_names(path=QUEUE_PATH):
+    if not os.path.exists(path):
+        return []
+    db = sqlite3.connect(path)
+    try:
+        return [row[0] for row in db.execute('SELECT DISTINCT queue FROM jobs ORDER BY queue')]
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        db.close()
+
+
+class JobQueue:
+    """SQLite-backed queue of translation chunks for one named queue"""
+
+    def __init__(self, name, path=QUEUE_PATH, lease=LEASE_SECONDS):
+        self.name = name
+        self.path = path
+        self.lease = lease
+        self.lock = threading.Lock()
+
+        # Autocommit mode: claims run in explicit IMMEDIATE transactions
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                queue TEXT NOT NULL,
+                record_id TEXT NOT NULL,
+                field TEXT NOT NULL,
+                language TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                meta TEXT,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS chunks (
+                job_id TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                queue TEXT NOT NULL,
+                source TEXT NOT NULL,
+                translation TEXT,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                claimed_by TEXT,
+                claimed_at REAL,
+                PRIMARY KEY (job_id, chunk_index)
+            )
+        ''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS chunks_by_status ON chunks (queue, status)')
+
+    def _transaction(self, work):
+        """Run work() in one IMMEDIATE transaction, holding the write lock across processes"""
+        with self.lock:
+            self.db.execute('BEGIN IMMEDIATE')
+            try:
+                result = work()
+            except BaseException:
+                self.db.execute('ROLLBACK')
+                raise
+            self.db.execute('COMMIT')
+            return result
+
+    def job_id(self, record_id, field, language):
+        return f'{self.name}/{record_id}/{field}/{language}'
+
+    def enqueue(self, record_id, field, language, source, chunks, ruleset='', meta=None):
+        """
+        Queue one field translation split into `chunks`. Returns the job's
+        status: 'pending' for new or restarted work, otherwise whatever state
+        the unchanged job was already in ('translated', 'written', ...).
+        """
+        job_id = self.job_id(record_id, field, language)
+        fingerprint = source_fingerprint(source, ruleset)
+
+        def work():
+            row = self.db.execute('SELECT fingerprint, status FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+            if row and row[0] == fingerprint:
+                return row[1]
+
+            self.db.execute('DELETE FROM chunks WHERE job_id = ?', (job_id,))
+            self.db.execute(
+                'INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (job_id, self.name, record_id, field, language, fingerprint,
+                 json.dumps(meta or {}, ensure_ascii=False), 'pending', time.time())
+            )
+            self.db.executemany(
+                'INSERT INTO chunks (job_id, chunk_index, queue, source, status) VALUES (?, ?, ?, ?, ?)',
+                [(job_id, index, self.name, chunk, 'pending') for index, chunk in enumerate(chunks)]
+            )
+            return 'pending'
+
+        return self._transaction(work)
+
+    def claim(self, worker, limit=1):
+        """Claim up to `limit` chunks for `worker`: [(job_id, chunk_index, source, field)]"""
+        now = time.time()
+
+        def work():
+            rows = self.db.execute('''
+                SELECT chunks.job_id, chunk_index, source, field FROM chunks
+                JOIN jobs ON jobs.job_id = chunks.job_id
+                WHERE chunks.queue = ? AND jobs.status != 'failed'
+                  AND (chunks.status = 'pending' OR (chunks.status = 'claimed' AND claimed_at < ?))
+                ORDER BY chunks.job_id, chunk_index LIMIT ?
+            ''', (self.name, now - self.lease, limit)).fetchall()
+            self.db.executemany(
+                "UPDATE chunks SET status = 'claimed', claimed_by = ?, claimed_at = ? "
+                "WHERE job_id = ? AND chunk_index = ?",
+                [(worker, now, job_id, index) for job_id, index, _, _ in rows]
+            )
+            return rows
+
+        return self._transaction(work)
+
+    def complete(self, job_id, chunk_index, translation):
+        """Checkpoint one translated chunk; the job becomes 'translated' with its last chunk"""
+        def work():
+            self.db.execute(
+                "UPDATE chunks SET status = 'done', translation = ? WHERE job_id = ? AND chunk_index = ?",
+                (translation, job_id, chunk_index)
+            )
+            left = self.db.execute(
+                "SELECT COUNT(*) FROM chunks WHERE job_id = ? AND status != 'done'", (job_id,)
+            ).fetchone()[0]
+            if not left:
+                self.db.execute(
+                    "UPDATE jobs SET status = 'translated', updated_at = ? WHERE job_id = ? AND status = 'pending'",
+                    (time.time(), job_id)
+                )
+
+        self._transaction(work)
+
+    def fail(self, job_id, chunk_index):
+        """Put a chunk back for another attempt, or park it (and its job) once it failed MAX_ATTEMPTS times"""
+        def work():
+            self.db.execute(
+                "UPDATE chunks SET attempts = attempts + 1, claimed_by = NULL, "
+                "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END "
+                "WHERE job_id = ? AND chunk_index = ?",
+                (MAX_ATTEMPTS, job_id, chunk_index)
+            )
+            self.db.execute(
+                "UPDATE jobs SET status = 'failed', updated_at = ? WHERE job_id = ? AND EXISTS "
+                "(SELECT 1 FROM chunks WHERE job_id = ? AND status = 'failed')",
+                (time.time(), job_id, job_id)
+            )
+
+        self._transaction(work)
+
+    def take_ready(self):
+        """
+        Claim every fully translated job for writing. Returns dicts with
+        job_id, record_id, field, language, meta and the joined translation.
+        """
+        now = time.time()
+
+        def work():
+            rows = self.db.execute('''
+                SELECT job_id, record_id, field, language, meta FROM jobs
+                WHERE queue = ? AND (status = 'translated' OR (status = 'writing' AND updated_at < ?))
+                ORDER BY job_id
+            ''', (self.name, now - self.lease)).fetchall()
+
+            jobs = []
+            for job_id, record_id, field, language, meta in rows:
+                self.db.execute("UPDATE jobs SET status = 'writing', updated_at = ? WHERE job_id = ?", (now, job_id))
+                chunks = self.db.execute(
+                    'SELECT translation FROM chunks WHERE job_id = ? ORDER BY chunk_index', (job_id,)
+                ).fetchall()
+                jobs.append({
+                    'job_id': job_id,
+                    'record_id': record_id,
+                    'field': field,
+                    'language': language,
+                    'meta': json.loads(meta or '{}'),
+                    'translation': '\n\n'.join(translation for translation, in chunks),
+                })
+            return jobs
+
+        return self._transaction(work)
+
+    def _set_status(self, job_id, status):
+        self._transaction(lambda: self.db.execute(
+            'UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?', (status, time.time(), job_id)
+        ))
+
+    def mark_written(self, job_id):
+        self._set_status(job_id, 'written')
+
+    def release(self, job_id):
+        """The write failed: keep the translation and offer the job again on the next take_ready()"""
+        self._set_status(job_id, 'translated')
+
+    def sources(self, job_id):
+        """Source text of a job's chunks, in order"""
+        return [source for source, in self.db.execute(
+            'SELECT source FROM chunks WHERE job_id = ? ORDER BY chunk_index', (job_id,)
+        )]
+
+    def reject(self, job_id):
+        """
+        A translated job failed a check before writing: queue its chunks again,
+        counting one attempt each, and park the job as failed once its chunks
+        have used MAX_ATTEMPTS. Returns the job's new status.
+        """
+        def work():
+            self.db.execute(
+                "UPDATE chunks SET attempts = attempts + 1, translation = NULL, claimed_by = NULL, "
+                "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END "
+                "WHERE job_id = ?",
+                (MAX_ATTEMPTS, job_id)
+            )
+            failed = self.db.execute(
+                "SELECT 1 FROM chunks WHERE job_id = ? AND status = 'failed'", (job_id,)
+            ).fetchone()
+            status = 'failed' if failed else 'pending'
+            self.db.execute('UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?',
+                            (status, time.time(), job_id))
+            return status
+
+        return self._transaction(work)
+
+    def retry(self, job_id=None):
+        """Send a job (or every failed job of this queue) back to be translated from scratch"""
+        def work():
+            if job_id:
+                job_ids = [job_id]
+            else:
+                job_ids = [row[0] for row in self.db.execute(
+                    "SELECT job_id FROM jobs WHERE queue = ? AND status = 'failed'", (self.name,)
+                )]
+            for retried in job_ids:
+                self.db.execute(
+                    "UPDATE chunks SET status = 'pending', attempts = 0, translation = NULL, claimed_by = NULL "
+                    "WHERE job_id = ?", (retried,)
+                )
+                self.db.execute(
+                    "UPDATE jobs SET status = 'pending', updated_at = ? WHERE job_id = ?", (time.time(), retried)
+                )
+            return len(job_ids)
+
+        return self._transaction(work)
+
+    def drain(self, engine, make_prompt, workers=None):
+        """
+        Translate every claimable chunk with `engine` (a TranslationEngine)
+        from `workers` threads (default: the engine's max_workers), checkpointing
+        each chunk as it finishes. Returns the number of chunks translated.
+        """
+        ruleset = engine.ruleset_for(make_prompt) if engine.memory else None
+        workers = workers or engine.max_workers
+        prefix = f'{socket.gethostname()}-{os.getpid()}'
+        engine.reset_stats()
+
+        def work(number):
+            worker = f'{prefix}-{number}'
+            translated_count = 0
+            while True:
+                claimed = self.claim(worker)
+                if not claimed:
+                    return translated_count
+
+                job_id, index, source, field = claimed[0]
+                translated = engine.translate_cached(source, make_prompt, ruleset, field)
+                if translated is None:
+                    self.fail(job_id, index)
+                else:
+                    self.complete(job_id, index, translated)
+                    translated_count += 1
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            total = sum(executor.map(work, range(workers)))
+
+        engine.elapsed = time.monotonic() - engine.started
+        return total
+
+    def counts(self):
+        """({job status: count}, {chunk status: count}) for this queue"""
+        jobs = dict(self.db.execute(
+            'SELECT status, COUNT(*) FROM jobs WHERE queue = ? GROUP BY status', (self.name,)
+        ).fetchall())
+        chunks = dict(self.db.execute(
+            'SELECT status, COUNT(*) FROM chunks WHERE queue = ? GROUP BY status', (self.name,)
+        ).fetchall())
+        return jobs, chunks
+
+    def failed_since(self, since):
+        """Number of jobs of this queue parked as failed at or after `since` (a time.time())"""
+        return self.db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE queue = ? AND status = 'failed' AND updated_at >= ?",
+            (self.name, since)
+        ).fetchone()[0]
+
+    def report(self):
+        jobs, chunks = self.counts()
+        print(f"🗂️  Queue {self.name}: " + ', '.join(f"{count} {status}" for status, count in sorted(jobs.items())))
+        print(f"   Chunks: " + ', '.join(f"{count} {status}" for status, count in sorted(chunks.items())))
+
+    def close(self):
+        self.db.close()
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('status', 'retry') or (sys.argv[1] == 'retry' and len(sys.argv) < 3):
+        print("Usage: python3 job_queue.py status [queue] | retry <queue>")
+        exit(1)
+
+    if sys.argv[1] == 'retry':
+        queue = JobQueue(sys.argv[2])
+        print(f"🔁 {queue.retry()} failed jobs queued again")
+        return
+
+    names = sys.argv[2:3] or queue_names()
+
+    if not names:
+        print("✅ No translation jobs queued")
+    for name in names:
+        JobQueue(name).report()
+
+
+if __name__ == '__main__':
+    main()
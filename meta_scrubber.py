@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+One compiled scrubber for the meta-text Claude sometimes wraps around a
+translation ("Here's the Dutch translation:", "[Note: ...]", "Would you
+like me to continue?").
+
+Every known pattern is compiled once, at import, into three expressions:
+
+- META_LINE: preamble and trailer lines, anchored to the start of a line so
+  a preamble is only removed where Claude puts it (around a chunk, or
+  between joined chunks), never from the middle of a sentence
+- META_TRAILER: a trailer that follows text on the same line ("...text.
+  Would you like me to continue?"), removed up to the end of that line
+- META_NOTE: bracketed notes, which are never part of real content
+
+TRAILERS is also what truncation.py uses to tell that a reply stopped early,
+so the two modules share one list of phrases.
+
+TranslationEngine runs scrub() on every chunk it receives and on everything
+served from the translation memory, so meta-text is removed inline before a
+translation can reach Airtable; no separate cleanup sweep is needed.
+
+Usage:
+    from meta_scrubber import scrub, has_meta
+
+    cleaned = scrub(translated)
+"""
+
+import re
+
+# Lines that introduce a translation; each ends at the first colon on its line
+PREAMBLES = [
+    r"here(?:'s| is) (?:the |my |your )?(?:\w+ )?translation",
+    r"hier is de (?:nederlandse )?vertaling",
+    r"aqui está a tradução",
+    r"(?:sure|certainly|of course)[,!.]? here(?:'s| is)",
+]
+
+# Phrases that trail off a translation, wherever they start on a line; each
+# runs to the end of its line
+TRAILERS = [
+    r"due to length limitations",
+    r"note: would you like",
+    r"would you like me to continue",
+    r"shall i continue",
+    r"wil je dat ik (?:verder ga|doorga)",
+    r"i can do it in parts if you prefer",
+    r"i've shown[^\n]*example",
+    r"continued translation follows",
+    r"\(?translation continues",
+]
+
+# Bracketed notes, wherever they appear
+NOTES = [r"note:", r"continue", r"would you like", r"bericht me", r"translator'?s? note"]
+
+META_LINE = re.compile(
+    r'^[ \t]*(?:'
+    + '|'.join(f'(?:{pattern})[^\\n]*?:' for pattern in PREAMBLES)
+    + '|' + '|'.join(f'(?:{pattern})[^\\n]*' for pattern in TRAILERS)
+    + r')[ \t]*(?:\n|\Z)',
+    re.IGNORECASE | re.MULTILINE
+)
+META_TRAILER = re.compile(r'[ \t]*(?:' + '|'.join(TRAILERS) + r')[^\n]*', re.IGNORECASE)
+META_NOTE = re.compile(r'[ \t]*\[(?:' + '|'.join(NOTES) + r')[^\]]*\]', re.IGNORECASE)
+BLANK_LINES = re.compile(r'\n{3,}')
+
+
+def has_meta(text):
+    return bool(text) and bool(META_LINE.search(text) or META_TRAILER.search(text) or META_NOTE.search(text))
+
+
+def scrub(text):
+    """Remove meta preambles, trailers and notes, and collapse the blank lines they leave"""
+    if not text:
+        return text
+    cleaned = META_NOTE.sub('', META_TRAILER.sub('', META_LINE.sub('', text)))
+    return BLANK_LINES.sub('\n\n', cleaned).strip()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Model routing for the translation engine: which model tier, and how much
+output budget, each field gets.
+
+Every script used to send everything to claude-3-5-sonnet with a fixed
+max_tokens, whether the source was a five-word tagline or a 9,000-character
+review. ModelRouter maps the field type and source length to a tier instead.
+Short catalog fields (taglines, best_for, feature strings) go to the fast,
+cheaper tier. Long-form reviews (my_verdict, body_text), and any field too
+long for the fast tier, keep the strong model.
+
+The router also logs every routing decision and the latency of every request
+per tier, so engine.report() shows where a bulk run spent its time.
+
+Usage:
+    from model_routing import ModelRouter
+
+    engine = TranslationEngine(anthropic, router=ModelRouter(), field='tagline', language='nl')
+"""
+
+import math
+import threading
+from collections import Counter, defaultdict, namedtuple
+
+ModelTier = namedtuple('ModelTier', 'name model max_tokens')
+
+# Ordered from cheapest to strongest
+TIERS = [
+    ModelTier('fast', 'claude-3-5-haiku-20241022', 4000),
+    ModelTier('strong', 'claude-3-5-sonnet-20241022', 8000),
+]
+
+# Tier per field type; fields not listed are routed by length alone
+FIELD_TIERS = {
+    'tagline': 'fast',
+    'best_for': 'fast',
+    'description': 'fast',
+    'features': 'fast',
+    'pricing_plans': 'fast',
+    'body_text': 'strong',
+    'my_verdict': 'strong',
+}
+
+# Sources longer than this go to the strong tier whatever their field
+FAST_MAX_CHARS = 1500
+
+
+class ModelRouter:
+    """Field type and source length -> model tier, with a decision and latency log"""
+
+    def __init__(self, tiers=TIERS, field_tiers=FIELD_TIERS, fast_max_chars=FAST_MAX_CHARS):
+        self.tiers = list(tiers)
+        self.by_name = {tier.name: tier for tier in self.tiers}
+        self.field_tiers = field_tiers
+        self.fast_max_chars = fast_max_chars
+
+        self.lock = threading.Lock()
+        self.decisions = Counter()
+        self.latencies = defaultdict(list)
+        self.output_tokens = Counter()
+
+    def choose(self, text, field=None):
+        """The tier for translating `text` of type `field`"""
+        fast, strong = self.tiers[0], self.tiers[-1]
+        if len(text) > self.fast_max_chars:
+            return strong
+        name = self.field_tiers.get(field)
+        return self.by_name[name] if name else fast
+
+    def strongest(self, tiers):
+        return max(tiers, key=self.tiers.index)
+
+    def log_decision(self, field, tier, count=1):
+        with self.lock:
+            self.decisions[(field or 'other', tier.name)] += count
+
+    def log_request(self, tier, seconds, output_tokens=0):
+        with self.lock:
+            self.latencies[tier.name].append(seconds)
+            self.output_tokens[tier.name] += output_tokens
+
+    def reset(self):
+        with self.lock:
+            self.decisions.clear()
+            self.latencies.clear()
+            self.output_tokens.clear()
+
+    def report(self):
+        if not self.decisions and not self.latencies:
+            return
+
+        print("🧭 Model routing:")
+        for (field, tier), count in sorted(self.decisions.items()):
+            print(f"   {field:15} → {tier:7} {count:5} routed")
+
+        for tier in self.tiers:
+            latencies = sorted(self.latencies.get(tier.name, []))
+            if not latencies:
+                continue
+            mean = sum(latencies) / len(latencies)
+            p95 = latencies[min(len(latencies) - 1, math.ceil(len(latencies) * 0.95) - 1)]
+            tokens_per_second = self.output_tokens[tier.name] / max(sum(latencies), 1e-9)
+            print(f"   {tier.name:7} {tier.model}: {len(latencies)} requests, "
+                  f"{mean:.2f}s mean / {p95:.2f}s p95, {tokens_per_second:,.0f} output tokens/s")
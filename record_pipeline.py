@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Streaming fetch -> transform -> write pipeline for Airtable maintenance jobs.
+
+The three stages overlap instead of running one after another:
+
+- fetch:     pages come from AirtableClient.iter_records(), which requests
+             the next page while the current one is being transformed
+- transform: runs on the calling thread, one record at a time
+- write:     changed fields go straight into a BatchWriter, which PATCHes
+             10 records per request from a small thread pool and blocks the
+             transform when too many requests are in flight
+
+Only one page, one prefetched page and a few write batches are held at any
+time, so memory stays flat however large the table is.
+
+Usage:
+    from record_pipeline import run_update_job
+
+    def fix(record, position):
+        fixed = clean(record['fields'].get('meta_title', ''))
+        return {'meta_title': fixed} if fixed != record['fields'].get('meta_title') else None
+
+    result = run_update_job(client, query, fix)
+    result.report()
+"""
+
+from airtable_client import BATCH_SIZE
+
+
+class JobResult:
+    """Counters for one streamed update job"""
+
+    def __init__(self):
+        self.seen = 0
+        self.changed = 0
+        self.failed = []
+
+    @property
+    def updated(self):
+        return self.changed - len(self.failed)
+
+    @property
+    def skipped(self):
+        return self.seen - self.changed
+
+    def report(self):
+        print("=" * 60)
+        print("✅ Fix completed!")
+        print(f"   Updated:  {self.updated} records")
+        print(f"   Skipped:  {self.skipped} records")
+        print(f"   Errors:   {len(self.failed)} records")
+        print(f"   Total:    {self.seen} records")
+        print("=" * 60)
+
+
+def run_update_job(client, query, transform, batch_size=BATCH_SIZE, max_in_flight=3, typecast=False):
+    """
+    Stream the records matching `query` (an airtable_query.Query) through
+    `transform(record, position)`, which returns the fields to update or None
+    to leave the record alone; `position` counts records from 1. Returns a
+    JobResult once every write has finished.
+    """
+    result = JobResult()
+    writer = client.batch_writer(batch_size=batch_size, max_in_flight=max_in_flight, typecast=typecast)
+
+    try:
+        for record in client.iter_records(query.formula(), query.field_names()):
+            result.seen += 1
+            changes = transform(record, result.seen)
+            if changes:
+                writer.update(record['id'], changes)
+                result.changed += 1
+    finally:
+        result.failed = writer.close()
+
+    return result
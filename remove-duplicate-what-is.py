@@ -4,56 +4,25 @@ Script to remove duplicate "Wat is [companion]?" / "O que é [companion]?"
 heading from body_text field in NL and PT records.
 """
 
-import os
-import json
-import requests
-import time
 import re
 
-# Airtable configuration
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-TRANSLATIONS_TABLE_NAME = 'Companion_Translations'
-
-if not AIRTABLE_TOKEN or not AIRTABLE_BASE_ID:
-    print("❌ Error: AIRTABLE_TOKEN_CG and AIRTABLE_BASE_ID_CG must be set")
-    exit(1)
+from airtable_client import AirtableClient, AirtableError
 
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{TRANSLATIONS_TABLE_NAME}'
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+# Airtable configuration
+client = AirtableClient.from_env()
 
 def fetch_records_by_language(language):
     """Fetch all records for a specific language"""
     print(f"📥 Fetching {language.upper()} records from Companion_Translations...")
     
-    records = []
-    offset = None
-    
     filter_formula = f"{{language}} = '{language}'"
     
-    while True:
-        params = {'filterByFormula': filter_formula}
-        if offset:
-            params['offset'] = offset
-        
-        response = requests.get(API_URL, headers=headers, params=params)
-        
-        if response.status_code != 200:
-            print(f"❌ Error fetching records: {response.status_code}")
-            print(response.text)
-            return None
-        
-        data = response.json()
-        records.extend(data.get('records', []))
-        
-        offset = data.get('offset')
-        if not offset:
-            break
-        
-        time.sleep(0.2)
+    try:
+        records = client.fetch_all_records(filter_formula=filter_formula)
+    except AirtableError as e:
+        print(f"❌ Error fetching records: {e.status_code}")
+        print(e.text)
+        return None
     
     print(f"✅ Fetched {len(records)} {language.upper()} records")
     return records
@@ -82,25 +51,6 @@ def remove_first_heading(text, language, companion_name):
     # Return cleaned text, or original if nothing changed
     return cleaned if cleaned != text else text
 
-def update_record(record_id, body_text):
-    """Update a record with cleaned body_text"""
-    url = f'{API_URL}/{record_id}'
-
-    data = {
-        'fields': {
-            'body_text': body_text
-        }
-    }
-
-    response = requests.patch(url, headers=headers, json=data)
-
-    if response.status_code != 200:
-        print(f"❌ Error updating record {record_id}: {response.status_code}")
-        print(response.text)
-        return False
-
-    return True
-
 def process_language(language):
     """Process all records for a specific language"""
     print()
@@ -115,6 +65,7 @@ def process_language(language):
     updated_count = 0
     skipped_count = 0
     error_count = 0
+    writer = client.batch_writer()
     
     for i, record in enumerate(records, 1):
         record_id = record['id']
@@ -144,15 +95,14 @@ def process_language(language):
         print(f"   🗑️  Removing: {removed_part.strip()[:80]}...")
         print(f"   ✅ Cleaned ({len(body_text)} → {len(cleaned)} chars)")
         
-        # Update the record
-        if update_record(record_id, cleaned):
-            print(f"   💾 Updated in Airtable")
-            updated_count += 1
-        else:
-            print(f"   ❌ Failed to update")
-            error_count += 1
-        
-        time.sleep(0.3)
+        # Queue the update; the writer sends 10 records per request
+        writer.update(record_id, {'body_text': cleaned})
+        print(f"   💾 Queued for Airtable")
+        updated_count += 1
+    
+    failed = writer.close()
+    updated_count -= len(failed)
+    error_count += len(failed)
     
     print()
     print("=" * 60)
@@ -5,9 +5,14 @@ Re-translate OurDream AI with STRICT English AI term preservation
 
 import os
 import requests
-import time
 from anthropic import Anthropic
 
+from model_routing import ModelRouter
+from text_chunker import chunk_markdown
+from translation_engine import TranslationEngine
+from translation_memory import TranslationMemory
+from translation_prompts import NL_REVIEW_STRICT
+
 AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
 API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Companion_Translations'
@@ -17,72 +22,8 @@ headers = {
 }
 
 anthropic = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
-
-def translate_with_claude(text_chunk):
-    """Translate text using Claude API with STRICT rules"""
-
-    prompt = f"""Translate this AI companion review from English to Dutch.
-
-CRITICAL TRANSLATION RULES - KEEP IN ENGLISH:
-1. ALL AI terminology: AI girlfriend, AI companion, AI chatbot, AI boyfriend, AI character, AI porn, AI hentai
-2. Product category terms: roleplay, chat, NSFW, SFW, character creation, playground, chatbot, companion
-3. Technical terms: Stable Diffusion, Deepseek, tokens, API, image generation, video generation
-4. Feature names: playground, character creator, image generator, video creation, memory, personality
-5. Brand names: OurDream AI, Character.AI, Replika, DreamGF, etc.
-6. Review section titles: "My Month Testing...", "The Bottom Line", "Pros and Cons"
-7. Common phrases: "bottom line", "use case", "power users", "creative freedom", "free tier"
-
-TRANSLATE TO DUTCH:
-- Regular descriptive words (comprehensive, innovative, high-quality, etc.)
-- Sentences and explanations
-- Benefits and drawbacks
-- User experience descriptions
-
-EXAMPLES:
-❌ WRONG: "Innovatief AI Companion Speelterrein"
-✅ CORRECT: "Innovatief AI Companion Playground"
-
-❌ WRONG: "Mijn Maand OurDream AI Testen"
-✅ CORRECT: "My Month Testing OurDream AI"
-
-❌ WRONG: "karakter creatie"
-✅ CORRECT: "character creation"
-
-Now translate this text:
-
-{text_chunk}"""
-
-    response = anthropic.messages.create(
-        model="claude-3-5-sonnet-20241022",
-        max_tokens=8000,
-        messages=[{"role": "user", "content": prompt}]
-    )
-
-    return response.content[0].text.strip()
-
-def chunk_text(text, max_chars=9000):
-    """Split text into chunks at paragraph boundaries"""
-    if len(text) <= max_chars:
-        return [text]
-
-    chunks = []
-    current_chunk = ""
-    paragraphs = text.split('\n\n')
-
-    for para in paragraphs:
-        if len(current_chunk) + len(para) + 2 > max_chars and current_chunk:
-            chunks.append(current_chunk.strip())
-            current_chunk = para
-        else:
-            if current_chunk:
-                current_chunk += '\n\n' + para
-            else:
-                current_chunk = para
-
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-
-    return chunks
+engine = TranslationEngine(anthropic, memory=TranslationMemory(), language='nl',
+                           router=ModelRouter(), field='my_verdict')
 
 print("🔄 Re-translating OurDream AI with STRICT English term preservation...")
 print("=" * 70)
@@ -116,18 +57,19 @@ if not nl_record_id:
 print(f"📊 EN verdict: {len(en_verdict):,} chars")
 
 # Chunk and translate
-chunks = chunk_text(en_verdict, max_chars=9000)
+chunks = chunk_markdown(en_verdict, language='nl')
 print(f"🔄 Translating {len(chunks)} chunk(s) with STRICT English term rules...\n")
 
-translated_chunks = []
 for i, chunk in enumerate(chunks, 1):
-    print(f"[{i}/{len(chunks)}] {len(chunk):,} chars... ", end='', flush=True)
+    print(f"[{i}/{len(chunks)}] {len(chunk):,} chars")
 
-    translated = translate_with_claude(chunk)
-    print(f"✅ {len(translated):,} chars")
+# Chunks are translated concurrently and come back in source order
+translated_chunks = engine.translate_many([('ourdream-ai', chunks, NL_REVIEW_STRICT)])['ourdream-ai']
+engine.report()
 
-    translated_chunks.append(translated)
-    time.sleep(2)
+if translated_chunks is None:
+    print("❌ Translation failed")
+    exit(1)
 
 # Combine
 full_translation = '\n\n'.join(translated_chunks)
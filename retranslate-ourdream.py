@@ -5,10 +5,14 @@ Re-translate OurDream AI verdict completely
 
 import os
 import requests
-import time
 import re
 from anthropic import Anthropic
 
+from model_routing import ModelRouter
+from text_chunker import chunk_markdown
+from translation_engine import TranslationEngine
+from translation_memory import TranslationMemory
+
 AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
 API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Companion_Translations'
@@ -19,10 +23,14 @@ headers = {
 
 anthropic = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
 
-def translate_with_claude(text_chunk):
-    """Translate text using Claude API"""
+# Unchanged paragraphs come from the translation memory instead of Claude
+engine = TranslationEngine(anthropic, memory=TranslationMemory(), language='nl',
+                           router=ModelRouter(), field='my_verdict')
+
+def build_prompt(text_chunk):
+    """Prompt for translating one verdict chunk to Dutch"""
 
-    prompt = f"""Translate this companion review text from English to Dutch.
+    return f"""Translate this companion review text from English to Dutch.
 
 CRITICAL RULES:
 1. Keep ALL AI industry terms in English: AI girlfriend, AI companion, AI chatbot, roleplay, chat, NSFW, character creation, playground, etc.
@@ -36,38 +44,6 @@ Text to translate:
 
 {text_chunk}"""
 
-    response = anthropic.messages.create(
-        model="claude-3-5-sonnet-20241022",
-        max_tokens=8000,
-        messages=[{"role": "user", "content": prompt}]
-    )
-
-    return response.content[0].text.strip()
-
-def chunk_text(text, max_chars=9000):
-    """Split text into chunks at paragraph boundaries"""
-    if len(text) <= max_chars:
-        return [text]
-
-    chunks = []
-    current_chunk = ""
-    paragraphs = text.split('\n\n')
-
-    for para in paragraphs:
-        if len(current_chunk) + len(para) + 2 > max_chars and current_chunk:
-            chunks.append(current_chunk.strip())
-            current_chunk = para
-        else:
-            if current_chunk:
-                current_chunk += '\n\n' + para
-            else:
-                current_chunk = para
-
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-
-    return chunks
-
 print("🔄 Re-translating OurDream AI verdict...")
 print("=" * 70)
 
@@ -100,18 +76,18 @@ if not nl_record_id:
 print(f"📊 EN verdict: {len(en_verdict)} chars")
 
 # Chunk and translate
-chunks = chunk_text(en_verdict, max_chars=9000)
+chunks = chunk_markdown(en_verdict, language='nl')
 print(f"🔄 Translating {len(chunks)} chunk(s)...\n")
 
-translated_chunks = []
 for i, chunk in enumerate(chunks, 1):
-    print(f"[{i}/{len(chunks)}] {len(chunk)} chars... ", end='', flush=True)
+    print(f"[{i}/{len(chunks)}] {len(chunk)} chars")
 
-    translated = translate_with_claude(chunk)
-    print(f"✅ {len(translated)} chars")
+translated_chunks = engine.translate_many([('ourdream-ai', chunks, build_prompt)])['ourdream-ai']
+engine.report()
 
-    translated_chunks.append(translated)
-    time.sleep(2)
+if translated_chunks is None:
+    print("❌ Translation failed")
+    exit(1)
 
 # Combine
 full_translation = '\n\n'.join(translated_chunks)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Whole-site HTML maintenance sweep: every registered fixer in one pass.
+
+Each page is read once, run through all transforms that apply to it, and
+written back only if its bytes changed. Pages are spread over one process per
+core; the report is printed in path order either way. The hreflang index is
+loaded once before the sweep, shared with every worker, and saved afterwards
+with the rewritten pages updated.
+
+Usage:
+    python3 site-sweep.py                       # all transforms
+    python3 site-sweep.py fix-404-links ...     # just the named ones
+    python3 site-sweep.py --dry-run             # report, don't write
+    python3 site-sweep.py --workers=1           # single process (default: all cores)
+    python3 site-sweep.py --list
+"""
+
+import sys
+
+from html_pipeline import RewritePipeline, site_html_files, DEFAULT_WORKERS
+from html_transforms import TRANSFORMS, transforms_named, with_site_index
+from hreflang_index import HreflangIndex
+
+
+def main():
+    args = sys.argv[1:]
+
+    if '--list' in args:
+        for transform in TRANSFORMS:
+            print(f"   {transform.name}")
+        return
+
+    dry_run = '--dry-run' in args
+    workers = DEFAULT_WORKERS
+    for arg in args:
+        if arg.startswith('--workers='):
+            try:
+                workers = max(1, int(arg.split('=', 1)[1]))
+            except ValueError:
+                print(f"❌ Invalid worker count: {arg}")
+                exit(1)
+    names = [arg for arg in args if not arg.startswith('--')]
+
+    try:
+        transforms = transforms_named(names) if names else TRANSFORMS
+    except KeyError as e:
+        print(f"❌ Unknown transform: {e.args[0]}")
+        print("   Run with --list to see the available transforms")
+        exit(1)
+
+    # Loaded (and refreshed) once here rather than in every worker
+    index = HreflangIndex.load()
+    pipeline = RewritePipeline(transforms, dry_run=dry_run, setup=with_site_index(index))
+    print(f"🔧 Sweeping site with {len(transforms)} transforms on {workers} workers"
+          f"{' (dry run)' if dry_run else ''}\n")
+
+    checked = 0
+    updated = 0
+    errors = 0
+    rewritten = []
+    for result in pipeline.run(site_html_files(), workers=workers):
+        checked += 1
+        if result.error:
+            errors += 1
+            print(f"❌ {result.path}: {result.error}")
+        if result.changed:
+            updated += 1
+            rewritten.append(result.path)
+            print(f"✅ {result.path}: {result.summary()}")
+
+    if not dry_run:
+        for path in rewritten:
+            index.update(path)
+    index.save()
+
+    print(f"\n{'='*60}")
+    print(f"📊 Summary:")
+    print(f"   Files checked: {checked}")
+    print(f"   Files {'to update' if dry_run else 'updated'}: {updated}")
+    print(f"   Errors: {errors}")
+    print(f"{'='*60}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for the meta-text scrubber
+"""
+
+from meta_scrubber import scrub, has_meta
+from truncation import TRAILER
+
+# (description, Claude reply, expected after scrub)
+SCRUB_CASES = [
+    ("preamble line",
+     "Here's the Dutch translation:\n\nGoede tekst.",
+     "Goede tekst."),
+    ("trailer on its own line",
+     "Goede tekst.\n\nWould you like me to continue?",
+     "Goede tekst."),
+    ("trailer after text on the same line",
+     "Goede tekst. Would you like me to continue?",
+     "Goede tekst."),
+    ("length note without a colon",
+     "Due to length limitations, I translated the first part.\n\nGoede tekst.",
+     "Goede tekst."),
+    ("length note after text on the same line",
+     "Goede tekst. Due to length limitations, I have translated only the first part.",
+     "Goede tekst."),
+    ("bracketed note",
+     "Goede tekst. [Note: the rest follows]",
+     "Goede tekst."),
+    ("colon in real content",
+     "Prijs: €9,99 per maand.",
+     "Prijs: €9,99 per maand."),
+]
+
+# Every trailer the scrubber removes is one truncation.py treats as a cut-off
+TRAILER_CASES = [
+    "Would you like me to continue?",
+    "Due to length limitations, I translated the first part.",
+    "Shall I continue with the rest?",
+    "Wil je dat ik verder ga?",
+]
+
+print("=" * 70)
+print("TESTING META-TEXT SCRUBBER")
+print("=" * 70)
+
+failures = 0
+for description, reply, expected in SCRUB_CASES:
+    result = scrub(reply)
+    if result == expected:
+        print(f"   ✅ {description}")
+    else:
+        print(f"   ❌ {description}: {result!r} (expected {expected!r})")
+        failures += 1
+
+print("\n🔍 Trailers shared with truncation.py:")
+for reply in TRAILER_CASES:
+    if has_meta(reply) and TRAILER.search(reply) and not scrub(reply):
+        print(f"   ✅ '{reply}'")
+    else:
+        print(f"   ❌ '{reply}' is not handled by both the scrubber and the truncation check")
+        failures += 1
+
+print("\n" + "=" * 70)
+
+if failures:
+    exit(1)
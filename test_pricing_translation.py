@@ -5,6 +5,8 @@ Test script for pricing_plans translation logic
 
 import json
 
+from glossary import Glossary
+
 # Test data
 test_pricing_en = [
     {
@@ -47,6 +49,9 @@ NL_TRANSLATIONS = {
     'features': 'functies',
     'access': 'toegang',
     'Image generation': 'Afbeelding generatie',
+    'daily': 'dagelijks',
+    'credits': 'credits',
+    'Ad-free': 'Advertentievrij',
 }
 
 # Portuguese translations
@@ -63,46 +68,27 @@ PT_TRANSLATIONS = {
     'features': 'recursos',
     'access': 'acesso',
     'Image generation': 'Geração de imagem',
+    'daily': 'diário',
+    'credits': 'créditos',
+    'Ad-free': 'Sem anúncios',
 }
 
 PRESERVE_TERMS = [
     'AI Chat', 'AI Character Chat', 'AI Companions', 'AI Companion',
     'early access', 'Early Access', 'AI girlfriend', 'AI boyfriend',
     'video generation', 'voice chat',
+    'AI', 'Free',
 ]
 
+GLOSSARIES = {
+    'nl': Glossary(NL_TRANSLATIONS, preserve=PRESERVE_TERMS),
+    'pt': Glossary(PT_TRANSLATIONS, preserve=PRESERVE_TERMS),
+}
+
 def translate_text(text, lang):
     """Translate text while preserving English technical terms"""
-    if not text or not isinstance(text, str):
-        return text
-
-    # First, protect preserved terms
-    import re
-    protected_text = text
-    placeholders = {}
-
-    for i, term in enumerate(PRESERVE_TERMS):
-        pattern = re.compile(re.escape(term), re.IGNORECASE)
-        match = pattern.search(protected_text)
-        if match:
-            placeholder = f"__PRESERVE_{i}__"
-            placeholders[placeholder] = match.group()
-            protected_text = pattern.sub(placeholder, protected_text, count=1)
-
-    # Choose translation dictionary
-    translations = NL_TRANSLATIONS if lang == 'nl' else PT_TRANSLATIONS
-    result = protected_text
-
-    # Translate
-    for english, translated in translations.items():
-        result = result.replace(english, translated)
-        result = result.replace(english.capitalize(), translated.capitalize())
-
-    # Restore preserved terms
-    for placeholder, original in placeholders.items():
-        result = result.replace(placeholder, original)
-
-    return result
+    glossary = GLOSSARIES['nl'] if lang == 'nl' else GLOSSARIES['pt']
+    return glossary.translate(text)
 
 def translate_pricing_plans(pricing_plans, lang):
     """Translate pricing_plans structure"""
@@ -171,3 +157,33 @@ for term in preserved_terms:
         print(f"   ⚠️  '{term}' might have been changed")
 
 print("\n" + "=" * 70)
+print("🔍 WORD BOUNDARY CHECK:")
+print("=" * 70)
+
+# Terms only match whole words, and preserve terms no longer get a pass of
+# their own. The old translator shielded preserve terms as substrings first,
+# so 'AI' inside "Daily" and 'Free' inside "Ad-free" kept those strings in
+# English; they are translated now.
+WORD_BOUNDARY_CASES = [
+    ('nl', 'Daily credits', 'Dagelijks credits'),
+    ('nl', 'Ad-free experience', 'Advertentievrij experience'),
+    ('nl', 'Free daily credits', 'Free dagelijks credits'),
+    ('nl', 'Unlimited AI Chat', 'Onbeperkt AI Chat'),
+    ('nl', 'Accessible anywhere', 'Accessible anywhere'),
+    ('pt', 'Daily credits', 'Diário créditos'),
+    ('pt', 'Ad-free experience', 'Sem anúncios experience'),
+]
+
+failures = 0
+for lang, text, expected in WORD_BOUNDARY_CASES:
+    result = translate_text(text, lang)
+    if result == expected:
+        print(f"   ✅ {lang}: '{text}' → '{result}'")
+    else:
+        print(f"   ❌ {lang}: '{text}' → '{result}' (expected '{expected}')")
+        failures += 1
+
+print("\n" + "=" * 70)
+
+if failures:
+    exit(1)
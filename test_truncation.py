@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script for truncated-translation detection and resume points
+"""
+
+from truncation import split_at_truncation
+
+SOURCE = "Para one.\n\nPara two.\n\nPara three.\n\nPara four."
+
+# (description, Claude reply, stop_reason, expected kept, expected tail)
+SPLIT_CASES = [
+    ("cut mid-paragraph",
+     "Para een.\n\nPara twee.\n\nPara dr",
+     'max_tokens',
+     ['Para een.', 'Para twee.'], "Para three.\n\nPara four."),
+    ("trailer between paragraphs, cut mid-paragraph",
+     "Para een.\n\nPara twee.\n\nDue to length limitations, I have translated only the first part.\n\nPara dr",
+     'max_tokens',
+     ['Para een.', 'Para twee.'], "Para three.\n\nPara four."),
+    ("max_tokens reply ending with a trailer line",
+     "Para een.\n\nPara twee.\n\nPara drie.\n\nDue to length limitations, I have translated only the first part.",
+     'max_tokens',
+     ['Para een.', 'Para twee.', 'Para drie.'], "Para four."),
+    ("trailer after a stop on its own",
+     "Para een.\n\nPara twee.\n\nWould you like me to continue?",
+     'end_turn',
+     ['Para een.', 'Para twee.'], "Para three.\n\nPara four."),
+]
+
+print("=" * 70)
+print("TESTING TRUNCATION RESUME POINTS")
+print("=" * 70)
+
+failures = 0
+for description, reply, stop_reason, expected_kept, expected_tail in SPLIT_CASES:
+    kept, tail = split_at_truncation(SOURCE, reply, stop_reason, 'nl')
+    if kept == expected_kept and tail == expected_tail:
+        print(f"   ✅ {description}")
+    else:
+        print(f"   ❌ {description}: kept {kept!r}, tail {tail!r}")
+        print(f"      (expected kept {expected_kept!r}, tail {expected_tail!r})")
+        failures += 1
+
+print("\n" + "=" * 70)
+
+if failures:
+    exit(1)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Token-aware, markdown-aware chunking for the translation scripts.
+
+chunk_text(max_chars=9000) cut verdicts into paragraphs by character count,
+so chunk sizes in tokens varied widely: some came close to max_tokens and
+were cut off (hence the "Would you like me to continue" cleanup), others
+left most of a request unused. chunk_markdown() instead:
+
+- estimates tokens from words and punctuation rather than characters
+- keeps a heading together with the block that follows it, and a list
+  together as one block while it fits
+- works out how many chunks a text needs for the target output size, then
+  packs them evenly, so the last chunk isn't a small leftover
+- splits a single block that is too big on its own at sentence boundaries
+
+max_tokens_for() sizes each request's max_tokens from its source chunk, so
+short chunks don't reserve 8000 output tokens and long ones get headroom.
+
+Usage:
+    from text_chunker import chunk_markdown
+
+    chunks = chunk_markdown(en_verdict, language='nl')
+"""
+
+import re
+import math
+
+# Output tokens per chunk that chunk_markdown() aims for
+TARGET_OUTPUT_TOKENS = 2500
+MODEL_MAX_TOKENS = 8192
+MIN_MAX_TOKENS = 512
+# Output tokens per source token when translating English into the language
+EXPANSION = {'nl': 1.3, 'pt': 1.25, 'de': 1.35, 'es': 1.2}
+DEFAULT_EXPANSION = 1.3
+# max_tokens headroom over the expected output
+HEADROOM = 1.4
+
+TOKEN = re.compile(r"\w+|[^\w\s]")
+HEADING = re.compile(r'^(#{1,6}\s|\*\*[^*\n]+\*\*:?\s*$)')
+LIST_ITEM = re.compile(r'^\s*(?:[-*+•]|\d+[.)])\s')
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z"“(*#])')
+
+
+def count_tokens(text):
+    """
+    Estimate the token count: roughly one token per short word or
+    punctuation mark, long words counting one per six characters
+    """
+    return sum(max(1, math.ceil(len(piece) / 6)) for piece in TOKEN.findall(text))
+
+
+def output_tokens(text, language=None):
+    """Expected output tokens for translating `text` into `language`"""
+    return math.ceil(count_tokens(text) * EXPANSION.get(language, DEFAULT_EXPANSION))
+
+
+def max_tokens_for(text, language=None, ceiling=MODEL_MAX_TOKENS):
+    """max_tokens for one request translating `text`"""
+    wanted = math.ceil(output_tokens(text, language) * HEADROOM) + 256
+    return max(MIN_MAX_TOKENS, min(wanted, ceiling))
+
+
+def markdown_blocks(text):
+    """
+    Split text into blocks that shouldn't be cut: paragraphs, whole lists,
+    and headings merged with the block after them
+    """
+    blocks = []
+    heading = None
+
+    for para in (para.strip('\n') for para in text.split('\n\n')):
+        if not para.strip():
+            continue
+
+        if blocks and heading is None and LIST_ITEM.match(para) and LIST_ITEM.match(blocks[-1].split('\n')[-1]):
+            blocks[-1] += '\n\n' + para
+            continue
+
+        if heading is not None:
+            para = heading + '\n\n' + para
+            heading = None
+
+        if HEADING.match(para) and '\n' not in para.strip():
+            heading = para
+            continue
+
+        blocks.append(para)
+
+    if heading is not None:
+        blocks.append(heading)
+    return blocks
+
+
+def split_block(block, budget, language=None):
+    """Split one oversized block at sentence boundaries (or lines) into pieces within budget"""
+    separator = '\n' if LIST_ITEM.search(block) or '\n' in block else ' '
+    pieces = block.split('\n') if separator == '\n' else SENTENCE_END.split(block)
+
+    parts = []
+    current = []
+    size = 0
+    for piece in pieces:
+        piece_size = output_tokens(piece, language)
+        if current and size + piece_size > budget:
+            parts.append(separator.join(current))
+            current = []
+            size = 0
+        current.append(piece)
+        size += piece_size
+
+    if current:
+        parts.append(separator.join(current))
+    return parts
+
+
+def chunk_markdown(text, language=None, target_tokens=TARGET_OUTPUT_TOKENS):
+    """
+    Split text into chunks of about `target_tokens` output tokens each, at
+    markdown block boundaries, as evenly sized as the blocks allow
+    """
+    if not text:
+        return []
+
+    blocks = []
+    sizes = []
+    for block in markdown_blocks(text):
+        size = output_tokens(block, language)
+        if size <= target_tokens:
+            blocks.append(block)
+            sizes.append(size)
+            continue
+        for part in split_block(block, target_tokens, language):
+            blocks.append(part)
+            sizes.append(output_tokens(part, language))
+
+    if sum(sizes) <= target_tokens:
+        return [text]
+
+    # Aim every chunk at the average of the fewest chunks that can hold the text
+    count = math.ceil(sum(sizes) / target_tokens)
+    goal = sum(sizes) / count
+
+    chunks = []
+    current = []
+    size = 0
+    for block, block_size in zip(blocks, sizes):
+        # Close the chunk when this block takes it further past the goal
+        # than stopping short would, or past the hard target
+        if current and (size + block_size > target_tokens or
+                        size + block_size - goal > goal - size):
+            chunks.append('\n\n'.join(current))
+            current = []
+            size = 0
+        current.append(block)
+        size += block_size
+
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
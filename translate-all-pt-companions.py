@@ -2,174 +2,163 @@
 """
 Translate all EN companion data to PT in Companion_Translations
 Fields to translate: tagline, description, best_for
+
+Creates missing PT records, and re-translates the fields of existing PT
+records whose EN content changed since the last sync (see change_journal.py)
 """
 
 import os
-import requests
-import time
 from anthropic import Anthropic
 
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Companion_Translations'
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
-
-anthropic = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
-
-def translate_to_portuguese(text, field_name):
-    """Translate text to Portuguese using Claude"""
-
-    prompt = f"""Translate this {field_name} from English to Portuguese (Brazil).
+from airtable_client import AirtableClient
+from airtable_mirror import AirtableMirror
+from change_journal import ChangeJournal
+from field_batcher import FieldBatcher
+from model_routing import ModelRouter
+from translation_engine import TranslationEngine
+from translation_memory import TranslationMemory
+from translation_prompts import PT_COMPANION
 
-CRITICAL RULES:
-1. Keep ALL AI industry terms in English: AI girlfriend, AI companion, AI chatbot, AI boyfriend, roleplay, chat, NSFW, SFW, character creation, playground, image generation, video generation
-2. Only translate regular Portuguese words and explanatory text
-3. Keep brand names in English (Character.AI, Replika, Stable Diffusion, etc.)
-4. DO NOT add any meta-commentary or notes
-5. ONLY return the pure Portuguese translation
+client = AirtableClient.from_env()
+mirror = AirtableMirror()
+journal = ChangeJournal()
 
-Text to translate:
-
-{text}"""
-
-    response = anthropic.messages.create(
-        model="claude-3-5-sonnet-20241022",
-        max_tokens=2000,
-        messages=[{"role": "user", "content": prompt}]
-    )
+anthropic = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+engine = TranslationEngine(anthropic, memory=TranslationMemory(), language='pt', router=ModelRouter())
+# Short fields of many companions go out together, one JSON object per request
+batcher = FieldBatcher(engine, PT_COMPANION)
 
-    return response.content[0].text.strip()
+FIELDS = ['tagline', 'description', 'best_for']
 
 print("🇵🇹 Translating all companions to Portuguese...")
 print("=" * 70)
 
-# Fetch all records
-all_records = []
-offset = None
-
-while True:
-    params = {}
-    if offset:
-        params['offset'] = offset
+# Bring the local mirror up to date, then group by companion ID
+pulled, _ = mirror.sync(client)
+print(f"✅ Mirror synced ({pulled} records pulled)\n")
 
-    response = requests.get(API_URL, headers=headers, params=params)
-    data = response.json()
-    all_records.extend(data.get('records', []))
+by_companion = mirror.by_companion(['en', 'pt'])
 
-    offset = data.get('offset')
-    if not offset:
-        break
-    time.sleep(0.2)
+def en_record_of(companion_id):
+    return by_companion[companion_id]['en']
 
-print(f"✅ Fetched {len(all_records)} total records\n")
-
-# Group by companion ID
-by_companion = {}
-for record in all_records:
-    fields = record['fields']
-    lang = fields.get('language', '')
-    companion_id = fields.get('companion', [None])[0]
+# Find companions that need PT translation: no PT record yet, or EN fields
+# changed since the last PT sync
+synced = journal.synced_fingerprints('pt')
+needs_translation = []
+for companion_id, langs in by_companion.items():
+    if 'en' not in langs:
+        continue
 
-    if not companion_id:
+    if 'pt' not in langs:
+        needs_translation.append((companion_id, FIELDS))
         continue
 
-    if companion_id not in by_companion:
-        by_companion[companion_id] = {}
+    en_record = en_record_of(companion_id)
+    changed = journal.changed_fields(en_record, 'pt', FIELDS, synced)
+    known = [field for field in changed if (en_record['id'], field) in synced]
 
-    by_companion[companion_id][lang] = {
-        'record_id': record['id'],
-        'fields': fields
-    }
+    # Fields never journaled were translated before the journal existed:
+    # adopt the current PT text as the synced version
+    unknown = [field for field in changed if field not in known]
+    if unknown:
+        journal.mark_synced(en_record, 'pt', unknown)
 
-# Find companions that need PT translation
-needs_translation = []
-for companion_id, langs in by_companion.items():
-    if 'en' in langs and 'pt' not in langs:
-        needs_translation.append(companion_id)
+    if known:
+        needs_translation.append((companion_id, known))
 
 print(f"Found {len(needs_translation)} companions needing PT translation\n")
 
 if not needs_translation:
-    print("✅ All companions already have PT translations!")
+    print("✅ All PT translations are up to date!")
     exit(0)
 
-# Translate each companion
-updated_count = 0
-error_count = 0
+# Queue every field of every companion; the batcher packs them into a few requests
+items = []
+names = {}
 
-for i, companion_id in enumerate(needs_translation, 1):
-    en_data = by_companion[companion_id]['en']
-    en_fields = en_data['fields']
+for companion_id, fields_to_translate in needs_translation:
+    en_fields = by_companion[companion_id]['en']['fields']
 
     name_field = en_fields.get('name (from companion)', [])
-    name = name_field[0] if isinstance(name_field, list) and name_field else 'Unknown'
+    names[companion_id] = name_field[0] if isinstance(name_field, list) and name_field else 'Unknown'
+
+    for field in fields_to_translate:
+        if en_fields.get(field):
+            items.append(((companion_id, field), en_fields[field]))
+
+print(f"🔄 Translating {len(items)} fields...")
+results = batcher.translate(items, label=lambda key: key[1])
+batcher.report()
+print()
 
+# Create the PT records, or update the changed fields of existing ones
+created_count = 0
+updated_count = 0
+error_count = 0
+writer = mirror.writer(client)
+queued = []
+
+for i, (companion_id, fields_to_translate) in enumerate(needs_translation, 1):
+    name = names[companion_id]
     print(f"[{i}/{len(needs_translation)}] 🔄 {name}")
 
-    # Get fields to translate
-    en_tagline = en_fields.get('tagline', '')
-    en_description = en_fields.get('description', '')
-    en_best_for = en_fields.get('best_for', '')
+    keys = [(companion_id, field) for field in fields_to_translate if (companion_id, field) in results]
 
-    if not en_tagline and not en_description and not en_best_for:
+    if not keys:
         print(f"   ⚠️  No content to translate")
         continue
 
-    try:
-        # Translate each field
-        pt_data = {}
-
-        if en_tagline:
-            print(f"   📝 Translating tagline... ", end='', flush=True)
-            pt_data['tagline'] = translate_to_portuguese(en_tagline, 'tagline')
-            print(f"✅ {len(pt_data['tagline'])} chars")
-            time.sleep(1.5)
-
-        if en_description:
-            print(f"   📝 Translating description... ", end='', flush=True)
-            pt_data['description'] = translate_to_portuguese(en_description, 'description')
-            print(f"✅ {len(pt_data['description'])} chars")
-            time.sleep(1.5)
-
-        if en_best_for:
-            print(f"   📝 Translating best_for... ", end='', flush=True)
-            pt_data['best_for'] = translate_to_portuguese(en_best_for, 'best for')
-            print(f"✅ {len(pt_data['best_for'])} chars")
-            time.sleep(1.5)
-
-        # Create new PT record
-        new_record = {
-            'fields': {
-                'companion': [companion_id],
-                'language': 'pt',
-                **pt_data
-            }
-        }
+    if any(results[key] is None for key in keys):
+        print(f"   ❌ Error: translation failed")
+        error_count += 1
+        continue
+
+    pt_data = {field: results[(companion_id, field)] for _, field in keys}
+    for field, text in pt_data.items():
+        print(f"   📝 {field}: ✅ {len(text)} chars")
+
+    if 'pt' in by_companion[companion_id]:
+        pt_record_id = by_companion[companion_id]['pt']['id']
+        writer.update(pt_record_id, pt_data)
+        queued.append((pt_record_id, companion_id, list(pt_data)))
+        print(f"   💾 Queued PT update")
+        continue
 
-        response = requests.post(API_URL, headers=headers, json=new_record)
+    # Create new PT record
+    new_record = {
+        'fields': {
+            'companion': [companion_id],
+            'language': 'pt',
+            **pt_data
+        }
+    }
 
-        if response.status_code == 200:
-            print(f"   ✅ Created PT record")
-            updated_count += 1
-        else:
-            print(f"   ❌ Failed to create record: {response.status_code}")
-            print(f"   {response.text[:200]}")
-            error_count += 1
+    response = client.request('POST', json=new_record)
 
-        time.sleep(0.5)
+    if response.status_code == 200:
+        print(f"   ✅ Created PT record")
+        mirror.upsert([response.json()])
+        journal.mark_synced(en_record_of(companion_id), 'pt', list(pt_data))
+        created_count += 1
+    else:
+        print(f"   ❌ Failed to create record: {response.status_code}")
+        print(f"   {response.text[:200]}")
+        error_count += 1
 
-    except Exception as e:
-        print(f"   ❌ Error: {str(e)}")
+failed = set(writer.close())
+for pt_record_id, companion_id, fields in queued:
+    if pt_record_id in failed:
         error_count += 1
-        time.sleep(1)
+    else:
+        journal.mark_synced(en_record_of(companion_id), 'pt', fields)
+        updated_count += 1
 
 print()
 print("=" * 70)
 print(f"✅ Translation completed!")
-print(f"   Created:  {updated_count} PT records")
+print(f"   Created:  {created_count} PT records")
+print(f"   Updated:  {updated_count} PT records")
 print(f"   Errors:   {error_count} records")
 print(f"   Total:    {len(needs_translation)} companions")
 print("=" * 70)
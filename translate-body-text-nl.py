@@ -4,103 +4,40 @@ Translate all EN body_text to NL body_text in Companion_Translations
 """
 
 import os
-import requests
-import time
 from anthropic import Anthropic
 
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Companion_Translations'
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+from airtable_client import AirtableClient
+from airtable_mirror import AirtableMirror
+from change_journal import ChangeJournal
+from model_routing import ModelRouter
+from translation_engine import TranslationEngine
+from translation_memory import TranslationMemory
+from translation_prompts import NL_COMPANION
 
-anthropic = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
-
-def translate_body_text(text):
-    """Translate body_text using Claude API"""
-
-    prompt = f"""Translate this AI companion description from English to Dutch.
-
-CRITICAL TRANSLATION RULES - KEEP IN ENGLISH:
-1. ALL AI terminology: AI girlfriend, AI companion, AI chatbot, AI boyfriend, AI porn, NSFW, SFW
-2. Product terms: roleplay, chat, character creation, playground, chatbot, companion, image generation, video creation
-3. Technical terms: Stable Diffusion, Deepseek, tokens, API, etc.
-4. Brand names: OurDream AI, Character.AI, Replika, DreamGF, Candy AI, etc.
-5. Feature names: playground, character creator, memory, personality, unlimited messaging, etc.
-
-TRANSLATE TO DUTCH:
-- Regular descriptive words and sentences
-- User experience descriptions
-- Platform capabilities
-
-EXAMPLES:
-❌ WRONG: "ongecensureerd AI metgezel speelterrein platform"
-✅ CORRECT: "ongecensureerd AI companion playground platform"
-
-❌ WRONG: "karakter creatie tools"
-✅ CORRECT: "character creation tools"
+client = AirtableClient.from_env()
+mirror = AirtableMirror()
+journal = ChangeJournal()
 
-Now translate this text. ONLY return the translation, NO meta-commentary:
-
-{text}"""
-
-    response = anthropic.messages.create(
-        model="claude-3-5-sonnet-20241022",
-        max_tokens=2000,
-        messages=[{"role": "user", "content": prompt}]
-    )
-
-    return response.content[0].text.strip()
+anthropic = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+engine = TranslationEngine(anthropic, memory=TranslationMemory(), language='nl',
+                           router=ModelRouter(), field='body_text')
 
 print("🔄 Translating all NL body_text fields...")
 print("=" * 70)
 
-# Fetch all records
-all_records = []
-offset = None
-
-while True:
-    params = {}
-    if offset:
-        params['offset'] = offset
-
-    response = requests.get(API_URL, headers=headers, params=params)
-    data = response.json()
-    all_records.extend(data.get('records', []))
+# Bring the local mirror up to date, then group by slug
+pulled, _ = mirror.sync(client)
+print(f"✅ Mirror synced ({pulled} records pulled)\n")
 
-    offset = data.get('offset')
-    if not offset:
-        break
-
-    time.sleep(0.2)
-
-print(f"✅ Fetched {len(all_records)} total records\n")
-
-# Group by slug
-by_slug = {}
-for record in all_records:
-    fields = record['fields']
-    lang = fields.get('language', '')
-    slug_field = fields.get('slug (from companion)', [])
-    slug = slug_field[0] if isinstance(slug_field, list) and slug_field else ''
-
-    if not slug:
-        continue
-
-    if slug not in by_slug:
-        by_slug[slug] = {}
-
-    by_slug[slug][lang] = {
-        'record_id': record['id'],
-        'fields': fields
-    }
+by_slug = mirror.by_slug(['en', 'nl'])
 
 # Translate NL body_text from EN
+synced = journal.synced_fingerprints('nl')
 updated_count = 0
 skipped_count = 0
 error_count = 0
+jobs = []
+en_records = {}
 
 nl_slugs = [slug for slug in by_slug if 'nl' in by_slug[slug]]
 print(f"Found {len(nl_slugs)} NL records\n")
@@ -113,7 +50,6 @@ for i, slug in enumerate(nl_slugs, 1):
 
     en_body_text = by_slug[slug]['en']['fields'].get('body_text', '')
     nl_body_text = by_slug[slug]['nl']['fields'].get('body_text', '')
-    nl_record_id = by_slug[slug]['nl']['record_id']
 
     name_field = by_slug[slug]['nl']['fields'].get('name (from companion)', [])
     name = name_field[0] if isinstance(name_field, list) and name_field else slug
@@ -123,40 +59,54 @@ for i, slug in enumerate(nl_slugs, 1):
         skipped_count += 1
         continue
 
-    # Skip if NL already has body_text that's similar length to EN
-    if nl_body_text and len(nl_body_text) > len(en_body_text) * 0.8:
+    en_record = by_slug[slug]['en']
+
+    if (en_record['id'], 'body_text') in synced:
+        # Skip if EN body_text is unchanged since the last NL sync
+        if not journal.changed_fields(en_record, 'nl', ['body_text'], synced):
+            print(f"[{i}/{len(nl_slugs)}] ✓ {name:30} - Unchanged since last sync")
+            skipped_count += 1
+            continue
+    elif nl_body_text and len(nl_body_text) > len(en_body_text) * 0.8:
+        # Never journaled: NL already has body_text of similar length to EN,
+        # so adopt it as the synced version
         print(f"[{i}/{len(nl_slugs)}] ✓ {name:30} - Already translated ({len(nl_body_text)} chars)")
+        journal.mark_synced(en_record, 'nl', ['body_text'])
         skipped_count += 1
         continue
 
-    print(f"[{i}/{len(nl_slugs)}] 🔄 {name:30} - EN: {len(en_body_text):4} chars... ", end='', flush=True)
-
-    try:
-        translated = translate_body_text(en_body_text)
-        print(f"NL: {len(translated):4} chars")
+    print(f"[{i}/{len(nl_slugs)}] 🔄 {name:30} - EN: {len(en_body_text):4} chars")
+    jobs.append((slug, [en_body_text], NL_COMPANION))
+    en_records[slug] = en_record
 
-        # Update Airtable
-        url = f'{API_URL}/{nl_record_id}'
-        data = {'fields': {'body_text': translated}}
-        response = requests.patch(url, headers=headers, json=data)
+# Translate concurrently; each finished record is queued for a batched write
+writer = mirror.writer(client)
 
-        if response.status_code == 200:
-            updated_count += 1
-        else:
-            print(f"    ❌ Update failed: {response.status_code}")
-            error_count += 1
+def save_translation(slug, chunks):
+    translated = chunks[0]
+    print(f"    ✅ {slug}: NL {len(translated):4} chars")
+    writer.update(by_slug[slug]['nl']['id'], {'body_text': translated})
 
-        time.sleep(2)  # Rate limiting
+print()
+results = engine.translate_many(jobs, on_done=save_translation)
+failed = writer.close()
 
-    except Exception as e:
-        print(f"    ❌ Translation error: {str(e)}")
+for slug, chunks in results.items():
+    if chunks is None or by_slug[slug]['nl']['id'] in failed:
         error_count += 1
+        continue
+
+    # Only a confirmed write counts as synced; everything else stays pending
+    journal.mark_synced(en_records[slug], 'nl', ['body_text'])
+    updated_count += 1
+
+engine.report()
 
 print()
 print("=" * 70)
 print(f"✅ Translation completed!")
 print(f"   Updated:  {updated_count} records")
-print(f"   Skipped:  {skipped_count} records (already translated or empty)")
+print(f"   Skipped:  {skipped_count} records (unchanged, already translated or empty)")
 print(f"   Errors:   {error_count} records")
 print(f"   Total:    {len(nl_slugs)} records")
 print("=" * 70)
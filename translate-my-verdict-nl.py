@@ -5,23 +5,21 @@ Uses Claude API for high-quality translations.
 """
 
 import os
-import json
-import requests
-import time
 from anthropic import Anthropic
 
+from airtable_client import AirtableClient, AirtableError
+from field_batcher import FieldBatcher
+from model_routing import ModelRouter
+from translation_engine import TranslationEngine
+from translation_memory import TranslationMemory
+from translation_prompts import NL_VERDICT
+
 # Airtable configuration
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-TRANSLATIONS_TABLE_NAME = 'Companion_Translations'
+client = AirtableClient.from_env()
 
 # Anthropic API configuration
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 
-if not AIRTABLE_TOKEN or not AIRTABLE_BASE_ID:
-    print("❌ Error: AIRTABLE_TOKEN_CG and AIRTABLE_BASE_ID_CG must be set")
-    exit(1)
-
 if not ANTHROPIC_API_KEY:
     print("❌ Error: ANTHROPIC_API_KEY must be set")
     exit(1)
@@ -29,103 +27,28 @@ if not ANTHROPIC_API_KEY:
 # Initialize Anthropic client
 anthropic = Anthropic(api_key=ANTHROPIC_API_KEY)
 
-# Airtable API
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{TRANSLATIONS_TABLE_NAME}'
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+# Short verdicts are packed several to a request; long ones go on their own.
+# Unchanged verdicts come from the translation memory
+engine = TranslationEngine(anthropic, memory=TranslationMemory(), language='nl',
+                           router=ModelRouter(), field='my_verdict')
+batcher = FieldBatcher(engine, NL_VERDICT)
 
 def fetch_nl_records():
     """Fetch all NL records from Companion_Translations"""
     print("📥 Fetching NL records from Companion_Translations...")
     
-    records = []
-    offset = None
-    
     # Filter for language = 'nl'
     filter_formula = "{language} = 'nl'"
     
-    while True:
-        params = {
-            'filterByFormula': filter_formula
-        }
-        if offset:
-            params['offset'] = offset
-        
-        response = requests.get(API_URL, headers=headers, params=params)
-        
-        if response.status_code != 200:
-            print(f"❌ Error fetching records: {response.status_code}")
-            print(response.text)
-            return None
-        
-        data = response.json()
-        records.extend(data.get('records', []))
-        
-        offset = data.get('offset')
-        if not offset:
-            break
-        
-        time.sleep(0.2)
-    
-    print(f"✅ Fetched {len(records)} NL records")
-    return records
-
-def translate_to_dutch(english_text, companion_name):
-    """Translate English my_verdict text to Dutch using Claude API"""
-    
-    prompt = f"""Translate this AI companion review text from English to Dutch. This is a personal review/verdict section for {companion_name}.
-
-IMPORTANT TRANSLATION RULES:
-1. Keep English AI industry terms: "AI companion", "AI girlfriend", "AI boyfriend", "NSFW", "roleplay", "chat", etc.
-2. Translate conversational/review language naturally to Dutch
-3. Maintain the same paragraph structure and formatting
-4. Keep any markdown formatting (**, ##, etc.)
-5. Translate section headers like "My 1-Week Experience with X" to "Mijn 1 Week Ervaring met X"
-6. Keep brand names and product names in English
-7. Use natural Dutch expressions, not literal translations
-
-English text to translate:
-{english_text}
-
-Respond with ONLY the Dutch translation, no explanations or comments."""
-
     try:
-        response = anthropic.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=4000,
-            messages=[{
-                "role": "user",
-                "content": prompt
-            }]
-        )
-        
-        dutch_text = response.content[0].text.strip()
-        return dutch_text
-        
-    except Exception as e:
-        print(f"❌ Translation error: {e}")
+        records = client.fetch_all_records(filter_formula=filter_formula)
+    except AirtableError as e:
+        print(f"❌ Error fetching records: {e.status_code}")
+        print(e.text)
         return None
-
-def update_record(record_id, my_verdict_nl):
-    """Update a record with translated my_verdict"""
-    url = f'{API_URL}/{record_id}'
-    
-    data = {
-        'fields': {
-            'my_verdict': my_verdict_nl
-        }
-    }
-    
-    response = requests.patch(url, headers=headers, json=data)
     
-    if response.status_code != 200:
-        print(f"❌ Error updating record {record_id}: {response.status_code}")
-        print(response.text)
-        return False
-    
-    return True
+    print(f"✅ Fetched {len(records)} NL records")
+    return records
 
 def main():
     print("🚀 Starting my_verdict Dutch translation script...")
@@ -143,9 +66,11 @@ def main():
     updated_count = 0
     skipped_count = 0
     error_count = 0
+    writer = client.batch_writer()
+    
+    todo = []
     
     for i, record in enumerate(records, 1):
-        record_id = record['id']
         fields = record.get('fields', {})
         
         companion_name = fields.get('name', 'Unknown')
@@ -166,10 +91,20 @@ def main():
             skipped_count += 1
             continue
         
-        print(f"   🌍 Translating to Dutch... ({len(my_verdict_text)} chars)")
+        print(f"   🌍 Queued for Dutch translation ({len(my_verdict_text)} chars)")
+        todo.append((record, my_verdict_text))
+    
+    print()
+    print(f"🔄 Translating {len(todo)} verdicts...")
+    results = batcher.translate([(record['id'], text) for record, text in todo])
+    batcher.report()
+    
+    for record, _ in todo:
+        record_id = record['id']
+        companion_name = record['fields'].get('name', 'Unknown')
+        dutch_verdict = results[record_id]
         
-        # Translate to Dutch
-        dutch_verdict = translate_to_dutch(my_verdict_text, companion_name)
+        print(f"\n📝 {companion_name}")
         
         if not dutch_verdict:
             print(f"   ❌ Translation failed")
@@ -182,16 +117,14 @@ def main():
         preview = dutch_verdict[:150].replace('\n', ' ')
         print(f"   Preview: {preview}...")
         
-        # Update the record
-        if update_record(record_id, dutch_verdict):
-            print(f"   💾 Updated in Airtable")
-            updated_count += 1
-        else:
-            print(f"   ❌ Failed to update")
-            error_count += 1
-        
-        # Rate limiting - be nice to both APIs
-        time.sleep(1)
+        # Queue the update; the writer sends 10 records per request
+        writer.update(record_id, {'my_verdict': dutch_verdict})
+        print(f"   💾 Queued for Airtable")
+        updated_count += 1
+    
+    failed = writer.close()
+    updated_count -= len(failed)
+    error_count += len(failed)
     
     print()
     print("=" * 60)
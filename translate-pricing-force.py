@@ -8,6 +8,8 @@ import json
 import requests
 from datetime import datetime
 
+from glossary import Glossary
+
 # Airtable configuration
 AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
@@ -116,18 +118,16 @@ PT_TRANS = [
     ('includes', 'inclui'),
 ]
 
-def translate_aggressive(text, lang):
-    """Aggressive string replacement - no regex, no complex logic"""
-    if not text:
-        return text
-
-    trans_list = NL_TRANS if lang == 'nl' else PT_TRANS
-    result = text
-
-    for english, translated in trans_list:
-        result = result.replace(english, translated)
+# Plain substring glossaries, compiled once (longest term first)
+GLOSSARIES = {
+    'nl': Glossary(NL_TRANS, ignore_case=False, word_boundary=False),
+    'pt': Glossary(PT_TRANS, ignore_case=False, word_boundary=False),
+}
 
-    return result
+def translate_aggressive(text, lang):
+    """Aggressive string replacement - single pass, no word boundaries"""
+    glossary = GLOSSARIES['nl'] if lang == 'nl' else GLOSSARIES['pt']
+    return glossary.translate(text)
 
 def fetch_all_records():
     """Fetch all records"""
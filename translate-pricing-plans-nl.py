@@ -10,6 +10,13 @@ import requests
 import time
 from anthropic import Anthropic
 
+from catalog_strings import StringTable, parse_json_field, plan_strings, map_plan_strings
+from field_batcher import FieldBatcher
+from model_routing import ModelRouter
+from translation_engine import TranslationEngine
+from translation_memory import TranslationMemory
+from translation_prompts import NL_PRICING
+
 # Airtable configuration
 AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
@@ -23,6 +30,8 @@ if not all([AIRTABLE_TOKEN, AIRTABLE_BASE_ID, ANTHROPIC_API_KEY]):
     exit(1)
 
 anthropic = Anthropic(api_key=ANTHROPIC_API_KEY)
+engine = TranslationEngine(anthropic, memory=TranslationMemory(), language='nl',
+                           router=ModelRouter(), field='pricing_plans')
 
 API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{TRANSLATIONS_TABLE_NAME}'
 headers = {
@@ -95,55 +104,23 @@ def fetch_records_with_pricing():
     print(f"✅ Found {len(pairs)} EN/NL pairs with pricing_plans")
     return pairs
 
-def translate_pricing_plan_to_dutch(plan_json_str, companion_name):
-    """Translate pricing plan features from English to Dutch"""
-    
-    prompt = f"""Translate this pricing plan features list from English to Dutch for {companion_name}.
-
-CRITICAL RULES:
-1. Keep ALL AI industry terms in English: "AI companion", "AI girlfriend", "AI boyfriend", "AI chat", "NSFW", "chat", "roleplay", etc.
-2. Translate descriptive words naturally to Dutch
-3. Keep ✅ and ❌ symbols exactly as they are
-4. Maintain exact JSON structure
-5. Keep plan names mostly in English (Free, Premium, Pro, etc.)
-6. Keep technical terms in English (API access, tokens, credits, etc.)
-
-Examples:
-- "✅ Unlimited AI chat" → "✅ Onbeperkte AI chat"
-- "✅ NSFW content generation" → "✅ NSFW content generatie"  
-- "❌ Premium AI models" → "❌ Premium AI models"
-- "Voice conversations" → "Voice gesprekken"
-- "Character creation" → "Character creatie"
+def translate_plan_strings(todo):
+    """
+    Translate the distinct plan strings of every record in `todo` once.
 
-English pricing_plans JSON:
-{plan_json_str}
+    The same features show up in dozens of plans, so the whole catalog's
+    vocabulary goes to Claude in a few batched requests instead of one
+    request per record.
+    """
+    table = StringTable()
+    for _, plans in todo:
+        table.add_all(plan_strings(plans))
 
-Respond with ONLY the Dutch JSON, no explanations."""
-
-    try:
-        response = anthropic.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        dutch_json = response.content[0].text.strip()
-        
-        # Remove markdown code blocks if present
-        if dutch_json.startswith('```'):
-            dutch_json = dutch_json.split('\n', 1)[1]
-            dutch_json = dutch_json.rsplit('```', 1)[0].strip()
-        if dutch_json.startswith('json'):
-            dutch_json = dutch_json[4:].strip()
-        
-        # Validate JSON
-        json.loads(dutch_json)
-        
-        return dutch_json
-        
-    except Exception as e:
-        print(f"❌ Translation error: {e}")
-        return None
+    print(f"🌍 Translating {len(table.pending())} distinct strings...")
+    table.translate_batched(FieldBatcher(engine, NL_PRICING))
+    engine.report()
+    table.report('nl')
+    return table
 
 def update_nl_record(record_id, pricing_plans_nl):
     """Update NL record with translated pricing_plans"""
@@ -182,6 +159,8 @@ def main():
     skipped = 0
     errors = 0
     
+    todo = []
+    
     for i, pair in enumerate(pairs, 1):
         slug = pair['slug']
         en_record = pair['en_record']
@@ -207,37 +186,50 @@ def main():
             skipped += 1
             continue
         
-        # Translate
-        print(f"   🌍 Translating pricing_plans...")
+        plans = parse_json_field(en_pricing)
+        if plans is None:
+            print(f"   ❌ EN pricing_plans is not a JSON list")
+            errors += 1
+            continue
+        
+        print(f"   🌍 Queued for translation ({len(plans)} plans)")
+        todo.append((pair, plans))
+    
+    if todo:
+        print()
+        table = translate_plan_strings(todo)
+    
+    for pair, plans in todo:
+        en_record = pair['en_record']
+        companion_name = en_record['fields'].get('name (from companion)', ['Unknown'])[0]
         
-        dutch_pricing = translate_pricing_plan_to_dutch(en_pricing, companion_name)
+        print(f"\n📝 {companion_name} ({pair['slug']})")
         
-        if not dutch_pricing:
+        if not table.covers(plan_strings(plans)):
             print(f"   ❌ Translation failed")
             errors += 1
             continue
         
+        dutch_plans = map_plan_strings(plans, table.get)
+        dutch_pricing = json.dumps(dutch_plans, ensure_ascii=False)
+        en_pricing = en_record['fields']['pricing_plans']
         print(f"   ✅ Translated ({len(en_pricing)} → {len(dutch_pricing)} chars)")
         
         # Preview
-        try:
-            preview = json.loads(dutch_pricing)
-            if preview and len(preview) > 0:
-                first_plan = preview[0]
-                print(f"   Preview: {first_plan.get('name', 'Unknown plan')}")
-                if 'features' in first_plan and len(first_plan['features']) > 0:
-                    print(f"            {first_plan['features'][0][:60]}...")
-        except:
-            pass
+        if dutch_plans and isinstance(dutch_plans[0], dict):
+            first_plan = dutch_plans[0]
+            print(f"   Preview: {first_plan.get('name', 'Unknown plan')}")
+            if first_plan.get('features'):
+                print(f"            {str(first_plan['features'][0])[:60]}...")
         
         # Update
-        if update_nl_record(nl_record['id'], dutch_pricing):
+        if update_nl_record(pair['nl_record']['id'], dutch_pricing):
             print(f"   💾 Updated in Airtable")
             updated += 1
         else:
             errors += 1
         
-        time.sleep(1.5)  # Rate limiting
+        time.sleep(0.2)  # Rate limiting
     
     print()
     print("=" * 60)
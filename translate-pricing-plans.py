@@ -10,26 +10,15 @@ Preserves English technical terms like:
 Only translates descriptive text and features.
 """
 
-import os
 import json
-import requests
 from datetime import datetime
 
+from airtable_client import AirtableClient, AirtableError
+from catalog_strings import StringTable, parse_json_field, plan_strings, map_plan_strings
+from glossary import Glossary
+
 # Airtable configuration
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-TRANSLATIONS_TABLE_NAME = 'Companion_Translations'
-
-if not AIRTABLE_TOKEN or not AIRTABLE_BASE_ID:
-    print("❌ Error: AIRTABLE_TOKEN_CG and AIRTABLE_BASE_ID_CG must be set")
-    exit(1)
-
-# API setup
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{TRANSLATIONS_TABLE_NAME}'
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+client = AirtableClient.from_env()
 
 # Terms to NEVER translate (keep in English)
 PRESERVE_TERMS = [
@@ -122,104 +111,37 @@ def fetch_all_records():
     """Fetch all records from Companion_Translations table"""
     print("📥 Fetching records from Companion_Translations...")
 
-    records = []
-    offset = None
-
-    while True:
-        params = {}
-        if offset:
-            params['offset'] = offset
-
-        response = requests.get(API_URL, headers=headers, params=params)
-
-        if response.status_code != 200:
-            print(f"❌ Error fetching records: {response.status_code}")
-            print(response.text)
-            return None
-
-        data = response.json()
-        records.extend(data.get('records', []))
-
-        offset = data.get('offset')
-        if not offset:
-            break
+    try:
+        records = client.fetch_all_records()
+    except AirtableError as e:
+        print(f"❌ Error fetching records: {e.status_code}")
+        print(e.text)
+        return None
 
     print(f"✅ Fetched {len(records)} records")
     return records
 
-def translate_text(text, lang):
-    """Translate text while preserving English technical terms"""
-    if not text or not isinstance(text, str):
-        return text
-
-    import re
-
-    # First, check if text contains any preserved terms - if so, protect them
-    protected_text = text
-    placeholders = {}
-
-    # Sort preserve terms by length (longest first) to match longer phrases first
-    sorted_preserve_terms = sorted(PRESERVE_TERMS, key=len, reverse=True)
-
-    for i, term in enumerate(sorted_preserve_terms):
-        pattern = re.compile(re.escape(term), re.IGNORECASE)
-        matches = list(pattern.finditer(protected_text))
-        for match in reversed(matches):  # Replace from end to start to maintain positions
-            placeholder = f"__PRESERVE_{i}_{match.start()}__"
-            placeholders[placeholder] = match.group()
-            protected_text = protected_text[:match.start()] + placeholder + protected_text[match.end():]
+# Compiled once: preserve + translate terms in a single longest-first regex
+GLOSSARIES = {
+    'nl': Glossary(NL_TRANSLATIONS, preserve=PRESERVE_TERMS),
+    'pt': Glossary(PT_TRANSLATIONS, preserve=PRESERVE_TERMS),
+}
 
-    # Choose translation dictionary
-    translations = NL_TRANSLATIONS if lang == 'nl' else PT_TRANSLATIONS
+# Each distinct plan string is translated once per language (see build_string_tables)
+STRING_TABLES = {lang: StringTable(glossary.translate) for lang, glossary in GLOSSARIES.items()}
 
-    # Sort translations by length (longest first) to match longer phrases first
-    sorted_translations = sorted(translations.items(), key=lambda x: len(x[0]), reverse=True)
+def build_string_tables(records):
+    """Gather the distinct plan strings of the whole catalog and translate each once per language"""
+    for record in records:
+        fields = record.get('fields', {})
+        table = STRING_TABLES.get(fields.get('language', 'en'))
+        plans = parse_json_field(fields.get('pricing_plans'))
+        if table is not None and plans:
+            table.add_all(plan_strings(plans))
 
-    # Translate each term
-    result = protected_text
-    for english, translated in sorted_translations:
-        # Try word boundary first, but fallback to simpler matching
-        try:
-            # Use word boundary matching for better accuracy
-            pattern = re.compile(r'\b' + re.escape(english) + r'\b', re.IGNORECASE)
-
-            def replace_match(match):
-                original = match.group()
-                # Preserve original case
-                if original.isupper():
-                    return translated.upper()
-                elif len(original) > 0 and original[0].isupper():
-                    return translated.capitalize()
-                else:
-                    return translated.lower()
-
-            new_result = pattern.sub(replace_match, result)
-
-            # If word boundary didn't match anything, try simpler case-sensitive replacement
-            if new_result == result:
-                # Try exact case match
-                if english in result:
-                    result = result.replace(english, translated)
-                elif english.capitalize() in result:
-                    result = result.replace(english.capitalize(), translated.capitalize())
-                elif english.lower() in result:
-                    result = result.replace(english.lower(), translated.lower())
-            else:
-                result = new_result
-        except:
-            # Fallback to simple replacement
-            if english in result:
-                result = result.replace(english, translated)
-            elif english.capitalize() in result:
-                result = result.replace(english.capitalize(), translated.capitalize())
-            elif english.lower() in result:
-                result = result.replace(english.lower(), translated.lower())
-
-    # Restore preserved terms
-    for placeholder, original in placeholders.items():
-        result = result.replace(placeholder, original)
-
-    return result
+    for lang, table in STRING_TABLES.items():
+        table.translate_pending()
+        table.report(lang)
 
 def translate_pricing_plans(pricing_plans, lang):
     """
@@ -238,64 +160,24 @@ def translate_pricing_plans(pricing_plans, lang):
     if not pricing_plans:
         return None
 
-    # Parse if string
-    if isinstance(pricing_plans, str):
-        try:
-            plans = json.loads(pricing_plans)
-        except json.JSONDecodeError:
-            return pricing_plans
-    else:
-        plans = pricing_plans
-
-    if not isinstance(plans, list):
+    plans = parse_json_field(pricing_plans)
+    if plans is None:
         return pricing_plans
 
-    # Translate each plan
-    translated_plans = []
-
-    for plan in plans:
-        if not isinstance(plan, dict):
-            translated_plans.append(plan)
-            continue
-
-        translated_plan = {}
-
-        for key, value in plan.items():
-            if key == 'name':
-                # DON'T translate plan names
-                translated_plan[key] = value
-            elif key == 'price':
-                # DON'T translate prices
-                translated_plan[key] = value
-            elif key == 'period':
-                # Translate period (monthly, yearly, etc.)
-                translated_plan[key] = translate_text(value, lang) if isinstance(value, str) else value
-            elif key == 'features' and isinstance(value, list):
-                # Translate features list
-                translated_plan[key] = [
-                    translate_text(feature, lang) if isinstance(feature, str) else feature
-                    for feature in value
-                ]
-            elif key == 'description':
-                # Translate description
-                translated_plan[key] = translate_text(value, lang) if isinstance(value, str) else value
-            else:
-                # Translate other text fields
-                translated_plan[key] = translate_text(value, lang) if isinstance(value, str) else value
-
-        translated_plans.append(translated_plan)
-
-    return json.dumps(translated_plans, ensure_ascii=False)
+    # Names and prices stay as they are; every other string comes from the
+    # language's string table
+    table = STRING_TABLES['nl'] if lang == 'nl' else STRING_TABLES['pt']
+    return json.dumps(map_plan_strings(plans, table.get), ensure_ascii=False)
 
 def update_record(record_id, fields):
     """Update a single record in Airtable"""
-    url = f'{API_URL}/{record_id}'
+    url = f'{client.api_url}/{record_id}'
 
     data = {
         'fields': fields
     }
 
-    response = requests.patch(url, headers=headers, json=data)
+    response = client.request('PATCH', url, json=data)
 
     if response.status_code != 200:
         print(f"❌ Error updating record {record_id}: {response.status_code}")
@@ -314,6 +196,9 @@ def main():
     if not records:
         return
 
+    print()
+    build_string_tables(records)
+
     print()
     print("🔄 Processing records...")
 
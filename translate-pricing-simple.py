@@ -3,26 +3,14 @@
 Simplified pricing_plans translation script - uses straightforward string replacement
 """
 
-import os
 import json
-import requests
 from datetime import datetime
 
+from airtable_client import AirtableClient, AirtableError
+from glossary import Glossary
+
 # Airtable configuration
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-TRANSLATIONS_TABLE_NAME = 'Companion_Translations'
-
-if not AIRTABLE_TOKEN or not AIRTABLE_BASE_ID:
-    print("❌ Error: AIRTABLE_TOKEN_CG and AIRTABLE_BASE_ID_CG must be set")
-    exit(1)
-
-# API setup
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{TRANSLATIONS_TABLE_NAME}'
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+client = AirtableClient.from_env()
 
 # Dutch translations - sorted by length (longest first)
 NL_TRANSLATIONS = {
@@ -101,43 +89,25 @@ PT_TRANSLATIONS = {
 def fetch_all_records():
     """Fetch all records"""
     print("📥 Fetching records from Companion_Translations...")
-    records = []
-    offset = None
-
-    while True:
-        params = {}
-        if offset:
-            params['offset'] = offset
-
-        response = requests.get(API_URL, headers=headers, params=params)
-
-        if response.status_code != 200:
-            print(f"❌ Error: {response.status_code}")
-            return None
-
-        data = response.json()
-        records.extend(data.get('records', []))
-
-        offset = data.get('offset')
-        if not offset:
-            break
+    try:
+        records = client.fetch_all_records()
+    except AirtableError as e:
+        print(f"❌ Error: {e.status_code}")
+        return None
 
     print(f"✅ Fetched {len(records)} records")
     return records
 
+# Case-sensitive substring glossaries, compiled once (longest term first)
+GLOSSARIES = {
+    'nl': Glossary(NL_TRANSLATIONS, ignore_case=False, word_boundary=False),
+    'pt': Glossary(PT_TRANSLATIONS, ignore_case=False, word_boundary=False),
+}
+
 def simple_translate(text, lang):
     """Simple string replacement translation"""
-    if not text or not isinstance(text, str):
-        return text
-
-    translations = NL_TRANSLATIONS if lang == 'nl' else PT_TRANSLATIONS
-    result = text
-
-    # Apply translations (already sorted by length)
-    for english, translated in translations.items():
-        result = result.replace(english, translated)
-
-    return result
+    glossary = GLOSSARIES['nl'] if lang == 'nl' else GLOSSARIES['pt']
+    return glossary.translate(text)
 
 def translate_pricing_plans(pricing_json, lang):
     """Translate pricing_plans JSON"""
@@ -176,19 +146,6 @@ def translate_pricing_plans(pricing_json, lang):
 
     return json.dumps(plans, ensure_ascii=False)
 
-def update_record(record_id, fields):
-    """Update record in Airtable"""
-    url = f'{API_URL}/{record_id}'
-    data = {'fields': fields}
-    response = requests.patch(url, headers=headers, json=data)
-
-    if response.status_code != 200:
-        print(f"❌ Error: {response.status_code}")
-        print(response.text)
-        return False
-
-    return True
-
 def main():
     print("🚀 Starting simplified pricing_plans translation...")
     print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
@@ -201,6 +158,7 @@ def main():
 
     updated_count = 0
     skipped_count = 0
+    writer = client.batch_writer()
 
     for record in records:
         record_id = record['id']
@@ -245,11 +203,14 @@ def main():
         print(f"   Before: {original_str[:80]}...")
         print(f"   After:  {translated[:80]}...")
 
-        if update_record(record_id, {'pricing_plans': translated}):
-            print(f"   ✅ Updated successfully\n")
-            updated_count += 1
-        else:
-            print(f"   ❌ Update failed\n")
+        writer.update(record_id, {'pricing_plans': translated})
+        print(f"   ✅ Queued for update\n")
+        updated_count += 1
+
+    failed = writer.close()
+    updated_count -= len(failed)
+    if failed:
+        print(f"❌ {len(failed)} updates failed: {', '.join(failed)}")
 
     print("\n" + "=" * 50)
     print(f"✅ Script completed!")
@@ -1,109 +1,42 @@
-"""Clean batch translation of NL my_verdict fields - removes instruction text"""
-import os, requests, time, json, re
+"""Clean batch translation of NL my_verdict fields - removes instruction text
+
+Work comes from the change journal (EN verdicts changed since their last NL
+sync) and runs through a durable job queue (job_queue.py): every chunk is
+checkpointed as soon as it is translated, so an interrupted run picks up
+where it stopped when started again, and several copies of this script can
+drain the queue side by side.
+
+A verdict the journal has never seen is not retranslated when its NL record
+already has a finished translation (change_journal.looks_translated(): at
+least 100 characters, 80% of the EN length, and not the EN text itself).
+That text is adopted as the synced version, so the first run against an
+empty journal doesn't overwrite the whole catalog. Placeholder, cut-off and
+copied-from-EN verdicts are still translated; after that, only EN edits are.
+"""
+import os
+import time
 from anthropic import Anthropic
+from airtable_client import AirtableClient
+from airtable_query import lookup_by_slug
+from change_journal import ChangeJournal, looks_translated
+from job_queue import JobQueue
+from model_routing import ModelRouter
+from text_chunker import chunk_markdown
+from translation_engine import TranslationEngine
+from translation_memory import TranslationMemory
 
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Companion_Translations'
-headers = {'Authorization': f'Bearer {AIRTABLE_TOKEN}', 'Content-Type': 'application/json'}
+client = AirtableClient.from_env()
 
 anthropic = Anthropic(api_key=ANTHROPIC_API_KEY)
 
-# Load list of records to translate
-with open('/tmp/nl_verdicts_to_translate.json') as f:
-    to_translate = json.load(f)
-
-def clean_translation(text):
-    """Remove Claude's instruction/meta text from translation"""
-    
-    # Remove common instruction phrases
-    patterns_to_remove = [
-        r"Here's the Dutch translation.*?:\s*\n*",
-        r"Here is the Dutch translation.*?:\s*\n*",
-        r"Hier is de Nederlandse vertaling.*?:\s*\n*",
-        r"\[Note:.*?\]",
-        r"\[Continue.*?\]",
-        r"\[Would you like.*?\]",
-        r"\[Bericht me.*?\]",
-        r"Note: Would you like.*",
-        r"Would you like me to continue.*",
-        r"I can do it in parts if you prefer.*",
-        r"Due to length limitations.*",
-        r"I've shown.*example.*",
-        r"Continued translation follows.*",
-    ]
-    
-    cleaned = text
-    for pattern in patterns_to_remove:
-        cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE | re.DOTALL)
-    
-    # Remove multiple consecutive newlines
-    cleaned = re.sub(r'\n{3,}', '\n\n', cleaned)
-    
-    # Trim whitespace
-    cleaned = cleaned.strip()
-    
-    return cleaned
-
-print(f"🚀 Starting CLEAN batch translation of {len(to_translate)} NL my_verdict fields...")
-print("=" * 70)
-
-updated = 0
-skipped = 0
-errors = 0
+journal = ChangeJournal()
+queue = JobQueue('verdicts-nl-clean')
 
-for i, (slug, name, nl_record_id) in enumerate(to_translate, 1):
-    print(f"\n[{i}/{len(to_translate)}] 📝 {name} ({slug})")
-    
-    # Get EN verdict
-    try:
-        response_en = requests.get(API_URL, headers=headers, params={
-            'filterByFormula': f'AND({{language}}="en", {{slug (from companion)}}="{slug}")',
-            'maxRecords': 1
-        })
-        en_data = response_en.json()
-        
-        if not en_data.get('records'):
-            print(f"   ⏭️  No EN record found - skipping")
-            skipped += 1
-            continue
-        
-        english_verdict = en_data['records'][0]['fields'].get('my_verdict', '')
-        
-        if not english_verdict or len(english_verdict) < 100:
-            print(f"   ⏭️  EN verdict too short - skipping")
-            skipped += 1
-            continue
-        
-        print(f"   📊 EN: {len(english_verdict)} chars")
-        
-        # Split into chunks
-        chunks = []
-        if len(english_verdict) <= 10000:
-            chunks = [english_verdict]
-        else:
-            paragraphs = english_verdict.split('\n\n')
-            current = ""
-            for para in paragraphs:
-                if len(current) + len(para) > 10000:
-                    if current: chunks.append(current)
-                    current = para
-                else:
-                    current += ("\n\n" if current else "") + para
-            if current: chunks.append(current)
-        
-        print(f"   🔄 Translating {len(chunks)} chunk(s)...")
-        
-        # Translate each chunk
-        translated_chunks = []
-        
-        for chunk_i, chunk in enumerate(chunks, 1):
-            print(f"      [{chunk_i}/{len(chunks)}] {len(chunk)} chars... ", end="", flush=True)
-            
-            # More explicit prompt to avoid meta-commentary
-            prompt = f"""Vertaal deze Engelse tekst naar Nederlands. Gebruik ALLEEN de vertaling in je antwoord, GEEN uitleg, GEEN notities, GEEN vragen.
+def build_prompt(chunk):
+    """More explicit prompt to avoid meta-commentary"""
+    return f"""Vertaal deze Engelse tekst naar Nederlands. Gebruik ALLEEN de vertaling in je antwoord, GEEN uitleg, GEEN notities, GEEN vragen.
 
 REGELS:
 - Behoud Engelse AI-termen: AI companion, AI girlfriend, NSFW, roleplay, chat
@@ -118,69 +51,132 @@ Tekst om te vertalen:
 
 Nederlandse vertaling:"""
 
-            try:
-                response = anthropic.messages.create(
-                    model="claude-3-5-sonnet-20241022",
-                    max_tokens=8000,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                
-                dutch_chunk = response.content[0].text.strip()
-                
-                # Clean up any instruction text
-                dutch_chunk = clean_translation(dutch_chunk)
-                
-                translated_chunks.append(dutch_chunk)
-                print(f"✅ {len(dutch_chunk)} chars")
-                
-                time.sleep(2)  # Rate limiting
-                
-            except Exception as e:
-                print(f"❌ {str(e)[:50]}")
-                errors += 1
-                break
-        
-        if len(translated_chunks) != len(chunks):
-            print(f"   ❌ Incomplete - skipping")
-            errors += 1
-            continue
-        
-        # Combine chunks
-        full_translation = '\n\n'.join(translated_chunks)
-        
-        # Final cleanup
-        full_translation = clean_translation(full_translation)
-        
-        print(f"   ✅ NL: {len(full_translation)} chars")
-        
-        # Verify translation looks good (basic sanity check)
-        if len(full_translation) < len(english_verdict) * 0.3:
-            print(f"   ⚠️  WARNING: Translation seems too short, skipping update")
-            errors += 1
-            continue
-        
-        # Update Airtable
-        url = f'{API_URL}/{nl_record_id}'
-        update_response = requests.patch(url, headers=headers, json={
-            'fields': {'my_verdict': full_translation}
-        })
-        
-        if update_response.status_code == 200:
-            print(f"   💾 Updated")
-            updated += 1
+# Instruction text in every chunk is scrubbed by the engine (meta_scrubber.py)
+engine = TranslationEngine(anthropic, memory=TranslationMemory(), language='nl', router=ModelRouter())
+ruleset = engine.ruleset_for(build_prompt)
+
+started = time.time()
+print("🚀 Starting CLEAN batch translation of NL my_verdict fields...")
+print("=" * 70)
+
+# Find NL records whose EN verdict changed since the last NL sync
+print("📥 Fetching EN verdicts...")
+en_records = client.fetch_all_records(filter_formula="{language} = 'en'", fields=['slug', 'name', 'my_verdict'])
+work = journal.pending(en_records, 'nl', ['my_verdict'])
+
+# Only the NL siblings of changed verdicts, in a few OR() queries
+slugs = [en_record['fields'].get('slug') for en_record, _ in work]
+nl_records = lookup_by_slug(client, [(slug, 'nl') for slug in slugs if slug], fields=['my_verdict'])
+print(f"   {len(work)} EN verdicts changed since the last NL sync ({client.request_count} requests)")
+
+updated = 0
+skipped = 0
+adopted = 0
+errors = 0
+en_by_job = {}
+synced = journal.synced_fingerprints('nl')
+
+for i, (en_record, _) in enumerate(work, 1):
+    slug = en_record['fields'].get('slug', 'unknown')
+    name = en_record['fields'].get('name', 'Unknown')
+    print(f"\n[{i}/{len(work)}] 📝 {name} ({slug})")
+
+    nl_record = nl_records.get((slug, 'nl'))
+    if not nl_record:
+        print(f"   ⏭️  No NL record found - skipping")
+        skipped += 1
+        continue
+
+    if ((en_record['id'], 'my_verdict') not in synced and
+            looks_translated(en_record['fields'].get('my_verdict'), nl_record['fields'].get('my_verdict'))):
+        # Never journaled, but NL already has a full verdict: it was translated
+        # before the journal existed, so adopt it as the synced version
+        print(f"   📌 Already translated - adopted as synced")
+        journal.mark_synced(en_record, 'nl', ['my_verdict'])
+        adopted += 1
+        continue
+
+    english_verdict = en_record['fields'].get('my_verdict', '')
+
+    if not english_verdict or len(english_verdict) < 100:
+        print(f"   ⏭️  EN verdict too short - skipping")
+        skipped += 1
+        continue
+
+    print(f"   📊 EN: {len(english_verdict)} chars")
+
+    # Queue it; an unchanged job keeps the chunks translated by earlier runs
+    chunks = chunk_markdown(english_verdict, language='nl')
+    status = queue.enqueue(nl_record['id'], 'my_verdict', 'nl', english_verdict, chunks,
+                           ruleset=ruleset, meta={'slug': slug, 'name': name})
+    print(f"   🗂️  {len(chunks)} chunk(s), job {status}")
+
+    if status == 'written':
+        # Written by an earlier run that stopped before updating the journal
+        journal.mark_synced(en_record, 'nl', ['my_verdict'])
+        updated += 1
+        continue
+
+    en_by_job[queue.job_id(nl_record['id'], 'my_verdict', 'nl')] = en_record
+
+print()
+queue.report()
+print(f"\n🔄 Translating queued chunks...")
+translated = queue.drain(engine, build_prompt)
+print(f"   ✅ {translated} chunks translated this run")
+engine.report()
+
+# Write every fully translated job, including ones finished by earlier or parallel runs
+writer = client.batch_writer()
+ready = []
+
+for job in queue.take_ready():
+    en_record = en_by_job.get(job['job_id'])
+    full_translation = job['translation']
+    name = job['meta'].get('name', job['record_id'])
+
+    # Verify translation looks good (basic sanity check)
+    english_verdict = en_record['fields'].get('my_verdict', '') if en_record else ''
+    if english_verdict and len(full_translation) < len(english_verdict) * 0.3:
+        # Forget the stored chunks, or the next drain serves the same output from memory
+        for chunk in queue.sources(job['job_id']):
+            engine.forget(chunk, ruleset, job['field'])
+        status = queue.reject(job['job_id'])
+        if status == 'failed':
+            # Counted with this run's other failed jobs below
+            print(f"   ❌ {name}: translation still too short, job failed (job_queue.py retry to try again)")
         else:
-            print(f"   ❌ Update failed: {update_response.status_code}")
+            print(f"   ⚠️  {name}: translation seems too short, queued again")
             errors += 1
-        
-    except Exception as e:
-        print(f"   ❌ Error: {str(e)[:80]}")
+        continue
+
+    print(f"   ✅ {name} NL: {len(full_translation)} chars")
+    writer.update(job['record_id'], {'my_verdict': full_translation})
+    ready.append((job, en_record))
+
+failed = set(writer.close())
+
+for job, en_record in ready:
+    if job['record_id'] in failed:
+        # Keep the translation; the next run only has to write it
+        queue.release(job['job_id'])
         errors += 1
+        continue
+
+    queue.mark_written(job['job_id'])
+    if en_record:
+        journal.mark_synced(en_record, 'nl', ['my_verdict'])
+    updated += 1
+
+# Jobs parked as failed by earlier runs stay in the queue; count this run's only
+errors += queue.failed_since(started)
 
 print("\n" + "=" * 70)
 print(f"✅ Clean translation completed!")
 print(f"   Updated: {updated}")
 print(f"   Skipped: {skipped}")
+print(f"   Adopted: {adopted}")
 print(f"   Errors:  {errors}")
-print(f"   Total:   {len(to_translate)}")
+print(f"   Total:   {len(work)}")
 print("=" * 70)
-
+queue.report()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Catalog-wide anomaly audit of EN/translated field pairs, without API calls.
+
+check-nl-verdicts.py guessed which translations still needed work from a raw
+length threshold, one record at a time. TranslationAudit loads every EN/target
+pair of a snapshot (the local Airtable mirror) into arrays, measures each
+pair, and flags the ones that are outliers against the catalog's own
+distribution for that language and field. It measures:
+
+- length ratio (target/EN characters)
+- paragraph and heading count mismatches
+- numbers and prices that differ (decimal separators ignored)
+- retention of the AI terms every prompt keeps in English
+
+Each text is scanned once with compiled patterns; numbers and prices become
+hashed count vectors, so every comparison and score is a NumPy array
+operation over the whole catalog. A metric is an outlier when its robust
+z-score (median/MAD within its language and field) passes Z_THRESHOLD.
+Missing and untranslated (identical to EN) targets are always flagged.
+
+Usage:
+    python3 translation_audit.py                      # all languages and fields in the mirror
+    python3 translation_audit.py nl pt --field my_verdict --top 50
+
+    from translation_audit import TranslationAudit, record_pairs
+
+    audit = TranslationAudit(record_pairs(mirror.by_slug(), ['nl'], ['my_verdict']))
+    for row in audit.flagged():
+        print(row['key'], row['reasons'])
+"""
+
+import re
+import sys
+import json
+import zlib
+
+import numpy as np
+
+from airtable_mirror import AirtableMirror
+from change_journal import TRANSLATABLE_FIELDS
+
+# Terms every translation prompt keeps in English
+KEEP_ENGLISH = ['AI companion', 'AI girlfriend', 'AI boyfriend', 'AI chatbot', 'AI character',
+                'NSFW', 'SFW', 'roleplay']
+
+# Robust z-score above which a metric counts as an outlier
+Z_THRESHOLD = 3.5
+# Language/field groups smaller than this are scored against their whole language
+MIN_GROUP = 8
+# Hash buckets for the number and price count vectors
+BUCKETS = 64
+# Shorter identical texts (names, "NSFW") are legitimately left as they are
+MIN_UNTRANSLATED_CHARS = 40
+
+HEADING = re.compile(r'^(?:#{1,6}\s|\*\*[^*\n]+\*\*:?[ \t]*$)', re.MULTILINE)
+NUMBER = re.compile(r'\d+(?:[.,]\d+)*')
+# A number is a price when a currency sits right before or after it
+CURRENCY_BEFORE = re.compile(r'[$€£]\s?$')
+CURRENCY_AFTER = re.compile(r'\s?(?:[$€£]|USD|EUR)')
+# Matched against lowercased text: much faster than IGNORECASE
+TERM = re.compile(r'\b(' + '|'.join(re.escape(term.lower()) for term in KEEP_ENGLISH) + r')\b')
+TERM_INDEX = {term.lower(): index for index, term in enumerate(KEEP_ENGLISH)}
+
+METRICS = ['length', 'paragraphs', 'headings', 'numbers', 'prices', 'glossary']
+
+
+def field_text(value):
+    """A field value as text; JSON fields (pricing_plans, features) are compared as their JSON"""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def record_pairs(grouped, languages=None, fields=TRANSLATABLE_FIELDS):
+    """
+    (key, language, field, en_text, target_text) for every EN field that has
+    content, from {key: {language: record}} (AirtableMirror.by_slug() shape)
+    """
+    for key, by_language in grouped.items():
+        en_record = by_language.get('en')
+        if not en_record:
+            continue
+        for language, record in by_language.items():
+            if language == 'en' or (languages and language not in languages):
+                continue
+            for field in fields:
+                source = field_text(en_record['fields'].get(field))
+                if source.strip():
+                    yield key, language, field, source, field_text(record['fields'].get(field))
+
+
+def normalized_number(text):
+    """Digits only, so 9.99 / 9,99 and 1,000 / 1.000 compare equal"""
+    return text.replace('.', '').replace(',', '')
+
+
+def numbers_and_prices(text):
+    """Normalized numbers in `text`, and the ones among them that are prices"""
+    numbers = []
+    prices = []
+    for match in NUMBER.finditer(text):
+        number = normalized_number(match.group())
+        numbers.append(number)
+        start, end = match.span()
+        if CURRENCY_BEFORE.search(text, max(start - 2, 0), start) or CURRENCY_AFTER.match(text, end):
+            prices.append(number)
+    return numbers, prices
+
+
+def token_bags(token_lists):
+    """Hashed count vectors, one row per text"""
+    bags = np.zeros((len(token_lists), BUCKETS))
+    rows = [row for row, tokens in enumerate(token_lists) for _ in tokens]
+    buckets = [zlib.crc32(token.encode('utf-8')) % BUCKETS for tokens in token_lists for token in tokens]
+    np.add.at(bags, (np.array(rows, dtype=int), np.array(buckets, dtype=int)), 1)
+    return bags
+
+
+def text_features(texts):
+    """
+    Per-text counts as arrays: characters, paragraphs, headings, number/price
+    bags, term counts. Each distinct text is scanned once (an EN source is
+    shared by every language it was translated into).
+    """
+    distinct = list(dict.fromkeys(texts))
+    index = {text: row for row, text in enumerate(distinct)}
+    rows = np.array([index[text] for text in texts], dtype=int)
+
+    terms = np.zeros((len(distinct), len(KEEP_ENGLISH)))
+    numbers = []
+    prices = []
+    for row, text in enumerate(distinct):
+        for term in TERM.findall(text.lower()):
+            terms[row, TERM_INDEX[term]] += 1
+        text_numbers, text_prices = numbers_and_prices(text)
+        numbers.append(text_numbers)
+        prices.append(text_prices)
+
+    features = {
+        'chars': np.array([len(text.strip()) for text in distinct], dtype=float),
+        'paragraphs': np.array([sum(1 for para in text.split('\n\n') if para.strip()) for text in distinct],
+                               dtype=float),
+        'headings': np.array([len(HEADING.findall(text)) for text in distinct], dtype=float),
+        'numbers': token_bags(numbers),
+        'prices': token_bags(prices),
+        'terms': terms,
+    }
+    return {name: values[rows] for name, values in features.items()}
+
+
+def robust_z(values, groups):
+    """
+    (value - group median) / group spread, where the spread is the scaled
+    MAD, or the scaled mean absolute deviation when most of the group sits
+    exactly on the median
+    """
+    z = np.zeros(len(values))
+    for group in np.unique(groups):
+        mask = groups == group
+        deviation = values[mask] - np.median(values[mask])
+        spread = 1.4826 * np.median(np.abs(deviation))
+        if spread == 0:
+            spread = 1.2533 * np.mean(np.abs(deviation))
+        if spread > 0:
+            z[mask] = deviation / spread
+    return z
+
+
+class TranslationAudit:
+    """Metrics, outlier scores and flags for a list of (key, language, field, en_text, target_text)"""
+
+    def __init__(self, pairs):
+        pairs = list(pairs)
+        self.keys = [pair[0] for pair in pairs]
+        self.languages = np.array([pair[1] for pair in pairs], dtype=object)
+        self.fields = np.array([pair[2] for pair in pairs], dtype=object)
+        en_texts = [pair[3] for pair in pairs]
+        target_texts = [pair[4] for pair in pairs]
+
+        en = text_features(en_texts)
+        target = text_features(target_texts)
+        self.en = en
+        self.target = target
+
+        self.missing = target['chars'] == 0
+        self.untranslated = np.array([
+            source.strip() == translated.strip() for source, translated in zip(en_texts, target_texts)
+        ], dtype=bool) & (en['chars'] >= MIN_UNTRANSLATED_CHARS)
+
+        self.length_ratio = target['chars'] / np.maximum(en['chars'], 1)
+        self.paragraph_delta = target['paragraphs'] - en['paragraphs']
+        self.heading_delta = target['headings'] - en['headings']
+        en_numbers = en['numbers'].sum(axis=1)
+        self.number_distance = np.abs(en['numbers'] - target['numbers']).sum(axis=1) / np.maximum(en_numbers, 1)
+        self.price_distance = np.abs(en['prices'] - target['prices']).sum(axis=1)
+        en_terms = en['terms'].sum(axis=1)
+        kept = np.minimum(en['terms'], target['terms']).sum(axis=1)
+        self.glossary_retention = np.where(en_terms > 0, kept / np.maximum(en_terms, 1), 1.0)
+
+        self.groups = self.score_groups()
+        # Missing and untranslated targets are flagged on their own; keep
+        # them out of the distribution the others are measured against
+        present = ~(self.missing | self.untranslated)
+        groups = np.where(present, self.groups, '-')
+
+        log_ratio = np.log(np.maximum(self.length_ratio, 1e-3))
+        # One column per METRICS entry; only the harmful direction counts
+        # for numbers, prices and glossary terms
+        self.z = np.column_stack([
+            np.abs(robust_z(log_ratio, groups)),
+            np.abs(robust_z(self.paragraph_delta, groups)),
+            np.abs(robust_z(self.heading_delta, groups)),
+            np.maximum(robust_z(self.number_distance, groups), 0),
+            np.maximum(robust_z(self.price_distance, groups), 0),
+            np.maximum(-robust_z(self.glossary_retention, groups), 0),
+        ]) * present[:, None]
+
+        self.score = self.z.max(axis=1) if len(pairs) else np.zeros(0)
+        self.score[self.missing | self.untranslated] = np.inf
+        self.is_flagged = self.score > Z_THRESHOLD
+
+    def score_groups(self):
+        """language/field per pair, or just the language where that group is too small to score"""
+        groups = np.array([f'{language}/{field}' for language, field in zip(self.languages, self.fields)],
+                          dtype=object)
+        names, counts = np.unique(groups, return_counts=True)
+        small = set(names[counts < MIN_GROUP])
+        if small:
+            groups = np.array([f'{language}/*' if group in small else group
+                               for group, language in zip(groups, self.languages)], dtype=object)
+        return groups
+
+    def reasons(self, index):
+        if self.missing[index]:
+            return ['missing']
+        if self.untranslated[index]:
+            return ['untranslated']
+
+        en, target = self.en, self.target
+        details = {
+            'length': f'length ×{self.length_ratio[index]:.2f}',
+            'paragraphs': f"paragraphs {en['paragraphs'][index]:.0f}→{target['paragraphs'][index]:.0f}",
+            'headings': f"headings {en['headings'][index]:.0f}→{target['headings'][index]:.0f}",
+            'numbers': f'numbers differ ({self.number_distance[index]:.0%})',
+            'prices': f'prices differ ({self.price_distance[index]:.0f})',
+            'glossary': f'glossary terms kept {self.glossary_retention[index]:.0%}',
+        }
+        return [details[metric] for metric, z in zip(METRICS, self.z[index]) if z > Z_THRESHOLD]
+
+    def flagged(self):
+        """Flagged pairs, worst first: [{'key', 'language', 'field', 'score', 'reasons'}]"""
+        order = np.argsort(-self.score, kind='stable')
+        return [{'key': self.keys[index], 'language': self.languages[index], 'field': self.fields[index],
+                 'score': float(self.score[index]), 'reasons': self.reasons(index)}
+                for index in order if self.is_flagged[index]]
+
+    def summary(self):
+        """{(language, field): (pairs, flagged, median length ratio)}"""
+        rows = {}
+        for language, field in sorted(set(zip(self.languages, self.fields))):
+            mask = (self.languages == language) & (self.fields == field)
+            present = mask & ~self.missing
+            median = float(np.median(self.length_ratio[present])) if present.any() else 0.0
+            rows[(language, field)] = (int(mask.sum()), int((mask & self.is_flagged).sum()), median)
+        return rows
+
+    def report(self, top=25):
+        print(f"🔎 Audited {len(self.keys):,} EN/translation pairs")
+        for (language, field), (pairs, flagged, median) in self.summary().items():
+            print(f"   {language.upper()} {field:16} {pairs:6,} pairs  {flagged:5,} flagged  "
+                  f"median length ×{median:.2f}")
+
+        flagged = self.flagged()
+        print(f"\n⚠️  {len(flagged):,} pairs flagged (top {min(top, len(flagged))}):")
+        for row in flagged[:top]:
+            score = 'inf' if row['score'] == np.inf else f"{row['score']:.1f}"
+            print(f"   {score:>6}  {row['language'].upper()} {row['field']:16} {row['key']:30} "
+                  f"{', '.join(row['reasons'])}")
+
+
+def main():
+    args = sys.argv[1:]
+    fields = list(TRANSLATABLE_FIELDS)
+    top = 25
+    languages = []
+
+    while args:
+        arg = args.pop(0)
+        if arg in ('--field', '--top') and not args:
+            print("Usage: python3 translation_audit.py [language ...] [--field name] [--top n]")
+            exit(1)
+        if arg == '--field':
+            fields = [args.pop(0)]
+        elif arg == '--top':
+            value = args.pop(0)
+            try:
+                top = int(value)
+            except ValueError:
+                top = 0
+            if top < 1:
+                print(f"❌ Invalid --top value: {value} (expected a positive number)")
+                exit(1)
+        else:
+            languages.append(arg)
+
+    mirror = AirtableMirror()
+    if mirror.synced_at() is None:
+        print("❌ The mirror is empty; run: python3 airtable_mirror.py sync")
+        exit(1)
+
+    audit = TranslationAudit(record_pairs(mirror.by_slug(), languages or None, fields))
+    audit.report(top)
+
+
+if __name__ == '__main__':
+    main()
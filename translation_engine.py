@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Concurrent Claude translation engine for the Companion_Translations scripts.
+
+Chunks are sent from a thread pool instead of one after another. Every request
+first takes a slot from two per-minute budgets, one for requests and one for
+tokens, so a full-catalog run stays under the account's Anthropic limits
+instead of relying on fixed sleeps. Chunks of one record may finish in any
+order, but are always handed back in source order.
+
+With a TranslationMemory attached, chunks (and the paragraphs inside them)
+that were translated before under the same language, ruleset and model are
+served from disk; only the new or edited paragraphs are sent to Claude.
+
+Prompts built with translation_prompts.TranslationPrompt are sent as a
+cached system block (the rules) plus a short user message (the chunk), so
+the rules are only paid for in full once per run.
+
+Each request's max_tokens is sized from its chunk (text_chunker.max_tokens_for),
+with the engine's max_tokens as the ceiling.
+
+With a ModelRouter (model_routing.py), each chunk's model and max_tokens
+ceiling come from its field type and length instead of the single `model`:
+short catalog fields go to the fast tier, long reviews to the strong one.
+The translation memory is keyed by the routed model.
+
+Every translated chunk, and everything served from the translation memory,
+goes through meta_scrubber.scrub() before it is handed back, so Claude's
+"Here's the translation:" preambles and "[Note: ...]" trailers never reach
+Airtable.
+
+A chunk whose translation stops early (max_tokens, "Would you like me to
+continue?", or far too short for its source) is completed by translating
+only the untranslated source tail and appending it (truncation.py), instead
+of retranslating the whole chunk later.
+
+Usage:
+    from translation_engine import TranslationEngine
+
+    engine = TranslationEngine(anthropic)
+    results = engine.translate_many(
+        [(slug, chunk_markdown(en_verdict, 'nl'), make_prompt) for slug, en_verdict in todo],
+        on_done=lambda slug, chunks: writer.update(ids[slug], {'my_verdict': '\\n\\n'.join(chunks)})
+    )
+    engine.report()
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from meta_scrubber import scrub
+from model_routing import ModelTier
+from text_chunker import max_tokens_for
+from translation_memory import prompt_ruleset
+from truncation import truncation_reason, split_at_truncation
+
+DEFAULT_MODEL = 'claude-3-5-sonnet-20241022'
+DEFAULT_MAX_TOKENS = 8000
+REQUESTS_PER_MINUTE = 50
+TOKENS_PER_MINUTE = 80000
+MAX_WORKERS = 4
+# Tail-only follow-up requests for one truncated chunk before giving up
+MAX_CONTINUATIONS = 3
+
+
+def split_paragraphs(text):
+    return [para for para in text.split('\n\n') if para.strip()]
+
+
+def estimate_tokens(text):
+    """Rough token count for budgeting: ~4 characters per token"""
+    return len(text) // 4 + 1
+
+
+class MinuteBudget:
+    """Sliding 60-second window that blocks callers once `limit` units are used"""
+
+    def __init__(self, limit, window=60.0):
+        self.limit = limit
+        self.window = window
+        self.used = deque()
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def _expire(self, now):
+        while self.used and now - self.used[0][0] >= self.window:
+            self.total -= self.used.popleft()[1]
+
+    def acquire(self, amount):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._expire(now)
+                # A single request bigger than the whole budget still goes
+                # through once the window is empty
+                if self.total + amount <= self.limit or not self.used:
+                    self.used.append((now, amount))
+                    self.total += amount
+                    return
+                delay = self.window - (now - self.used[0][0])
+            time.sleep(max(delay, 0.05))
+
+    def adjust(self, amount):
+        """Correct an earlier estimate once the real usage is known"""
+        with self.lock:
+            self.used.append((time.monotonic(), amount))
+            self.total += amount
+
+
+class TranslationEngine:
+    """Thread-pool translator with request and token budgets"""
+
+    def __init__(self, anthropic, model=DEFAULT_MODEL, max_tokens=DEFAULT_MAX_TOKENS,
+                 requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE,
+                 max_workers=MAX_WORKERS, postprocess=None,
+                 memory=None, language=None, ruleset=None, router=None, field=None):
+        self.anthropic = anthropic
+        self.model = model
+        self.max_tokens = max_tokens
+        self.default_tier = ModelTier('default', model, max_tokens)
+        self.router = router
+        # Field type of the text being translated, for routing
+        self.field = field
+        self.max_workers = max_workers
+        self.postprocess = postprocess
+        if memory is not None and not language:
+            raise ValueError("a translation memory needs the target language")
+        self.memory = memory
+        self.language = language
+        self.ruleset = ruleset
+        self.request_budget = MinuteBudget(requests_per_minute)
+        self.token_budget = MinuteBudget(tokens_per_minute)
+
+        self.stats_lock = threading.Lock()
+        self.chunks_done = 0
+        self.chunks_failed = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_write_tokens = 0
+        self.cache_read_tokens = 0
+        self.continuations = 0
+        self.chunks_truncated = 0
+        self.started = None
+        self.elapsed = None
+
+    def reset_stats(self):
+        """Zero the counters and start the clock for a new run"""
+        self.chunks_done = self.chunks_failed = 0
+        self.input_tokens = self.output_tokens = 0
+        self.cache_write_tokens = self.cache_read_tokens = 0
+        self.continuations = self.chunks_truncated = 0
+        self.started = time.monotonic()
+        self.elapsed = None
+        if self.router:
+            self.router.reset()
+
+    def route(self, text, field=None):
+        """Model tier for translating `text` of type `field` (default: the engine's field)"""
+        if self.router is None:
+            return self.default_tier
+        return self.router.choose(text, field or self.field)
+
+    def create(self, prompt, system=None, max_tokens=None, tier=None):
+        """Send one prompt (and optional system blocks); (raw response text, stop_reason), or (None, None) on failure"""
+        tier = tier or self.default_tier
+        # Output is roughly as long as the chunk being translated
+        estimate = estimate_tokens(prompt) * 2
+        if system:
+            estimate += sum(estimate_tokens(block['text']) for block in system)
+        self.request_budget.acquire(1)
+        self.token_budget.acquire(estimate)
+
+        ceiling = min(tier.max_tokens, self.max_tokens)
+        request = {
+            'model': tier.model,
+            'max_tokens': min(max_tokens or ceiling, ceiling),
+            'messages': [{"role": "user", "content": prompt}],
+        }
+        if system:
+            request['system'] = system
+
+        try:
+            started = time.monotonic()
+            response = self.anthropic.messages.create(**request)
+        except Exception as e:
+            print(f"      ❌ Translation error: {str(e)}")
+            with self.stats_lock:
+                self.chunks_failed += 1
+            return None, None
+
+        usage = response.usage
+        if self.router:
+            self.router.log_request(tier, time.monotonic() - started, usage.output_tokens)
+        cache_write = getattr(usage, 'cache_creation_input_tokens', None) or 0
+        cache_read = getattr(usage, 'cache_read_input_tokens', None) or 0
+        self.token_budget.adjust(usage.input_tokens + cache_write + usage.output_tokens - estimate)
+
+        with self.stats_lock:
+            self.chunks_done += 1
+            self.input_tokens += usage.input_tokens
+            self.output_tokens += usage.output_tokens
+            self.cache_write_tokens += cache_write
+            self.cache_read_tokens += cache_read
+
+        return response.content[0].text.strip(), getattr(response, 'stop_reason', None)
+
+    def complete(self, prompt, system=None, max_tokens=None, tier=None):
+        """Send one prompt (and optional system blocks) and return the raw response text (None on failure)"""
+        return self.create(prompt, system, max_tokens, tier)[0]
+
+    def clean(self, translated):
+        """Scrub meta-text from a translation, then apply the caller's postprocess"""
+        translated = scrub(translated)
+        if self.postprocess:
+            translated = self.postprocess(translated)
+        return translated
+
+    def translate_chunk(self, prompt, system=None, max_tokens=None):
+        """Send one prompt (and optional system blocks) and return the translated text (None on failure)"""
+        translated = self.complete(prompt, system, max_tokens)
+        if translated is None:
+            return None
+        return self.clean(translated)
+
+    def request(self, make_prompt, chunk, tier):
+        """Raw translation of one chunk; split prompts send their rules as a cached system block"""
+        max_tokens = max_tokens_for(chunk, self.language, min(tier.max_tokens, self.max_tokens))
+        if hasattr(make_prompt, 'system_blocks'):
+            return self.create(make_prompt.message(chunk), system=make_prompt.system_blocks(),
+                               max_tokens=max_tokens, tier=tier)
+        return self.create(make_prompt(chunk), max_tokens=max_tokens, tier=tier)
+
+    def send(self, make_prompt, chunk, tier=None, field=None):
+        """
+        Translate one chunk on `tier` (default: routed from the chunk and
+        `field`). When the translation stops early, only the untranslated
+        tail of the source is sent again and the result is appended to what
+        was already translated.
+        """
+        tier = tier or self.route(chunk, field)
+        if self.router:
+            self.router.log_decision(field or self.field, tier)
+
+        pieces = []
+        source = chunk
+        for attempt in range(MAX_CONTINUATIONS + 1):
+            translated, stop_reason = self.request(make_prompt, source, tier)
+            if translated is None:
+                return None
+
+            reason = truncation_reason(source, translated, stop_reason, self.language)
+            if reason is None:
+                return self.clean('\n\n'.join(pieces + [translated]))
+
+            kept, tail = split_at_truncation(source, translated, stop_reason, self.language)
+            if not tail:
+                return self.clean('\n\n'.join(pieces + kept))
+            if tail == source or attempt == MAX_CONTINUATIONS:
+                # No progress, or still cut off after every follow-up
+                break
+
+            print(f"      ✂️  Truncated ({reason}): continuing with the last {len(tail):,} "
+                  f"of {len(chunk):,} source chars")
+            with self.stats_lock:
+                self.continuations += 1
+            pieces.extend(kept)
+            source = tail
+
+        print(f"      ❌ Translation still truncated ({reason}), chunk skipped")
+        with self.stats_lock:
+            self.chunks_truncated += 1
+        return None
+
+    def remember(self, source, translated, ruleset, model=None):
+        model = model or self.model
+        self.memory.put(source, translated, self.language, ruleset, model)
+
+        # Also file each paragraph, so a later edit elsewhere in the chunk
+        # doesn't invalidate the ones that stayed the same
+        source_paragraphs = split_paragraphs(source)
+        translated_paragraphs = split_paragraphs(translated)
+        if len(source_paragraphs) > 1 and len(source_paragraphs) == len(translated_paragraphs):
+            for para, translated_para in zip(source_paragraphs, translated_paragraphs):
+                self.memory.put(para, translated_para, self.language, ruleset, model)
+
+    def translate_cached(self, chunk, make_prompt, ruleset, field=None):
+        """Translate one chunk, reusing whatever the translation memory already has"""
+        tier = self.route(chunk, field)
+        if self.memory is None:
+            return self.send(make_prompt, chunk, tier, field)
+
+        # Entries stored before the scrubber existed may still carry meta-text
+        cached = self.memory.get(chunk, self.language, ruleset, tier.model)
+        if cached is not None:
+            return scrub(cached)
+
+        paragraphs = split_paragraphs(chunk)
+        known = [self.memory.get(para, self.language, ruleset, tier.model) for para in paragraphs]
+
+        if len(paragraphs) < 2 or not any(known):
+            translated = self.send(make_prompt, chunk, tier, field)
+            if translated is not None:
+                self.remember(chunk, translated, ruleset, tier.model)
+            return translated
+
+        # Send only the runs of paragraphs the memory doesn't know yet
+        pieces = []
+        run = []
+        for para, translated_para in zip(paragraphs + [None], known + ['']):
+            if para is not None and translated_para is None:
+                run.append(para)
+                continue
+
+            if run:
+                source = '\n\n'.join(run)
+                translated = self.send(make_prompt, source, tier, field)
+                if translated is None:
+                    return None
+                self.remember(source, translated, ruleset, tier.model)
+                pieces.append(translated)
+                run = []
+
+            if para is not None:
+                pieces.append(scrub(translated_para))
+
+        translated = '\n\n'.join(pieces)
+        self.memory.put(chunk, translated, self.language, ruleset, tier.model)
+        return translated
+
+    def forget(self, chunk, ruleset, field=None):
+        """Drop a chunk and its paragraphs from the memory, so the next translate_cached() sends it again"""
+        if self.memory is None:
+            return
+        model = self.route(chunk, field).model
+        for text in [chunk] + split_paragraphs(chunk):
+            self.memory.forget(text, self.language, ruleset, model)
+
+    def ruleset_for(self, make_prompt):
+        """Memory ruleset: the engine's, else the prompt's versioned one, else derived from the prompt text"""
+        return self.ruleset or getattr(make_prompt, 'ruleset', None) or prompt_ruleset(make_prompt)
+
+    def translate_many(self, jobs, on_done=None):
+        """
+        Translate many records at once.
+
+        `jobs` is an iterable of (key, chunks, make_prompt) with unique keys,
+        where make_prompt turns one source chunk into the full prompt, or is a
+        TranslationPrompt. The memory ruleset is the engine's `ruleset`, else
+        the prompt's own versioned ruleset, else derived from the prompt
+        text, so editing the rules never reuses stale output. Returns
+        {key: [translated chunks in source order]}, or None for a key if any
+        of its chunks failed. `on_done(key, chunks)` is called on the calling thread as soon
+        as every chunk of a record has been translated.
+        """
+        self.reset_stats()
+        results = {}
+        pending = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for key, chunks, make_prompt in jobs:
+                ruleset = self.ruleset_for(make_prompt) if self.memory else None
+                results[key] = [None] * len(chunks)
+                pending[key] = len(chunks)
+                for index, chunk in enumerate(chunks):
+                    future = executor.submit(self.translate_cached, chunk, make_prompt, ruleset)
+                    futures[future] = (key, index)
+
+            for future in as_completed(futures):
+                key, index = futures[future]
+                translated = future.result()
+
+                if results[key] is None:
+                    continue
+                if translated is None:
+                    results[key] = None
+                    continue
+
+                results[key][index] = translated
+                pending[key] -= 1
+                if pending[key] == 0 and on_done:
+                    on_done(key, results[key])
+
+        self.elapsed = time.monotonic() - self.started
+        return results
+
+    def throughput(self):
+        """Chunks per second and tokens per second over the last translate_many()"""
+        if self.started is None:
+            return 0.0, 0.0
+
+        elapsed = max(self.elapsed or time.monotonic() - self.started, 1e-9)
+        tokens = self.input_tokens + self.output_tokens
+        return self.chunks_done / elapsed, tokens / elapsed
+
+    def report(self):
+        chunks_per_second, tokens_per_second = self.throughput()
+        print(f"📈 {self.chunks_done} chunks translated, {self.chunks_failed} failed "
+              f"({self.input_tokens:,} in / {self.output_tokens:,} out tokens)")
+        print(f"   {chunks_per_second:.2f} chunks/s, {tokens_per_second:,.0f} tokens/s")
+        if self.continuations or self.chunks_truncated:
+            print(f"   ✂️  {self.continuations} tail-only continuations, "
+                  f"{self.chunks_truncated} chunks still truncated")
+        if self.cache_write_tokens or self.cache_read_tokens:
+            print(f"   Prompt cache: {self.cache_read_tokens:,} tokens read, {self.cache_write_tokens:,} written")
+        if self.router:
+            self.router.report()
+        if self.memory:
+            self.memory.report()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Persistent translation memory for the Claude translation scripts.
+
+Every translation is stored in a local SQLite file, keyed by a SHA-256 of the
+source text, the target language, the prompt ruleset version and the model.
+Re-running a translation script only sends text that is new or was edited
+since the last run; everything else comes straight from disk.
+
+Usage:
+    from translation_memory import TranslationMemory
+
+    memory = TranslationMemory()
+    dutch = memory.get(english, 'nl', 'verdict-v1', model)
+    if dutch is None:
+        dutch = translate(english)
+        memory.put(english, dutch, 'nl', 'verdict-v1', model)
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+MEMORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.translation-memory.sqlite')
+
+
+def memory_key(source, language, ruleset, model):
+    payload = '\0'.join([model, language, ruleset, source.strip()])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def prompt_ruleset(make_prompt):
+    """
+    Version string for a prompt function: a hash of the prompt with an empty
+    payload, so editing the rules automatically starts a fresh namespace.
+    """
+    return 'prompt-' + hashlib.sha256(make_prompt('').encode('utf-8')).hexdigest()[:12]
+
+
+class TranslationMemory:
+    """SQLite-backed cache of source text -> translation"""
+
+    def __init__(self, path=MEMORY_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                language TEXT NOT NULL,
+                ruleset TEXT NOT NULL,
+                model TEXT NOT NULL,
+                source TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        ''')
+        self.db.commit()
+
+    def get(self, source, language, ruleset, model):
+        key = memory_key(source, language, ruleset, model)
+        with self.lock:
+            row = self.db.execute('SELECT translation FROM translations WHERE key = ?', (key,)).fetchone()
+            if row:
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, source, translation, language, ruleset, model):
+        key = memory_key(source, language, ruleset, model)
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, language, ruleset, model, source.strip(), translation,
+                 datetime.now(timezone.utc).isoformat())
+            )
+            self.db.commit()
+
+    def forget(self, source, language, ruleset, model):
+        """Drop a stored translation, so the next lookup sends the source again"""
+        key = memory_key(source, language, ruleset, model)
+        with self.lock:
+            self.db.execute('DELETE FROM translations WHERE key = ?', (key,))
+            self.db.commit()
+
+    def lookup_or_translate(self, source, language, ruleset, model, translate):
+        """Return the cached translation, or call translate(source) and store the result"""
+        cached = self.get(source, language, ruleset, model)
+        if cached is not None:
+            return cached
+
+        translated = translate(source)
+        if translated:
+            self.put(source, translated, language, ruleset, model)
+        return translated
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        print(f"🧠 Translation memory: {self.hits} hits, {self.misses} misses ({rate:.0f}% reused)")
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Versioned translation rules, split for Anthropic prompt caching.
+
+Each prompt is a stable rules prefix (the CRITICAL TRANSLATION RULES, term
+lists and examples) plus a small per-chunk payload. TranslationEngine sends
+the rules as a system block marked with cache_control, so every chunk after
+the first in a run reads them from Anthropic's prompt cache instead of
+paying for them again; only the payload is new input.
+
+Rules are versioned per language. Bump the version when editing a rule set;
+the ruleset string (used by the translation memory) also carries a hash of
+the rules, so an edit without a bump still never reuses stale translations.
+
+The API only caches prefixes above a model-dependent minimum (1024 tokens for
+Sonnet); shorter rule sets are sent the same way but simply not cached.
+engine.report() shows the cache reads and writes actually achieved.
+
+Usage:
+    from translation_prompts import NL_COMPANION
+
+    engine.translate_many([(slug, [text], NL_COMPANION)])
+"""
+
+import hashlib
+
+CACHE_CONTROL = {'type': 'ephemeral'}
+LANGUAGE_NAMES = {'nl': 'Dutch', 'pt': 'Portuguese (Brazil)'}
+
+# Payload for field_batcher.FieldBatcher: many fields in one JSON object
+JSON_BATCH_PAYLOAD = """
+Translate every value of this JSON object from English to {language}.
+The keys only number the fields (a field name may follow the dot); keep them exactly as they are.
+Return ONLY a JSON object with the same keys, each mapped to its translation.
+Keep the paragraph breaks and markdown inside each value. NO meta-commentary.
+
+JSON to translate:
+
+{text}
+"""
+
+
+class TranslationPrompt:
+    """
+    Rules (`system`) plus a payload template in which '{text}' stands for the
+    chunk. Calling the prompt with a chunk returns the single-message form,
+    for callers that don't split prompts.
+    """
+
+    def __init__(self, name, language, version, system, payload):
+        self.name = name
+        self.language = language
+        self.version = version
+        self.system = system.strip()
+        self.payload = payload.strip()
+
+    @property
+    def ruleset(self):
+        digest = hashlib.sha256(f'{self.system}\0{self.payload}'.encode('utf-8')).hexdigest()[:8]
+        return f'{self.name}-{self.language}-v{self.version}-{digest}'
+
+    def message(self, text):
+        return self.payload.replace('{text}', text)
+
+    def system_blocks(self):
+        return [{'type': 'text', 'text': self.system, 'cache_control': CACHE_CONTROL}]
+
+    def with_payload(self, payload):
+        """Same rules (and cache prefix) with a different payload"""
+        return TranslationPrompt(self.name, self.language, self.version, self.system, payload)
+
+    def json_batch(self):
+        """Same rules with the JSON batch payload, for FieldBatcher"""
+        language = LANGUAGE_NAMES.get(self.language, self.language)
+        return self.with_payload(JSON_BATCH_PAYLOAD.replace('{language}', language))
+
+    def __call__(self, text):
+        return f'{self.system}\n\n{self.message(text)}'
+
+
+# Dutch
+
+NL_COMPANION_RULES = """
+You translate AI companion reviews for companionguide.ai from English to Dutch.
+
+CRITICAL TRANSLATION RULES - KEEP IN ENGLISH:
+1. ALL AI terminology: AI girlfriend, AI companion, AI chatbot, AI boyfriend, AI porn, NSFW, SFW
+2. Product terms: roleplay, chat, character creation, playground, chatbot, companion, image generation, video creation
+3. Technical terms: Stable Diffusion, Deepseek, tokens, API, etc.
+4. Brand names: OurDream AI, Character.AI, Replika, DreamGF, Candy AI, etc.
+5. Feature names: playground, character creator, memory, personality, unlimited messaging, etc.
+
+TRANSLATE TO DUTCH:
+- Regular descriptive words and sentences
+- User experience descriptions
+- Platform capabilities
+
+EXAMPLES:
+❌ WRONG: "ongecensureerd AI metgezel speelterrein platform"
+✅ CORRECT: "ongecensureerd AI companion playground platform"
+
+❌ WRONG: "karakter creatie tools"
+✅ CORRECT: "character creation tools"
+"""
+
+NL_COMPANION = TranslationPrompt('companion', 'nl', 1, NL_COMPANION_RULES, """
+Translate this AI companion description from English to Dutch.
+
+Now translate this text. ONLY return the translation, NO meta-commentary:
+
+{text}
+""")
+
+NL_REVIEW_STRICT_RULES = """
+You translate AI companion reviews for companionguide.ai from English to Dutch.
+
+CRITICAL TRANSLATION RULES - KEEP IN ENGLISH:
+1. ALL AI terminology: AI girlfriend, AI companion, AI chatbot, AI boyfriend, AI character, AI porn, AI hentai
+2. Product category terms: roleplay, chat, NSFW, SFW, character creation, playground, chatbot, companion
+3. Technical terms: Stable Diffusion, Deepseek, tokens, API, image generation, video generation
+4. Feature names: playground, character creator, image generator, video creation, memory, personality
+5. Brand names: OurDream AI, Character.AI, Replika, DreamGF, etc.
+6. Review section titles: "My Month Testing...", "The Bottom Line", "Pros and Cons"
+7. Common phrases: "bottom line", "use case", "power users", "creative freedom", "free tier"
+
+TRANSLATE TO DUTCH:
+- Regular descriptive words (comprehensive, innovative, high-quality, etc.)
+- Sentences and explanations
+- Benefits and drawbacks
+- User experience descriptions
+
+EXAMPLES:
+❌ WRONG: "Innovatief AI Companion Speelterrein"
+✅ CORRECT: "Innovatief AI Companion Playground"
+
+❌ WRONG: "Mijn Maand OurDream AI Testen"
+✅ CORRECT: "My Month Testing OurDream AI"
+
+❌ WRONG: "karakter creatie"
+✅ CORRECT: "character creation"
+"""
+
+NL_REVIEW_STRICT = TranslationPrompt('review-strict', 'nl', 1, NL_REVIEW_STRICT_RULES, """
+Translate this AI companion review from English to Dutch.
+
+Now translate this text:
+
+{text}
+""")
+
+NL_VERDICT_RULES = """
+You translate personal AI companion review/verdict sections for companionguide.ai from English to Dutch.
+
+IMPORTANT TRANSLATION RULES:
+1. Keep English AI industry terms: "AI companion", "AI girlfriend", "AI boyfriend", "NSFW", "roleplay", "chat", etc.
+2. Translate conversational/review language naturally to Dutch
+3. Maintain the same paragraph structure and formatting
+4. Keep any markdown formatting (**, ##, etc.)
+5. Translate section headers like "My 1-Week Experience with X" to "Mijn 1 Week Ervaring met X"
+6. Keep brand names and product names in English
+7. Use natural Dutch expressions, not literal translations
+"""
+
+NL_VERDICT = TranslationPrompt('my-verdict', 'nl', 1, NL_VERDICT_RULES, """
+Translate this AI companion review text from English to Dutch.
+Respond with ONLY the Dutch translation, no explanations or comments.
+
+English text to translate:
+
+{text}
+""")
+
+NL_PRICING_RULES = """
+You translate pricing plan features for companionguide.ai from English to Dutch.
+
+CRITICAL RULES:
+1. Keep ALL AI industry terms in English: "AI companion", "AI girlfriend", "AI boyfriend", "AI chat", "NSFW", "chat", "roleplay", etc.
+2. Translate descriptive words naturally to Dutch
+3. Keep plan names mostly in English (Free, Premium, Pro, etc.)
+4. Keep technical terms in English (API access, tokens, credits, etc.)
+
+Examples:
+- "Unlimited AI chat" → "Onbeperkte AI chat"
+- "NSFW content generation" → "NSFW content generatie"
+- "Premium AI models" → "Premium AI models"
+- "Voice conversations" → "Voice gesprekken"
+- "Character creation" → "Character creatie"
+"""
+
+NL_PRICING = TranslationPrompt('pricing', 'nl', 1, NL_PRICING_RULES, """
+Translate this pricing plan text from English to Dutch.
+Respond with ONLY the Dutch translation, no explanations.
+
+English text to translate:
+
+{text}
+""")
+
+
+# Portuguese
+
+PT_COMPANION_RULES = """
+You translate AI companion listings for companionguide.ai from English to Portuguese (Brazil).
+
+CRITICAL RULES:
+1. Keep ALL AI industry terms in English: AI girlfriend, AI companion, AI chatbot, AI boyfriend, roleplay, chat, NSFW, SFW, character creation, playground, image generation, video generation
+2. Only translate regular Portuguese words and explanatory text
+3. Keep brand names in English (Character.AI, Replika, Stable Diffusion, etc.)
+4. DO NOT add any meta-commentary or notes
+5. ONLY return the pure Portuguese translation
+"""
+
+PT_COMPANION = TranslationPrompt('companion', 'pt', 1, PT_COMPANION_RULES, """
+Translate this text from English to Portuguese (Brazil).
+
+Text to translate:
+
+{text}
+""")
+
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Detects translations that stopped early, and works out which part of the
+source still needs translating.
+
+A long verdict or body_text can come back cut off: the response hit
+max_tokens, Claude stopped on its own with "Would you like me to continue?",
+or the output is simply far shorter than the source. Until now the only fix
+was a full retranslation. TranslationEngine instead uses
+truncation_reason() to spot the cut, split_at_truncation() to keep the
+paragraphs that are done, and sends only the untranslated source tail.
+
+Usage:
+    from truncation import truncation_reason, split_at_truncation
+
+    reason = truncation_reason(source, translated, stop_reason, 'nl')
+    if reason:
+        kept, tail = split_at_truncation(source, translated, stop_reason, 'nl')
+"""
+
+import re
+
+from meta_scrubber import TRAILERS, scrub
+from text_chunker import count_tokens, output_tokens
+
+# Phrases Claude ends a response with when it gives up before the end: the
+# scrubber's trailers, plus a bracketed "[continue ...]" marker
+CONTINUATION_TRAILERS = TRAILERS + [r"\[continue[^\]]*\]"]
+TRAILER = re.compile('|'.join(CONTINUATION_TRAILERS), re.IGNORECASE)
+
+# Output below this share of the expected tokens, with paragraphs missing, is cut off
+MIN_LENGTH_RATIO = 0.6
+# Sources shorter than this are too noisy for the length check
+MIN_SOURCE_TOKENS = 200
+
+
+def paragraphs(text):
+    return [para.strip('\n') for para in text.split('\n\n') if para.strip()]
+
+
+def without_trailers(text):
+    """`text` without the lines that carry a continuation trailer"""
+    return '\n'.join(line for line in text.split('\n') if not TRAILER.search(line))
+
+
+def length_ratio(source, translated, language=None):
+    """Output tokens of `translated` against the tokens expected for `source`"""
+    return count_tokens(translated) / max(output_tokens(source, language), 1)
+
+
+def truncation_reason(source, translated, stop_reason=None, language=None):
+    """Why `translated` looks cut off ('max_tokens', 'trailer' or 'length'), or None"""
+    if stop_reason == 'max_tokens':
+        return 'max_tokens'
+    if TRAILER.search(translated) and not TRAILER.search(source):
+        return 'trailer'
+
+    if count_tokens(source) >= MIN_SOURCE_TOKENS:
+        cleaned = scrub(translated)
+        if (length_ratio(source, cleaned, language) < MIN_LENGTH_RATIO and
+                len(paragraphs(cleaned)) < len(paragraphs(source))):
+            return 'length'
+    return None
+
+
+def resume_point(source_paragraphs, kept, language=None):
+    """Index of the first source paragraph that `kept` doesn't cover yet"""
+    # Claude keeps one paragraph per source paragraph; trust the count when
+    # the lengths agree with it
+    if len(kept) < len(source_paragraphs):
+        done = '\n\n'.join(source_paragraphs[:len(kept)])
+        if not kept or 0.5 <= length_ratio(done, '\n\n'.join(kept), language) <= 2.0:
+            return len(kept)
+
+    # Otherwise walk the source until it accounts for the output so far
+    translated_tokens = count_tokens('\n\n'.join(kept))
+    expected = 0
+    for index, para in enumerate(source_paragraphs):
+        expected += output_tokens(para, language)
+        if expected > translated_tokens:
+            return index
+    return len(source_paragraphs)
+
+
+def split_at_truncation(source, translated, stop_reason=None, language=None):
+    """
+    (kept, tail): the translated paragraphs worth keeping, and the source
+    text still to translate ('' when nothing is missing after all)
+    """
+    # A trailer is never a translated paragraph, even one scrub() missed
+    kept = paragraphs(without_trailers(scrub(translated)))
+    # A response cut at max_tokens ends mid-paragraph; that one is redone,
+    # unless the cut fell in a trailer after the last translated paragraph
+    replied = paragraphs(translated)
+    cut_in_trailer = bool(replied) and bool(TRAILER.search(replied[-1]))
+    if stop_reason == 'max_tokens' and kept and not cut_in_trailer:
+        kept = kept[:-1]
+
+    source_paragraphs = paragraphs(source)
+    start = resume_point(source_paragraphs, kept, language)
+    return kept, '\n\n'.join(source_paragraphs[start:])
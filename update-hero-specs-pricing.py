@@ -4,42 +4,19 @@ Script to update hero_specs pricing field to show "Gratis + vanaf $X/month" form
 instead of vague terms like "Premium Plans" or "Free with premium options".
 """
 
-import os
 import json
-import requests
-import time
 
-AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN_CG')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID_CG')
-API_URL = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Companion_Translations'
+from airtable_client import AirtableClient
 
-headers = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+client = AirtableClient.from_env()
 
 def fetch_nl_records_with_pricing():
     """Fetch NL records that have both hero_specs and pricing_plans"""
     print("📥 Fetching NL records with hero_specs and pricing_plans...")
     
-    records = []
-    offset = None
-    
-    while True:
-        params = {
-            'filterByFormula': "AND({language} = 'nl', {pricing_plans} != '', {hero_specs} != '')"
-        }
-        if offset:
-            params['offset'] = offset
-        
-        response = requests.get(API_URL, headers=headers, params=params)
-        data = response.json()
-        records.extend(data.get('records', []))
-        
-        offset = data.get('offset')
-        if not offset:
-            break
-        time.sleep(0.2)
+    records = client.fetch_all_records(
+        filter_formula="AND({language} = 'nl', {pricing_plans} != '', {hero_specs} != '')"
+    )
     
     print(f"✅ Fetched {len(records)} NL records")
     return records
@@ -101,24 +78,6 @@ def create_pricing_text(has_free, lowest_paid_price, lowest_paid_period, languag
         else:
             return "Pricing varies"
 
-def update_record(record_id, hero_specs_json):
-    """Update record with new hero_specs"""
-    url = f'{API_URL}/{record_id}'
-    
-    data = {
-        'fields': {
-            'hero_specs': hero_specs_json
-        }
-    }
-    
-    response = requests.patch(url, headers=headers, json=data)
-    
-    if response.status_code != 200:
-        print(f"   ❌ Update failed: {response.status_code}")
-        return False
-    
-    return True
-
 def main():
     print("🚀 Starting hero_specs pricing update...")
     print("=" * 60)
@@ -132,6 +91,7 @@ def main():
     updated = 0
     skipped = 0
     errors = 0
+    writer = client.batch_writer()
     
     for i, record in enumerate(records, 1):
         record_id = record['id']
@@ -184,13 +144,13 @@ def main():
         # Update in Airtable
         hero_specs_json = json.dumps(hero_specs, ensure_ascii=False)
         
-        if update_record(record_id, hero_specs_json):
-            print(f"   💾 Updated in Airtable")
-            updated += 1
-        else:
-            errors += 1
-        
-        time.sleep(0.3)
+        writer.update(record_id, {'hero_specs': hero_specs_json})
+        print(f"   💾 Queued for Airtable")
+        updated += 1
+    
+    failed = writer.close()
+    updated -= len(failed)
+    errors += len(failed)
     
     print()
     print("=" * 60)
@@ -1,36 +1,77 @@
 #!/usr/bin/env python3
-"""Verify hreflang implementation"""
-import os
-import re
-from pathlib import Path
+"""
+Verify hreflang implementation
+
+Checks the whole site's hreflang graph (see hreflang_index.py): every page
+lists itself, alternates link back, every translation on disk is listed, and
+alternates point at real pages in the right language with their canonical URL.
+
+Usage:
+    python3 verify-hreflang.py             # summary per check
+    python3 verify-hreflang.py --verbose   # every issue
+"""
+import sys
+from collections import Counter
+
+from hreflang_index import HreflangIndex
+
+SECTIONS = {
+    'Companion pages': 'companions',
+    'Category pages': 'categories',
+    'News pages': 'news',
+    'Root pages': '',
+}
+
+CHECKS = {
+    'self-reference': "Pages missing a self-referencing hreflang",
+    'non-reciprocal': "Alternates that don't link back",
+    'missing-variant': "Translations on disk not listed",
+    'broken-alternate': "Alternates pointing outside the site",
+    'wrong-language': "Alternates pointing at the wrong language",
+    'non-canonical': "Alternates pointing at a non-canonical URL",
+    'no-canonical': "Pages with hreflang but no canonical",
+}
+
+
+def section_of(page):
+    first = page.key.split('/', 1)[0] if '/' in page.key else ''
+    return first if first in SECTIONS.values() else ''
 
-def check_hreflang(filepath):
-    """Check if file has hreflang tags"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    return 'hreflang' in content
 
 def main():
-    checks = {
-        'Companion pages': ('companions/*.html', 42),
-        'Root pages': (['index.html', 'deals.html', 'news.html', 'companions.html', 'companions-az.html', 'contact.html', 'categories.html'], 7),
-        'Category pages': ('categories/*.html', 25),
-    }
+    verbose = '--verbose' in sys.argv[1:]
 
     print("🔍 Verifying hreflang tags\n")
 
-    for name, (pattern, expected) in checks.items():
-        if isinstance(pattern, list):
-            files = pattern
-        else:
-            files = list(Path('.').glob(pattern))
+    index = HreflangIndex.load()
+    index.save()
+
+    for name, section in SECTIONS.items():
+        pages = [page for page in index.pages.values() if page.lang == 'en' and section_of(page) == section]
+        with_hreflang = sum(1 for page in pages if page.alternates)
+        print(f"{'✅' if with_hreflang == len(pages) else '⚠️ '} {name}: "
+              f"{with_hreflang}/{len(pages)} English pages have hreflang")
 
-        with_hreflang = sum(1 for f in files if check_hreflang(f))
-        print(f"✅ {name}: {with_hreflang}/{expected} pages have hreflang")
+    issues = index.issues()
+    counts = Counter(issue.kind for issue in issues)
+
+    print()
+    for kind, label in CHECKS.items():
+        print(f"{'✅' if not counts[kind] else '❌'} {label}: {counts[kind]}")
+        if verbose:
+            for issue in issues:
+                if issue.kind == kind:
+                    print(f"   {issue.path}: {issue.detail}")
 
     print(f"\n{'='*50}")
-    print("✅ All English pages now have reciprocal hreflang tags!")
+    if issues:
+        print(f"❌ {len(issues)} hreflang issues across {len({issue.path for issue in issues})} pages")
+    else:
+        print("✅ All pages have reciprocal hreflang tags!")
     print(f"{'='*50}")
 
+    if issues:
+        exit(1)
+
 if __name__ == '__main__':
     main()